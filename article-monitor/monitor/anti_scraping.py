@@ -11,72 +11,145 @@
 - 应用层：浏览器指纹隐藏、视口随机化
 - 行为层：随机延迟、鼠标移动模拟
 """
+import asyncio
 import random
+import re
+import string
+import threading
+from collections import deque
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _np():
+    """懒加载 numpy（可选依赖），未安装时返回 None 并退回纯 Python 实现
+    
+    仅在向量化路径首次被调用时导入，避免应用启动时承担 numpy 的导入开销。
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
 # ==================== User-Agent 池 ====================
 # 真实的浏览器 User-Agent，定期更新
 USER_AGENTS = {
-    'chrome_windows': [
+    'chrome_windows': (
         'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
         'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
         'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36',
         'Mozilla/5.0 (Windows NT 11.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-    ],
-    'chrome_mac': [
+    ),
+    'chrome_mac': (
         'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
         'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
         'Mozilla/5.0 (Macintosh; Intel Mac OS X 14_0) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-    ],
-    'firefox_windows': [
+    ),
+    'firefox_windows': (
         'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
         'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0',
         'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:119.0) Gecko/20100101 Firefox/119.0',
-    ],
-    'firefox_mac': [
+    ),
+    'firefox_mac': (
         'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:121.0) Gecko/20100101 Firefox/121.0',
         'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:120.0) Gecko/20100101 Firefox/120.0',
-    ],
-    'edge_windows': [
+    ),
+    'edge_windows': (
         'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0',
         'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36 Edg/119.0.0.0',
-    ],
-    'safari_mac': [
+    ),
+    'safari_mac': (
         'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
         'Mozilla/5.0 (Macintosh; Intel Mac OS X 14_0) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15',
-    ]
+    )
 }
 
 # 所有 UA 扁平化列表（用于随机选择）
-ALL_USER_AGENTS = [ua for uas in USER_AGENTS.values() for ua in uas]
+ALL_USER_AGENTS = tuple(ua for uas in USER_AGENTS.values() for ua in uas)
+
+# 浏览器类型列表（只计算一次，避免每次生成配置时重新 list(keys)）
+_UA_BROWSER_TYPES = tuple(USER_AGENTS.keys())
+
+
+def _ua_platform(user_agent: str) -> str:
+    """根据 UA 确定平台"""
+    if 'Windows' in user_agent:
+        return 'Win32'
+    if 'Macintosh' in user_agent or 'Mac OS' in user_agent:
+        return 'MacIntel'
+    return 'Linux x86_64'
+
+
+def _ua_vendor(user_agent: str) -> str:
+    """根据 UA 确定浏览器厂商"""
+    if 'Chrome' in user_agent or 'Edg' in user_agent:
+        return 'Google Inc.'
+    if 'Firefox' in user_agent:
+        return ''
+    if 'Safari' in user_agent:
+        return 'Apple Computer, Inc.'
+    return ''
+
+
+# 每个 UA 预先计算好的 (user_agent, platform, vendor) 记录，按浏览器类型分组
+UA_RECORDS_BY_TYPE = {
+    browser_type: tuple((ua, _ua_platform(ua), _ua_vendor(ua)) for ua in uas)
+    for browser_type, uas in USER_AGENTS.items()
+}
+
+# 从 UA 中提取 Chrome 主版本号
+_CHROME_VER_RE = re.compile(r'Chrome/(\d+)')
+
+
+def _build_sec_ch_ua_headers(chrome_version: str, platform: str) -> Dict[str, str]:
+    """构建 Chrome 特有的 Sec-Ch-Ua 系列请求头"""
+    return {
+        'Sec-Ch-Ua': f'"Not_A Brand";v="8", "Chromium";v="{chrome_version}", "Google Chrome";v="{chrome_version}"',
+        'Sec-Ch-Ua-Mobile': '?0',
+        'Sec-Ch-Ua-Platform': f'"{platform.replace("32", "").replace("Intel", "").strip()}"',
+    }
+
+
+# UA 池中所有 Chrome 系 UA 的 Sec-Ch-Ua 头查找表，键为 (Chrome 主版本号, 平台)
+_SEC_CH_UA_TABLE: Dict[Tuple[str, str], Dict[str, str]] = {
+    (match.group(1), platform): _build_sec_ch_ua_headers(match.group(1), platform)
+    for records in UA_RECORDS_BY_TYPE.values()
+    for ua, platform, _ in records
+    if 'Chrome' in ua and (match := _CHROME_VER_RE.search(ua))
+}
+
+# 随机抽样预取批量：一次 random.choices 取出多个结果，逐个弹出使用
+_PREFETCH_SIZE = 256
 
 
 # ==================== 语言和地区配置 ====================
-ACCEPT_LANGUAGES = [
+ACCEPT_LANGUAGES = (
     'zh-CN,zh;q=0.9,en;q=0.8,en-US;q=0.7',
     'zh-TW,zh;q=0.9,en;q=0.8',
     'zh-CN,zh;q=0.9',
     'en-US,en;q=0.9,zh-CN;q=0.8',
     'ja-JP,ja;q=0.9,en;q=0.8',
-]
+)
 
 # 时区偏移（分钟）
-TIMEZONES = [
+TIMEZONES = (
     480,   # UTC+8 (中国)
     540,   # UTC+9 (日本)
     -480,  # UTC-8 (太平洋)
     0,     # UTC (格林威治)
-]
+)
 
 
 # ==================== 视口尺寸 ====================
 # 常见的屏幕分辨率
-VIEWPORT_SIZES = [
+VIEWPORT_SIZES = (
     (1920, 1080),  # Full HD
     (1366, 768),   # 常见笔记本
     (1536, 864),   # 常见笔记本
@@ -85,30 +158,167 @@ VIEWPORT_SIZES = [
     (1600, 900),   # 常见
     (2560, 1440),  # 2K
     (1280, 800),   # MacBook Air
-]
+)
 
 
 # ==================== Referer 策略 ====================
 REFERER_STRATEGIES = {
-    'search_engine': [
+    'search_engine': (
         'https://www.google.com/',
         'https://www.google.com/search?q=tech+article',
         'https://www.bing.com/',
         'https://www.bing.com/search?q=programming',
         'https://www.baidu.com/',
         'https://www.baidu.com/s?wd=技术文章',
-    ],
-    'social_media': [
+    ),
+    'social_media': (
         'https://twitter.com/',
         'https://www.facebook.com/',
         'https://www.linkedin.com/',
         'https://weibo.com/',
-    ],
-    'direct': [None],  # 直接访问，不带 Referer
+    ),
+    'direct': (None,),  # 直接访问，不带 Referer
 }
 
+# Referer 策略抽样表：直接访问概率更高
+_REFERER_STRATEGY_CHOICES = ('search_engine', 'direct', 'direct')
+
+
+# 隐身模式 JavaScript 模板：模块加载时构建一次，每次只替换与配置文件相关的字段
+_STEALTH_JS_TEMPLATE = string.Template("""
+        // 隐藏 webdriver 属性
+        Object.defineProperty(navigator, 'webdriver', {
+            get: () => undefined
+        });
+        
+        // 修改 navigator 属性
+        Object.defineProperty(navigator, 'platform', {
+            get: () => '${platform}'
+        });
+        
+        Object.defineProperty(navigator, 'vendor', {
+            get: () => '${vendor}'
+        });
+        
+        Object.defineProperty(navigator, 'languages', {
+            get: () => ['${language}', 'en']
+        });
+        
+        // 隐藏自动化相关属性
+        Object.defineProperty(navigator, 'plugins', {
+            get: () => [
+                {name: 'Chrome PDF Plugin', filename: 'internal-pdf-viewer'},
+                {name: 'Chrome PDF Viewer', filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai'},
+                {name: 'Native Client', filename: 'internal-nacl-plugin'}
+            ]
+        });
+        
+        // 修改 Chrome 特有属性
+        window.chrome = {
+            runtime: {},
+            loadTimes: function() {},
+            csi: function() {},
+            app: {}
+        };
+        
+        // 隐藏 Playwright/Puppeteer 特征
+        delete window.__playwright;
+        delete window.__puppeteer;
+        delete window.__selenium_evaluate;
+        delete window.__selenium_unwrapped;
+        delete window.__webdriver_evaluate;
+        delete window.__driver_evaluate;
+        delete window.__webdriver_unwrapped;
+        delete window.__driver_unwrapped;
+        delete window.__lastWatirAlert;
+        delete window.__lastWatirConfirm;
+        delete window.__lastWatirPrompt;
+        delete document.__webdriver_evaluate;
+        delete document.__selenium_evaluate;
+        delete document.__webdriver_script_function;
+        delete document.__webdriver_script_func;
+        delete document.__webdriver_script_fn;
+        delete document.$$chrome_asyncScriptInfo;
+        delete document.$$cdc_asdjflasutopfhvcZLmcfl_;
+        
+        // 修改 permissions 查询
+        const originalQuery = window.navigator.permissions.query;
+        window.navigator.permissions.query = (parameters) => (
+            parameters.name === 'notifications' ?
+            Promise.resolve({ state: Notification.permission }) :
+            originalQuery(parameters)
+        );
+        
+        // Canvas 指纹随机化（添加微小噪声）
+        const originalToDataURL = HTMLCanvasElement.prototype.toDataURL;
+        HTMLCanvasElement.prototype.toDataURL = function(type) {
+            if (type === 'image/png' && this.width > 16 && this.height > 16) {
+                const ctx = this.getContext('2d');
+                if (ctx) {
+                    const imageData = ctx.getImageData(0, 0, this.width, this.height);
+                    for (let i = 0; i < imageData.data.length; i += 4) {
+                        // 添加微小噪声（不影响视觉效果）
+                        imageData.data[i] = Math.max(0, Math.min(255, imageData.data[i] + (Math.random() - 0.5) * 2));
+                    }
+                    ctx.putImageData(imageData, 0, 0);
+                }
+            }
+            return originalToDataURL.apply(this, arguments);
+        };
+        
+        // WebGL 指纹随机化
+        const getParameterProxyHandler = {
+            apply: function(target, thisArg, argumentsList) {
+                const param = argumentsList[0];
+                const gl = thisArg;
+                
+                // 随机化一些不影响功能的参数
+                if (param === 37445) { // UNMASKED_VENDOR_WEBGL
+                    return 'Intel Inc.';
+                }
+                if (param === 37446) { // UNMASKED_RENDERER_WEBGL
+                    return 'Intel(R) Iris(TM) Graphics';
+                }
+                
+                return Reflect.apply(target, thisArg, argumentsList);
+            }
+        };
+        
+        try {
+            const canvas = document.createElement('canvas');
+            const gl = canvas.getContext('webgl') || canvas.getContext('experimental-webgl');
+            if (gl) {
+                const originalGetParameter = gl.getParameter;
+                gl.getParameter = new Proxy(originalGetParameter, getParameterProxyHandler);
+            }
+        } catch(e) {}
+        """)
+
+
+def _np_rng(np, rng: Optional[random.Random] = None):
+    """由 rng（默认模块级 random）派生 numpy Generator
+    
+    向量化路径与纯 Python 路径共用同一随机源，不读写 numpy 的全局随机状态。
+    """
+    return np.random.default_rng((rng or random).getrandbits(64))
+
+
+def _sample_delays(min_delay: float, max_delay: float, k: int,
+                   rng: Optional[random.Random] = None) -> List[float]:
+    """批量生成 k 个正态分布延迟，并限制在 [min_delay, max_delay] 范围内
+    
+    大部分延迟集中在区间中间值，模拟人类行为。
+    """
+    mean = (min_delay + max_delay) / 2
+    std_dev = (max_delay - min_delay) / 4
+    np = _np()
+    if np is not None:
+        return np.clip(_np_rng(np, rng).normal(mean, std_dev, k), min_delay, max_delay).tolist()
+    gauss = (rng or random).gauss
+    return [max(min_delay, min(max_delay, gauss(mean, std_dev))) for _ in range(k)]
 
-@dataclass
+
+@dataclass(slots=True)
 class BrowserProfile:
     """浏览器配置文件 - 保持指纹一致性"""
     user_agent: str
@@ -119,9 +329,13 @@ class BrowserProfile:
     platform: str
     vendor: str
     referer: Optional[str] = None
+    _dict_cache: Optional[Dict] = field(default=None, init=False, repr=False, compare=False)
     
     def to_dict(self) -> Dict:
-        return {
+        """返回配置字典（首次调用时构建并缓存字段映射，每次返回浅拷贝，调用方修改不影响配置文件）"""
+        if self._dict_cache is not None:
+            return dict(self._dict_cache)
+        self._dict_cache = {
             'user_agent': self.user_agent,
             'accept_language': self.accept_language,
             'timezone_offset': self.timezone_offset,
@@ -131,6 +345,27 @@ class BrowserProfile:
             'vendor': self.vendor,
             'referer': self.referer,
         }
+        return dict(self._dict_cache)
+
+
+def _homogeneous_profile() -> BrowserProfile:
+    """统一模式使用的标准配置文件
+    
+    参照 Tor Browser 的统一化思路：所有请求呈现同一个最常见的指纹
+    （Windows 10 + Chrome 120、1920x1080、en-US、UTC），
+    而不是随机组合出可能自相矛盾、反而更易识别的属性。
+    """
+    user_agent = USER_AGENTS['chrome_windows'][0]
+    return BrowserProfile(
+        user_agent=user_agent,
+        accept_language='en-US,en;q=0.9',
+        timezone_offset=0,
+        viewport_width=1920,
+        viewport_height=1080,
+        platform=_ua_platform(user_agent),
+        vendor=_ua_vendor(user_agent),
+        referer=None,
+    )
 
 
 class AntiScrapingManager:
@@ -141,7 +376,9 @@ class AntiScrapingManager:
                  random_delay: bool = True,
                  stealth_mode: bool = True,
                  min_delay: float = 1.0,
-                 max_delay: float = 5.0):
+                 max_delay: float = 5.0,
+                 max_concurrency: int = 8,
+                 homogeneous: bool = False):
         """
         初始化防反爬管理器
         
@@ -151,79 +388,131 @@ class AntiScrapingManager:
             stealth_mode: 是否启用隐身模式
             min_delay: 最小延迟（秒）
             max_delay: 最大延迟（秒）
+            max_concurrency: 同时进行中的请求（含延迟）上限
+            homogeneous: 是否固定使用统一的标准配置文件（不轮换）
         """
         self.rotate_user_agent = rotate_user_agent
         self.random_delay = random_delay
         self.stealth_mode = stealth_mode
         self.min_delay = min_delay
         self.max_delay = max_delay
+        self.max_concurrency = max(1, max_concurrency)
+        self.homogeneous = homogeneous
+        
+        # 并发闸门：asyncio.Semaphore 绑定事件循环，按循环懒创建
+        self._semaphore_guard = threading.Lock()
+        self._semaphores_by_loop: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+        
+        # 管理器独立的随机数生成器，避免与模块级 random 共享状态
+        self._rng = random.Random()
         
         # 当前会话的浏览器配置（保持一致性）
-        self._current_profile: Optional[BrowserProfile] = None
+        # 统一模式下固定使用标准配置文件，所有请求指纹一致
+        self._current_profile: Optional[BrowserProfile] = (
+            _homogeneous_profile() if homogeneous else None
+        )
         self._request_count = 0
-        self._profile_rotation_interval = random.randint(10, 30)  # 每 10-30 个请求换一次配置
+        self._profile_rotation_interval = self._rng.randint(10, 30)  # 每 10-30 个请求换一次配置
+        
+        # 随机抽样预取缓冲区（按候选集合区分）
+        self._prefetched: Dict[str, deque] = {}
         
+        # 请求头缓存（仅依赖当前配置文件，轮换后重建）
+        self._cached_headers: Optional[Dict[str, str]] = None
+        self._cached_headers_profile: Optional[BrowserProfile] = None
+        
+        # 浏览器/爬取配置缓存（轮换配置文件时失效）
+        self._cached_browser_cfg: Optional[Dict] = None
+        self._cached_crawler_cfgs: Dict[Tuple[int, Optional[str], bool], Dict] = {}
+        
+        # 随机延迟缓冲区，与其延迟范围成对保存，整体替换以免读到不匹配的组合
+        self._delay_buffer: Tuple[Optional[Tuple[float, float]], deque] = (None, deque())
+        
+        # 按模式绑定专用的 get_browser_profile 实现
+        if homogeneous:
+            self.get_browser_profile = self._get_profile_pinned
+        elif rotate_user_agent:
+            self.get_browser_profile = self._get_profile_with_rotate
+        else:
+            self.get_browser_profile = self._get_profile_no_rotate
+        
+    def _draw(self, key: str, population):
+        """从预取缓冲区取一个随机元素，耗尽时用 random.choices 批量补充"""
+        # 不先判空再取：取空（含被其他线程取空）时由本线程补一批，与 get_random_user_agent 相同
+        buf = self._prefetched.get(key)
+        if buf is None:
+            buf = self._prefetched.setdefault(key, deque())
+        try:
+            return buf.popleft()
+        except IndexError:
+            batch = self._rng.choices(population, k=_PREFETCH_SIZE)
+            value = batch.pop()
+            buf.extend(batch)
+            return value
+    
     def get_browser_profile(self, force_new: bool = False) -> BrowserProfile:
         """获取浏览器配置文件
         
+        实例初始化时会按模式把本方法替换为对应的专用实现
+        （_get_profile_pinned / _get_profile_no_rotate / _get_profile_with_rotate），
+        热路径上不再重复判断模式开关。
+        
         Args:
-            force_new: 是否强制生成新的配置
+            force_new: 是否强制生成新的配置（统一模式下忽略）
             
         Returns:
             BrowserProfile: 浏览器配置
         """
+        if self.homogeneous:
+            return self._get_profile_pinned(force_new)
+        if self.rotate_user_agent:
+            return self._get_profile_with_rotate(force_new)
+        return self._get_profile_no_rotate(force_new)
+    
+    def _get_profile_pinned(self, force_new: bool = False) -> BrowserProfile:
+        """统一模式：始终返回固定的标准配置文件"""
+        return self._current_profile
+    
+    def _get_profile_no_rotate(self, force_new: bool = False) -> BrowserProfile:
+        """不轮换模式：仅在首次或强制时生成配置文件"""
+        if force_new or self._current_profile is None:
+            return self._rotate_profile()
+        return self._current_profile
+    
+    def _get_profile_with_rotate(self, force_new: bool = False) -> BrowserProfile:
+        """轮换模式：每 10-30 个请求更换一次配置文件"""
         self._request_count += 1
-        
-        # 是否需要轮换配置
-        should_rotate = (
-            force_new or 
-            self._current_profile is None or 
-            (self.rotate_user_agent and 
-             self._request_count >= self._profile_rotation_interval)
-        )
-        
-        if should_rotate:
-            self._current_profile = self._generate_profile()
-            self._request_count = 0
-            self._profile_rotation_interval = random.randint(10, 30)
-            logger.debug(f"🔄 生成新的浏览器配置: {self._current_profile.user_agent[:50]}...")
-            
+        if (force_new or self._current_profile is None
+                or self._request_count >= self._profile_rotation_interval):
+            return self._rotate_profile()
+        return self._current_profile
+    
+    def _rotate_profile(self) -> BrowserProfile:
+        """生成新的配置文件，并使依赖旧配置文件的缓存失效"""
+        self._current_profile = self._generate_profile()
+        self._request_count = 0
+        self._profile_rotation_interval = self._rng.randint(10, 30)
+        self._cached_browser_cfg = None
+        self._cached_crawler_cfgs.clear()
+        logger.debug(f"🔄 生成新的浏览器配置: {self._current_profile.user_agent[:50]}...")
         return self._current_profile
     
     def _generate_profile(self) -> BrowserProfile:
         """生成随机的浏览器配置文件"""
         # 随机选择浏览器类型
-        browser_type = random.choice(list(USER_AGENTS.keys()))
-        user_agent = random.choice(USER_AGENTS[browser_type])
-        
-        # 根据 UA 确定平台
-        if 'Windows' in user_agent:
-            platform = 'Win32'
-        elif 'Macintosh' in user_agent or 'Mac OS' in user_agent:
-            platform = 'MacIntel'
-        else:
-            platform = 'Linux x86_64'
-        
-        # 确定浏览器厂商
-        if 'Chrome' in user_agent or 'Edg' in user_agent:
-            vendor = 'Google Inc.'
-        elif 'Firefox' in user_agent:
-            vendor = ''
-        elif 'Safari' in user_agent:
-            vendor = 'Apple Computer, Inc.'
-        else:
-            vendor = ''
+        browser_type = self._draw('browser_type', _UA_BROWSER_TYPES)
+        user_agent, platform, vendor = self._draw(f'ua:{browser_type}', UA_RECORDS_BY_TYPE[browser_type])
         
         # 随机视口大小
-        viewport = random.choice(VIEWPORT_SIZES)
+        viewport = self._draw('viewport', VIEWPORT_SIZES)
         
         # 随机语言和时区
-        accept_language = random.choice(ACCEPT_LANGUAGES)
-        timezone_offset = random.choice(TIMEZONES)
+        accept_language = self._draw('accept_language', ACCEPT_LANGUAGES)
+        timezone_offset = self._draw('timezone', TIMEZONES)
         
         # 随机 Referer 策略
-        strategy = random.choice(['search_engine', 'direct', 'direct'])  # 直接访问概率更高
-        referer = random.choice(REFERER_STRATEGIES[strategy])
+        strategy = self._draw('referer_strategy', _REFERER_STRATEGY_CHOICES)
+        referer = self._draw(f'referer:{strategy}', REFERER_STRATEGIES[strategy])
         
         return BrowserProfile(
             user_agent=user_agent,
@@ -247,138 +536,64 @@ class AntiScrapingManager:
         if not self.random_delay:
             return self.min_delay
         
-        # 使用正态分布
-        mean = (self.min_delay + self.max_delay) / 2
-        std_dev = (self.max_delay - self.min_delay) / 4
-        
-        delay = random.gauss(mean, std_dev)
-        # 限制在合理范围内
-        delay = max(self.min_delay, min(self.max_delay, delay))
-        
-        return delay
+        # 从预生成的截断正态分布缓冲区中取值；延迟范围变化时换用新缓冲区。
+        # 与 get_human_delay 相同，不先判空再取：取空（含被其他线程取空）时由本线程补一批
+        bounds = (self.min_delay, self.max_delay)
+        buffer_bounds, buf = self._delay_buffer
+        if buffer_bounds != bounds:
+            buf = deque()
+            self._delay_buffer = (bounds, buf)
+        try:
+            return buf.popleft()
+        except IndexError:
+            batch = _sample_delays(bounds[0], bounds[1], _PREFETCH_SIZE, self._rng)
+            delay = batch.pop()
+            buf.extend(batch)
+            return delay
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """返回当前事件循环对应的并发信号量（懒创建，线程安全）"""
+        loop = asyncio.get_running_loop()
+        with self._semaphore_guard:
+            for closed_loop in [l for l in self._semaphores_by_loop if l.is_closed()]:
+                self._semaphores_by_loop.pop(closed_loop, None)
+            sem = self._semaphores_by_loop.get(loop)
+            if sem is None:
+                sem = asyncio.Semaphore(self.max_concurrency)
+                self._semaphores_by_loop[loop] = sem
+            return sem
+    
+    async def acquire(self):
+        """占用一个请求并发名额，需与 release 成对调用"""
+        await self._get_semaphore().acquire()
+    
+    def release(self):
+        """释放 acquire 占用的并发名额（须在同一事件循环中调用）"""
+        self._get_semaphore().release()
     
     async def human_delay(self):
-        """执行人类化延迟"""
-        import asyncio
+        """执行人类化延迟
+        
+        同一时刻最多 max_concurrency 个任务处于延迟中，其余任务排队，
+        避免 gather 下所有任务同时睡眠后同时打到目标站点。
+        """
         delay = self.get_random_delay()
         logger.debug(f"⏳ 人类化延迟: {delay:.2f}秒")
-        await asyncio.sleep(delay)
+        async with self._get_semaphore():
+            await asyncio.sleep(delay)
     
     def get_stealth_js(self) -> str:
         """获取隐身模式 JavaScript 代码
         
-        用于注入到页面中，隐藏自动化特征
+        用于注入到页面中，隐藏自动化特征。沿用当前配置文件，不计入轮换请求数。
         """
-        profile = self.get_browser_profile()
-        
-        return f"""
-        // 隐藏 webdriver 属性
-        Object.defineProperty(navigator, 'webdriver', {{
-            get: () => undefined
-        }});
-        
-        // 修改 navigator 属性
-        Object.defineProperty(navigator, 'platform', {{
-            get: () => '{profile.platform}'
-        }});
-        
-        Object.defineProperty(navigator, 'vendor', {{
-            get: () => '{profile.vendor}'
-        }});
-        
-        Object.defineProperty(navigator, 'languages', {{
-            get: () => ['{profile.accept_language.split(",")[0]}', 'en']
-        }});
-        
-        // 隐藏自动化相关属性
-        Object.defineProperty(navigator, 'plugins', {{
-            get: () => [
-                {{name: 'Chrome PDF Plugin', filename: 'internal-pdf-viewer'}},
-                {{name: 'Chrome PDF Viewer', filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai'}},
-                {{name: 'Native Client', filename: 'internal-nacl-plugin'}}
-            ]
-        }});
-        
-        // 修改 Chrome 特有属性
-        window.chrome = {{
-            runtime: {{}},
-            loadTimes: function() {{}},
-            csi: function() {{}},
-            app: {{}}
-        }};
-        
-        // 隐藏 Playwright/Puppeteer 特征
-        delete window.__playwright;
-        delete window.__puppeteer;
-        delete window.__selenium_evaluate;
-        delete window.__selenium_unwrapped;
-        delete window.__webdriver_evaluate;
-        delete window.__driver_evaluate;
-        delete window.__webdriver_unwrapped;
-        delete window.__driver_unwrapped;
-        delete window.__lastWatirAlert;
-        delete window.__lastWatirConfirm;
-        delete window.__lastWatirPrompt;
-        delete document.__webdriver_evaluate;
-        delete document.__selenium_evaluate;
-        delete document.__webdriver_script_function;
-        delete document.__webdriver_script_func;
-        delete document.__webdriver_script_fn;
-        delete document.$chrome_asyncScriptInfo;
-        delete document.$cdc_asdjflasutopfhvcZLmcfl_;
         
-        // 修改 permissions 查询
-        const originalQuery = window.navigator.permissions.query;
-        window.navigator.permissions.query = (parameters) => (
-            parameters.name === 'notifications' ?
-            Promise.resolve({{ state: Notification.permission }}) :
-            originalQuery(parameters)
-        );
-        
-        // Canvas 指纹随机化（添加微小噪声）
-        const originalToDataURL = HTMLCanvasElement.prototype.toDataURL;
-        HTMLCanvasElement.prototype.toDataURL = function(type) {{
-            if (type === 'image/png' && this.width > 16 && this.height > 16) {{
-                const ctx = this.getContext('2d');
-                if (ctx) {{
-                    const imageData = ctx.getImageData(0, 0, this.width, this.height);
-                    for (let i = 0; i < imageData.data.length; i += 4) {{
-                        // 添加微小噪声（不影响视觉效果）
-                        imageData.data[i] = Math.max(0, Math.min(255, imageData.data[i] + (Math.random() - 0.5) * 2));
-                    }}
-                    ctx.putImageData(imageData, 0, 0);
-                }}
-            }}
-            return originalToDataURL.apply(this, arguments);
-        }};
-        
-        // WebGL 指纹随机化
-        const getParameterProxyHandler = {{
-            apply: function(target, thisArg, argumentsList) {{
-                const param = argumentsList[0];
-                const gl = thisArg;
-                
-                // 随机化一些不影响功能的参数
-                if (param === 37445) {{ // UNMASKED_VENDOR_WEBGL
-                    return 'Intel Inc.';
-                }}
-                if (param === 37446) {{ // UNMASKED_RENDERER_WEBGL
-                    return 'Intel(R) Iris(TM) Graphics';
-                }}
-                
-                return Reflect.apply(target, thisArg, argumentsList);
-            }}
-        }};
-        
-        try {{
-            const canvas = document.createElement('canvas');
-            const gl = canvas.getContext('webgl') || canvas.getContext('experimental-webgl');
-            if (gl) {{
-                const originalGetParameter = gl.getParameter;
-                gl.getParameter = new Proxy(originalGetParameter, getParameterProxyHandler);
-            }}
-        }} catch(e) {{}}
-        """
+        profile = self._current_profile or self.get_browser_profile()
+        return _STEALTH_JS_TEMPLATE.substitute(
+            platform=profile.platform,
+            vendor=profile.vendor,
+            language=profile.accept_language.split(',', 1)[0],
+        )
     
     def get_http_headers(self, url: str = None) -> Dict[str, str]:
         """获取伪装的 HTTP 请求头
@@ -390,6 +605,8 @@ class AntiScrapingManager:
             Dict: HTTP 请求头字典
         """
         profile = self.get_browser_profile()
+        if profile is self._cached_headers_profile and self._cached_headers is not None:
+            return self._cached_headers.copy()
         
         headers = {
             'User-Agent': profile.user_agent,
@@ -407,24 +624,21 @@ class AntiScrapingManager:
         
         # 添加 Chrome 特有的 Sec-Ch-Ua 头
         if 'Chrome' in profile.user_agent:
-            chrome_version = '120'
             # 从 UA 中提取版本号
-            import re
-            match = re.search(r'Chrome/(\d+)', profile.user_agent)
-            if match:
-                chrome_version = match.group(1)
-            
-            headers.update({
-                'Sec-Ch-Ua': f'"Not_A Brand";v="8", "Chromium";v="{chrome_version}", "Google Chrome";v="{chrome_version}"',
-                'Sec-Ch-Ua-Mobile': '?0',
-                'Sec-Ch-Ua-Platform': f'"{profile.platform.replace("32", "").replace("Intel", "").strip()}"',
-            })
+            match = _CHROME_VER_RE.search(profile.user_agent)
+            chrome_version = match.group(1) if match else '120'
+            sec_ch_ua = _SEC_CH_UA_TABLE.get((chrome_version, profile.platform))
+            if sec_ch_ua is None:
+                sec_ch_ua = _build_sec_ch_ua_headers(chrome_version, profile.platform)
+            headers.update(sec_ch_ua)
         
         # 添加 Referer（如果有）
         if profile.referer:
             headers['Referer'] = profile.referer
         
-        return headers
+        self._cached_headers = headers
+        self._cached_headers_profile = profile
+        return headers.copy()
     
     def get_browser_config(self) -> Dict:
         """获取 Playwright/Crawl4AI 浏览器配置
@@ -433,7 +647,14 @@ class AntiScrapingManager:
             Dict: 浏览器配置字典
         """
         profile = self.get_browser_profile()
-        
+        if self._cached_browser_cfg is None:
+            self._cached_browser_cfg = self._build_browser_config(profile)
+        cfg = self._cached_browser_cfg
+        return {**cfg, 'extra_args': list(cfg['extra_args'])}
+    
+    @staticmethod
+    def _build_browser_config(profile: BrowserProfile) -> Dict:
+        """根据配置文件构建浏览器配置字典"""
         return {
             'headless': True,
             'viewport_width': profile.viewport_width,
@@ -462,6 +683,11 @@ class AntiScrapingManager:
         Returns:
             Dict: 爬取配置字典
         """
+        key = (timeout, wait_for, self.stealth_mode)
+        cached = self._cached_crawler_cfgs.get(key)
+        if cached is not None:
+            return cached.copy()
+        
         config = {
             'page_timeout': timeout,
             'remove_overlay_elements': True,
@@ -475,7 +701,27 @@ class AntiScrapingManager:
         if self.stealth_mode:
             config['js_code'] = self.get_stealth_js()
         
-        return config
+        self._cached_crawler_cfgs[key] = config
+        return config.copy()
+
+
+@lru_cache(maxsize=32)
+def _bezier_weights(steps: int) -> Tuple[Tuple[float, float, float, float], ...]:
+    """按步数缓存三次贝塞尔曲线的 Bernstein 权重（与控制点无关，可复用）"""
+    weights = []
+    for i in range(steps):
+        t = i / (steps - 1)
+        mt = 1 - t
+        weights.append((mt ** 3, 3 * mt ** 2 * t, 3 * mt * t ** 2, t ** 3))
+    return tuple(weights)
+
+
+@lru_cache(maxsize=32)
+def _bezier_weight_matrix(steps: int):
+    """_bezier_weights 的 numpy 版本，返回只读的 (steps, 4) 矩阵"""
+    matrix = _np().array(_bezier_weights(steps))
+    matrix.flags.writeable = False
+    return matrix
 
 
 class MouseSimulator:
@@ -499,48 +745,61 @@ class MouseSimulator:
     
     @staticmethod
     def generate_human_path(start: Tuple[int, int], end: Tuple[int, int], 
-                           steps: int = 50) -> List[Tuple[int, int]]:
+                           steps: int = 50,
+                           rng: Optional[random.Random] = None) -> List[Tuple[int, int]]:
         """生成模拟人类的鼠标移动路径
         
         Args:
             start: 起始点 (x, y)
             end: 终点 (x, y)
             steps: 路径点数量
+            rng: 随机数生成器（默认使用模块级 random）
             
         Returns:
             List: 路径点列表
         """
+        rng = rng or random
         # 生成随机控制点（模拟人类不精确的移动）
         dx = end[0] - start[0]
         dy = end[1] - start[1]
         
         # 控制点偏移（添加曲线感）
-        offset_x = random.uniform(-abs(dx) * 0.3, abs(dx) * 0.3)
-        offset_y = random.uniform(-abs(dy) * 0.3, abs(dy) * 0.3)
+        offset_x = rng.uniform(-abs(dx) * 0.3, abs(dx) * 0.3)
+        offset_y = rng.uniform(-abs(dy) * 0.3, abs(dy) * 0.3)
         
         p0 = (float(start[0]), float(start[1]))
         p1 = (start[0] + dx * 0.3 + offset_x, start[1] + dy * 0.3 + offset_y)
         p2 = (start[0] + dx * 0.7 + offset_x * 0.5, start[1] + dy * 0.7 + offset_y * 0.5)
         p3 = (float(end[0]), float(end[1]))
         
+        np = _np()
+        if np is not None and steps > 1:
+            # 以 (steps, 4) 权重矩阵与控制点相乘，一次得到全部路径点
+            points = _bezier_weight_matrix(steps) @ np.array((p0, p1, p2, p3))
+            # 添加微小抖动
+            points += _np_rng(np, rng).uniform(-2, 2, (steps, 2))
+            return [tuple(p) for p in points.astype(int).tolist()]
+        
         path = []
-        for i in range(steps):
-            t = i / (steps - 1)
+        for b0, b1, b2, b3 in _bezier_weights(steps):
+            x = b0 * p0[0] + b1 * p1[0] + b2 * p2[0] + b3 * p3[0]
+            y = b0 * p0[1] + b1 * p1[1] + b2 * p2[1] + b3 * p3[1]
             # 添加微小抖动
-            x, y = MouseSimulator.bezier_curve(t, p0, p1, p2, p3)
-            x += random.uniform(-2, 2)
-            y += random.uniform(-2, 2)
+            x += rng.uniform(-2, 2)
+            y += rng.uniform(-2, 2)
             path.append((int(x), int(y)))
         
         return path
     
     @staticmethod
-    def generate_scroll_pattern(total_distance: int, step_count: int = 5) -> List[int]:
+    def generate_scroll_pattern(total_distance: int, step_count: int = 5,
+                                rng: Optional[random.Random] = None) -> List[int]:
         """生成人类化的滚动模式
         
         Args:
             total_distance: 总滚动距离
             step_count: 滚动步数
+            rng: 随机数生成器（默认使用模块级 random）
             
         Returns:
             List: 每步滚动距离列表
@@ -548,13 +807,37 @@ class MouseSimulator:
         if step_count <= 0:
             return [total_distance]
         
+        rng = rng or random
+        np = _np()
+        if np is not None:
+            # 一次生成全部步长；只缩放超出 50 像素下限的部分，保证每步不低于下限且总和等于总距离
+            portions = _np_rng(np, rng).normal(total_distance / step_count,
+                                           abs(total_distance) * 0.1 / step_count, step_count)
+            budget = total_distance - 50 * step_count
+            if budget >= 0:
+                extras = np.clip(portions - 50, 0, None)
+                extras_sum = extras.sum()
+                if extras_sum > 0:
+                    extras *= budget / extras_sum
+                else:
+                    extras = np.full(step_count, budget / step_count)
+                portions = 50 + extras
+            else:
+                # 总距离不足以让每步都达到下限：按比例分配
+                portions = np.clip(portions, 50, None)
+                portions *= total_distance / portions.sum()
+            distances = portions.astype(int)
+            # 取整误差补到最后一步，保证总和不变
+            distances[-1] += total_distance - int(distances.sum())
+            return distances.tolist()
+        
         # 使用正态分布生成滚动距离
         distances = []
         remaining = total_distance
         
         for i in range(step_count - 1):
             # 随机分配剩余距离
-            portion = random.gauss(remaining / (step_count - i), remaining * 0.1)
+            portion = rng.gauss(remaining / (step_count - i), remaining * 0.1)
             portion = max(50, min(portion, remaining - 50 * (step_count - i - 1)))
             distances.append(int(portion))
             remaining -= int(portion)
@@ -563,8 +846,20 @@ class MouseSimulator:
         return distances
 
 
-# 全局实例
-_anti_scraping_manager: Optional[AntiScrapingManager] = None
+@lru_cache(maxsize=None)
+def _build_manager(rotate_user_agent: bool, random_delay: bool, stealth_mode: bool,
+                   min_delay: float, max_delay: float, max_concurrency: int,
+                   homogeneous: bool) -> AntiScrapingManager:
+    """按参数缓存的管理器构造函数（lru_cache 保证同一参数只返回同一实例）"""
+    return AntiScrapingManager(
+        rotate_user_agent=rotate_user_agent,
+        random_delay=random_delay,
+        stealth_mode=stealth_mode,
+        min_delay=min_delay,
+        max_delay=max_delay,
+        max_concurrency=max_concurrency,
+        homogeneous=homogeneous
+    )
 
 
 def get_anti_scraping_manager(
@@ -572,9 +867,11 @@ def get_anti_scraping_manager(
     random_delay: bool = True,
     stealth_mode: bool = True,
     min_delay: float = 1.0,
-    max_delay: float = 5.0
+    max_delay: float = 5.0,
+    max_concurrency: int = 8,
+    homogeneous: bool = False
 ) -> AntiScrapingManager:
-    """获取防反爬管理器单例
+    """获取防反爬管理器单例（相同参数返回同一实例）
     
     Args:
         rotate_user_agent: 是否轮换 User-Agent
@@ -582,34 +879,35 @@ def get_anti_scraping_manager(
         stealth_mode: 是否启用隐身模式
         min_delay: 最小延迟（秒）
         max_delay: 最大延迟（秒）
+        max_concurrency: 同时进行中的请求（含延迟）上限
+        homogeneous: 是否固定使用统一的标准配置文件（不轮换）
         
     Returns:
         AntiScrapingManager: 防反爬管理器实例
     """
-    global _anti_scraping_manager
-    
-    if _anti_scraping_manager is None:
-        _anti_scraping_manager = AntiScrapingManager(
-            rotate_user_agent=rotate_user_agent,
-            random_delay=random_delay,
-            stealth_mode=stealth_mode,
-            min_delay=min_delay,
-            max_delay=max_delay
-        )
-    
-    return _anti_scraping_manager
+    return _build_manager(rotate_user_agent, random_delay, stealth_mode,
+                          min_delay, max_delay, max_concurrency, homogeneous)
 
 
 def reset_anti_scraping_manager():
     """重置防反爬管理器"""
-    global _anti_scraping_manager
-    _anti_scraping_manager = None
+    _build_manager.cache_clear()
 
 
 # 便捷函数
+_user_agent_prefetch: deque = deque()
+
+
 def get_random_user_agent() -> str:
     """获取随机 User-Agent"""
-    return random.choice(ALL_USER_AGENTS)
+    # 多个线程共用缓冲：不先判空再取（判空与取值之间可能被其他线程取空），取空时由本线程补一批
+    try:
+        return _user_agent_prefetch.popleft()
+    except IndexError:
+        batch = random.choices(ALL_USER_AGENTS, k=_PREFETCH_SIZE)
+        user_agent = batch.pop()
+        _user_agent_prefetch.extend(batch)
+        return user_agent
 
 
 def get_random_viewport() -> Tuple[int, int]:
@@ -617,10 +915,21 @@ def get_random_viewport() -> Tuple[int, int]:
     return random.choice(VIEWPORT_SIZES)
 
 
+_human_delay_buffers: Dict[Tuple[float, float], deque] = {}
+
+
 def get_human_delay(min_delay: float = 1.0, max_delay: float = 5.0) -> float:
     """获取人类化延迟（正态分布）"""
-    mean = (min_delay + max_delay) / 2
-    std_dev = (max_delay - min_delay) / 4
-    delay = random.gauss(mean, std_dev)
-    return max(min_delay, min(max_delay, delay))
+    # 与 get_random_user_agent 相同：不先判空再取，取空（含被其他线程取空）时由本线程补一批
+    key = (min_delay, max_delay)
+    buf = _human_delay_buffers.get(key)
+    if buf is None:
+        buf = _human_delay_buffers.setdefault(key, deque())
+    try:
+        return buf.popleft()
+    except IndexError:
+        batch = _sample_delays(min_delay, max_delay, _PREFETCH_SIZE)
+        delay = batch.pop()
+        buf.extend(batch)
+        return delay
 
@@ -1,45 +1,73 @@
 """
 Flask应用 - 简单的RESTful API和前端
 """
-from flask import Flask, render_template, request, jsonify, Response, g
+from flask import Flask, render_template, request, jsonify, Response, g, stream_with_context
 from flask_cors import CORS
 import asyncio
+import atexit
+import concurrent.futures
+import gzip
 import hashlib
 import re
 import threading
 import time
+import zlib
+from datetime import date, datetime
 from uuid import uuid4
 from typing import Optional
 from werkzeug.exceptions import HTTPException
 from .database import (
     init_db, add_article, get_all_articles_with_latest_count,
-    get_read_counts, delete_article, get_setting, set_setting,
-    add_read_count, get_all_failures, get_failure_stats
+    get_read_counts, delete_article, get_cached_setting, set_setting,
+    add_read_count, get_all_failures, get_failure_stats, get_data_generation
 )
 import logging
 
 from .scheduler import start_scheduler
+# 以模块形式引用，调用时再取属性：既免去请求内的 import 开销，又保留对源模块的 monkeypatch 效果
+from . import bitable_sync as _bitable_sync
+from . import crawler as _crawler
+from . import database as _database
+from . import scheduler as _scheduler
+from . import task_manager as _task_manager
 from .config import (
-    FLASK_HOST, FLASK_PORT, FLASK_DEBUG, CRAWL_INTERVAL_HOURS,
+    FLASK_HOST, FLASK_PORT, FLASK_DEBUG, CRAWL_INTERVAL_HOURS, CORS_ORIGINS,
+    ARTICLES_LIST_CACHE_SECONDS,
     FEISHU_BITABLE_APP_TOKEN, FEISHU_BITABLE_TABLE_ID,
     is_platform_allowed,
 )
 logger = logging.getLogger(__name__)
 from .logging_context import (
+    current_log_context_or_none,
     set_log_context,
     reset_log_context,
     run_with_current_log_context,
+    with_log_context,
 )
 
 # Rate limit: min seconds between POST /api/bitable/sync calls (per app_token + table_id)
 BITABLE_SYNC_RATE_LIMIT_SECONDS = 60
 BITABLE_SYNC_GLOBAL_RATE_LIMIT_SECONDS = 2
 BITABLE_SYNC_MAX_INFLIGHT_TASKS = 20
+# time.monotonic() 时间戳；0.0 表示尚未同步过
 _last_bitable_sync_time_by_source = {}
 _last_bitable_sync_global_time = 0.0
 _bitable_sync_inflight_tasks = 0
 _bitable_sync_rate_limit_lock = threading.Lock()
 
+# 响应压缩：JSON 列表与 CSV 导出重复键/URL 前缀多，gzip 后通常缩小 5-10 倍
+GZIP_MIMETYPES = frozenset({'application/json', 'text/csv'})
+GZIP_MIN_SIZE = 1024
+GZIP_COMPRESS_LEVEL = 4
+
+# 文章列表快取：{'data': 上次查詢結果, 'ts': 查詢完成的 monotonic 時間, 'generation': 查詢前的資料代數}；
+# 本進程任何文章 / 閱讀數寫入（含後台任務、定時爬取）都會遞增資料代數，代數不同即視為過期
+_articles_list_cache = {'data': None, 'ts': 0.0, 'generation': 0}
+_articles_list_cache_lock = threading.Lock()
+
+# 批量添加 ?wait=1 时最多阻塞等待任务结束的秒数，超时退回 202 + task_id
+BATCH_WAIT_TIMEOUT_SECONDS = 30
+
 
 def _prune_bitable_sync_rate_limit(now_ts: float):
     """清理过期 rate-limit 记录，避免常驻进程字典无限增长。"""
@@ -67,12 +95,71 @@ def _source_rate_limit_key(app_token: Optional[str], table_id: Optional[str]) ->
 
 
 from .url_utils import normalize_url, validate_and_normalize_url
-from .article_service import _process_urls_async, _process_urls_sync, crawl_single_url_for_result
+from .article_service import (
+    _process_urls_async,
+    crawl_single_url_for_result,
+    lookup_recent_results,
+)
 from .export_service import export_selected_articles_csv, export_all_articles_csv
 from .health_service import get_system_health_payload
+from .browser_pool import get_browser_pool
+
+# 常驻事件循环：请求内的爬取协程统一提交到这里，浏览器池实例得以跨请求复用
+_crawl_loop: Optional[asyncio.AbstractEventLoop] = None
+_crawl_loop_lock = threading.Lock()
+
+
+def _get_crawl_loop() -> asyncio.AbstractEventLoop:
+    """获取（必要时启动）常驻爬取事件循环线程"""
+    global _crawl_loop
+    with _crawl_loop_lock:
+        if _crawl_loop is None or _crawl_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="crawl-loop", daemon=True).start()
+            _crawl_loop = loop
+        return _crawl_loop
+
+
+# 全量爬取（手动触发 / 失败重试）共用的后台线程：线程数有上限，运行中的重复触发合并为同一次
+_crawl_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="crawl")
+_crawl_future: Optional[concurrent.futures.Future] = None
+_crawl_future_lock = threading.Lock()
+
+
+def _submit_full_crawl() -> bool:
+    """提交一次后台全量爬取；已有爬取在运行时不重复提交，返回 False"""
+    global _crawl_future
+    with _crawl_future_lock:
+        if _crawl_future is not None and not _crawl_future.done():
+            return False
+        _crawl_future = _crawl_executor.submit(run_with_current_log_context, _crawler.crawl_all_sync)
+        return True
+
+
+def _run_async(coro):
+    """在常驻事件循环上执行协程并阻塞等待结果（替代每个请求 asyncio.run 新建/销毁 loop）"""
+    wrapped = with_log_context(coro, current_log_context_or_none())
+    return asyncio.run_coroutine_threadsafe(wrapped, _get_crawl_loop()).result()
+
+
+@atexit.register
+def _shutdown_crawl_loop():
+    """进程退出时在所属 loop 上关闭浏览器实例并停止 loop"""
+    loop = _crawl_loop
+    if loop is None or loop.is_closed() or not loop.is_running():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(get_browser_pool().close_all(), loop).result(timeout=10)
+    except Exception as e:
+        logger.debug(f"关闭浏览器池失败: {e}")
+    loop.call_soon_threadsafe(loop.stop)
 
 app = Flask(__name__)
-CORS(app)
+# 只对 /api/* 启用 CORS：首页、静态资源等不经过跨域处理
+CORS(app, resources={r"/api/*": {"origins": CORS_ORIGINS}})
+# JSON 响应：不逐个 dict 排序键，中文直接输出 UTF-8 而非 \uXXXX 转义（文章列表体积显著减小）
+app.json.sort_keys = False
+app.json.ensure_ascii = False
 
 _REQUEST_ID_PATTERN = r"^[A-Za-z0-9._:-]{8,64}$"
 
@@ -137,6 +224,72 @@ def _after_request_logging(response):
     return response
 
 
+def _gzip_stream(chunks):
+    """把流式响应的每个块压缩为同一个 gzip 流，边读边吐，不缓存整个文件。"""
+    compressor = zlib.compressobj(GZIP_COMPRESS_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    try:
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+    finally:
+        # 提前断开时也要关闭底层迭代器（释放导出查询的数据库连接）
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+@app.after_request
+def _compress_response(response):
+    """客户端支持 gzip 时压缩较大的 JSON 响应与流式 CSV 导出。"""
+    if (
+        not 200 <= response.status_code < 300
+        or 'Content-Encoding' in response.headers
+        or response.mimetype not in GZIP_MIMETYPES
+    ):
+        return response
+    response.vary.add('Accept-Encoding')
+    if 'gzip' not in request.headers.get('Accept-Encoding', '').lower():
+        return response
+
+    # 壓縮後位元組不同，強 ETag 降為弱 ETag（條件請求仍按弱比較命中）
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+    if response.is_streamed:
+        response.response = _gzip_stream(response.response)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < GZIP_MIN_SIZE:
+            return response
+        response.set_data(gzip.compress(data, compresslevel=GZIP_COMPRESS_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
+def _get_articles_list():
+    """文章列表（帶最新閱讀數）：期間無寫入時，ARTICLES_LIST_CACHE_SECONDS 內重用上次查詢結果。"""
+    # 代數在查詢前取得：查詢期間若有寫入，記錄的代數已落後，下一次請求會重新查詢
+    generation = get_data_generation()
+    with _articles_list_cache_lock:
+        cached = _articles_list_cache['data']
+        if (
+            cached is not None
+            and _articles_list_cache['generation'] == generation
+            and time.monotonic() - _articles_list_cache['ts'] < ARTICLES_LIST_CACHE_SECONDS
+        ):
+            return cached
+    articles = get_all_articles_with_latest_count()
+    with _articles_list_cache_lock:
+        _articles_list_cache['data'] = articles
+        _articles_list_cache['ts'] = time.monotonic()
+        _articles_list_cache['generation'] = generation
+    return articles
+
+
 @app.teardown_request
 def _teardown_request_logging(exc):
     if exc is not None:
@@ -195,13 +348,14 @@ def favicon():
 
 @app.route('/api/articles', methods=['GET'])
 def get_articles():
-    """获取所有文章（优化：使用批量查询避免N+1问题）"""
-    articles = get_all_articles_with_latest_count()
-    return api_success(articles)
+    """获取所有文章（优化：使用批量查询避免N+1问题；短时快取 + ETag，轮询未变化时返回 304）"""
+    response, _ = api_success(_get_articles_list())
+    response.add_etag()
+    return response.make_conditional(request)
 
 @app.route('/api/articles/batch', methods=['POST'])
 def create_articles_batch():
-    """批量添加文章（优化：使用异步任务队列，立即返回任务ID）"""
+    """批量添加文章（统一使用异步任务队列，返回 202 与任务ID；?wait=1 可同步等待结果）"""
     data = request.json
     urls = data.get('urls', [])
     
@@ -209,34 +363,33 @@ def create_articles_batch():
         return api_error('URL列表不能为空', 400)
     
     # 去重、過濾空值、規範化 URL
-    urls = list(set([normalize_url(u.strip()) for u in urls if u.strip()]))
+    # dict.fromkeys 单次遍历去重并保留首次出现顺序，结果顺序与提交顺序一致
+    urls = list(dict.fromkeys(normalize_url(s) for s in (u.strip() for u in urls) if s))
     
     if not urls:
         return api_error('有效URL不能为空', 400)
         
-    # 如果URL数量较少（<=5），直接处理；否则使用异步任务
-    if len(urls) <= 5:
-        # 小批量：直接处理
-        try:
-            results = asyncio.run(_process_urls_sync(urls))
-            return jsonify({'success': True, 'results': results})
-        except ValueError as e:
-            logger.warning(f"批量添加文章參數錯誤: {e}")
-            return api_error(f'參數錯誤: {str(e)}', 400)
-        except Exception as e:
-            logger.error(f"批量添加文章失敗: {e}", exc_info=True)
+    # 统一走任务队列并立即返回 202，客户端轮询 status_url；?wait=1 时在超时内等待同一任务的结果
+    task_manager = _task_manager.get_task_manager()
+    task_id = task_manager.submit_task(_process_urls_async, urls)
+    if request.args.get('wait') == '1' and task_manager.wait_for_task(
+        task_id, timeout=BATCH_WAIT_TIMEOUT_SECONDS
+    ):
+        task = task_manager.get_task(task_id) or {}
+        if task.get('status') == 'failed':
+            logger.error(f"批量添加文章失敗: {task.get('error')}")
             return api_error('服务器内部错误，请稍后重试', 500)
-    else:
-        # 大批量：使用异步任务队列
-        from .task_manager import get_task_manager
-        task_manager = get_task_manager()
-        task_id = task_manager.submit_task(_process_urls_async, urls)
         return jsonify({
             'success': True,
             'task_id': task_id,
-            'message': f'已提交 {len(urls)} 个URL，正在后台处理',
-            'status_url': f'/api/tasks/{task_id}'
+            'results': task_manager.get_task_results(task_id) or [],
         })
+    return jsonify({
+        'success': True,
+        'task_id': task_id,
+        'message': f'已提交 {len(urls)} 个URL，正在后台处理',
+        'status_url': f'/api/tasks/{task_id}'
+    }), 202
 
 @app.route('/api/articles', methods=['POST'])
 def create_article():
@@ -247,7 +400,19 @@ def create_article():
     if not url:
         return api_error('URL不能为空', 400)
 
-    crawl_result = asyncio.run(crawl_single_url_for_result(url))
+    # 已存在且最近爬取过的文章直接返回库内结果，不再启动浏览器
+    cached = lookup_recent_results([url]).get(url)
+    if cached:
+        cached_data = cached['data']
+        return api_success({
+            'id': cached_data['id'],
+            'url': cached['url'],
+            'title': cached_data['title'],
+            'site': cached_data['site'],
+            'initial_count': cached_data['initial_count'],
+        })
+
+    crawl_result = _run_async(crawl_single_url_for_result(url))
     if not crawl_result.get('success'):
         error_message = crawl_result.get('error', 'URL处理失败')
         error_code = crawl_result.get('error_code')
@@ -308,8 +473,7 @@ def get_history(article_id):
         history = get_read_counts(article_id, limit=limit, start_date=start_date, end_date=end_date, group_by_hour=group_by_hour)
         
         # 获取文章信息（优化：直接查询单篇文章，避免获取所有文章）
-        from .database import get_article_by_id
-        article = get_article_by_id(article_id)
+        article = _database.get_article_by_id(article_id)
         
         if not article:
             return jsonify({'success': False, 'error': '文章不存在'}), 404
@@ -333,11 +497,9 @@ def get_history(article_id):
 def manual_crawl():
     """手动触发爬取"""
     try:
-        from .crawler import crawl_all_sync
         # 在后台执行
-        import threading
-        thread = threading.Thread(target=lambda: run_with_current_log_context(crawl_all_sync))
-        thread.start()
+        if not _submit_full_crawl():
+            return jsonify({'success': True, 'message': '爬取任务已在运行'})
         return jsonify({'success': True, 'message': '爬取任务已启动'})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -346,8 +508,7 @@ def manual_crawl():
 def stop_crawl():
     """停止爬取"""
     try:
-        from .crawler import stop_crawling
-        stop_crawling()
+        _crawler.stop_crawling()
         return jsonify({'success': True, 'message': '正在停止爬取...'})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -356,7 +517,7 @@ def stop_crawl():
 def get_settings():
     """获取设置"""
     try:
-        interval_hours = get_setting('crawl_interval_hours', str(CRAWL_INTERVAL_HOURS))
+        interval_hours = get_cached_setting('crawl_interval_hours', str(CRAWL_INTERVAL_HOURS))
         # 确保返回整数
         try:
             interval_hours = int(interval_hours)
@@ -392,8 +553,7 @@ def update_settings():
         set_setting('crawl_interval_hours', interval_hours)
         
         # 更新定时任务
-        from .scheduler import update_schedule
-        update_schedule()
+        _scheduler.update_schedule()
         
         return jsonify({
             'success': True,
@@ -406,8 +566,6 @@ def update_settings():
 def get_statistics():
     """获取统计数据 - 返回日期或小时范围"""
     try:
-        from datetime import datetime, timedelta
-
         # 支持 days 参数（兼容旧版本）或 start_date/end_date
         days = request.args.get('days', type=int)
         start_date = request.args.get('start_date')
@@ -419,29 +577,21 @@ def get_statistics():
             days = 7
 
         # 生成时间序列
-        date_list = []
-        
         # 如果是按小时分组（今天视图）
         if group_by_hour and start_date and start_date == end_date:
-            # 生成今天的24小时时间点
-            start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-            for hour in range(24):
-                time_point = start_dt + timedelta(hours=hour)
-                date_list.append(time_point.strftime('%Y-%m-%d %H:00:00'))
+            # 生成今天的24小时时间点（先校验日期格式，再直接拼接字符串）
+            day = datetime.strptime(start_date, '%Y-%m-%d').date().isoformat()
+            date_list = [f'{day} {hour:02d}:00:00' for hour in range(24)]
         elif start_date and end_date:
-            # 使用自定义日期范围
-            start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-            end_dt = datetime.strptime(end_date, '%Y-%m-%d')
-            current = start_dt
-            while current <= end_dt:
-                date_list.append(current.strftime('%Y-%m-%d'))
-                current += timedelta(days=1)
+            # 使用自定义日期范围（按日序数生成，date.isoformat 为 C 实现，免去 strftime 与 timedelta 运算）
+            start_ord = datetime.strptime(start_date, '%Y-%m-%d').toordinal()
+            end_ord = datetime.strptime(end_date, '%Y-%m-%d').toordinal()
+            date_list = [date.fromordinal(o).isoformat() for o in range(start_ord, end_ord + 1)]
             days = len(date_list)
         else:
-            # 使用days参数
-            for i in range(days):
-                date = (datetime.now() - timedelta(days=days-1-i)).strftime('%Y-%m-%d')
-                date_list.append(date)
+            # 使用days参数（只取一次当前时间，避免跨零点时序列错位）
+            end_ord = date.today().toordinal()
+            date_list = [date.fromordinal(o).isoformat() for o in range(end_ord - days + 1, end_ord + 1)]
 
         return jsonify({
             'success': True,
@@ -462,8 +612,7 @@ def get_statistics():
 def get_crawl_progress():
     """获取爬取进度"""
     try:
-        from .crawler import get_crawl_progress
-        progress = get_crawl_progress()
+        progress = _crawler.get_crawl_progress()
         return jsonify({'success': True, 'data': progress})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -472,8 +621,7 @@ def get_crawl_progress():
 def get_task_status(task_id):
     """获取任务状态"""
     try:
-        from .task_manager import get_task_manager
-        task_manager = get_task_manager()
+        task_manager = _task_manager.get_task_manager()
         task = task_manager.get_task(task_id)
         if task:
             return jsonify({'success': True, 'data': task})
@@ -487,8 +635,7 @@ def get_task_status(task_id):
 def get_running_tasks():
     """获取系统当前正在执行/排队的任务列表。"""
     try:
-        from .task_manager import get_task_manager
-        task_manager = get_task_manager()
+        task_manager = _task_manager.get_task_manager()
         tasks = task_manager.get_active_tasks()
         return jsonify({'success': True, 'data': tasks})
     except Exception as e:
@@ -498,8 +645,7 @@ def get_running_tasks():
 def cancel_task(task_id):
     """取消任务"""
     try:
-        from .task_manager import get_task_manager
-        task_manager = get_task_manager()
+        task_manager = _task_manager.get_task_manager()
         if task_manager.cancel_task(task_id):
             return jsonify({'success': True, 'message': '任务已取消'})
         else:
@@ -531,18 +677,17 @@ def get_failures():
 def retry_failure(article_id):
     """重试失败的文章"""
     try:
-        from .crawler import crawl_all_sync
-        from .database import get_article_by_id
-        
         # 检查文章是否存在
-        article = get_article_by_id(article_id)
+        article = _database.get_article_by_id(article_id)
         if not article:
             return jsonify({'success': False, 'error': '文章不存在'}), 404
         
         # 在后台执行爬取
-        import threading
-        thread = threading.Thread(target=lambda: run_with_current_log_context(crawl_all_sync))
-        thread.start()
+        if not _submit_full_crawl():
+            return jsonify({
+                'success': True,
+                'message': '爬取任务正在运行，请稍后查看结果'
+            })
         
         return jsonify({
             'success': True,
@@ -565,8 +710,9 @@ def export_csv():
 
         content, filename = export_selected_articles_csv(article_ids, start_date, end_date)
 
+        # 保持请求上下文直到流式输出结束（请求日志与 teardown 覆盖整个下载过程）
         return Response(
-            content,
+            stream_with_context(content),
             mimetype='text/csv',
             headers={
                 'Content-Disposition': f'attachment; filename={filename}',
@@ -587,8 +733,9 @@ def export_all_csv():
 
         content, filename = export_all_articles_csv(start_date, end_date)
 
+        # 保持请求上下文直到流式输出结束（请求日志与 teardown 覆盖整个下载过程）
         return Response(
-            content,
+            stream_with_context(content),
             mimetype='text/csv',
             headers={
                 'Content-Disposition': f'attachment; filename={filename}',
@@ -607,8 +754,6 @@ async def _run_bitable_sync_async(
     table_id: Optional[str] = None,
 ):
     """后台执行 Bitable 同步，结果写入任务 progress。"""
-    from .task_manager import get_task_manager
-    from .bitable_sync import sync_from_bitable_via_shared_pool
     global _bitable_sync_inflight_tasks
 
     source_info = {
@@ -619,7 +764,7 @@ async def _run_bitable_sync_async(
     def _report_progress(event: dict):
         progress_payload = {'source': source_info}
         progress_payload.update(event or {})
-        get_task_manager().update_task_progress(task_id, progress_payload)
+        _task_manager.get_task_manager().update_task_progress(task_id, progress_payload)
 
     try:
         _report_progress({
@@ -627,7 +772,7 @@ async def _run_bitable_sync_async(
             'batch_url_progress': {'processed': 0, 'total': 0},
         })
         result = await asyncio.to_thread(
-            sync_from_bitable_via_shared_pool,
+            _bitable_sync.sync_from_bitable_via_shared_pool,
             {
                 'app_token': app_token,
                 'table_id': table_id,
@@ -645,7 +790,7 @@ async def _run_bitable_sync_async(
         }
         if result.get('message'):
             progress['message'] = result['message']
-        get_task_manager().update_task_progress(task_id, progress)
+        _task_manager.get_task_manager().update_task_progress(task_id, progress)
     finally:
         with _bitable_sync_rate_limit_lock:
             _bitable_sync_inflight_tasks = max(0, _bitable_sync_inflight_tasks - 1)
@@ -662,30 +807,30 @@ def bitable_sync():
         if not app_token or not table_id:
             return api_error('app_token 和 table_id 为必填', 400)
 
-        now = time.time()
         source_key = _source_rate_limit_key(app_token, table_id)
         with _bitable_sync_rate_limit_lock:
+            # 在锁内取时间并检查、写入，保证并发请求按先后依次判定；monotonic 不受系统校时影响
+            now = time.monotonic()
             if _bitable_sync_inflight_tasks >= BITABLE_SYNC_MAX_INFLIGHT_TASKS:
                 return jsonify({
                     'success': False,
                     'error': '同步任务过多，请稍后再试',
                 }), 429
-            if now - _last_bitable_sync_global_time < BITABLE_SYNC_GLOBAL_RATE_LIMIT_SECONDS:
+            if _last_bitable_sync_global_time and now - _last_bitable_sync_global_time < BITABLE_SYNC_GLOBAL_RATE_LIMIT_SECONDS:
                 return jsonify({
                     'success': False,
                     'error': '请求过于频繁，请稍后再试',
                 }), 429
             _prune_bitable_sync_rate_limit(now)
-            last_time = _last_bitable_sync_time_by_source.get(source_key, 0.0)
-            if now - last_time < BITABLE_SYNC_RATE_LIMIT_SECONDS:
+            last_time = _last_bitable_sync_time_by_source.get(source_key)
+            if last_time is not None and now - last_time < BITABLE_SYNC_RATE_LIMIT_SECONDS:
                 return api_error('请求过于频繁，请稍后再试', 429)
             _last_bitable_sync_global_time = now
             _last_bitable_sync_time_by_source[source_key] = now
             _bitable_sync_inflight_tasks += 1
 
-        from .task_manager import get_task_manager
         try:
-            task_id = get_task_manager().submit_task(
+            task_id = _task_manager.get_task_manager().submit_task(
                 _run_bitable_sync_async,
                 app_token=app_token,
                 table_id=table_id,
@@ -727,6 +872,6 @@ if __name__ == '__main__':
     # 启动定时任务
     start_scheduler()
     
-    # 启动Flask
-    app.run(host=FLASK_HOST, port=FLASK_PORT, debug=FLASK_DEBUG)
+    # 启动Flask（每个请求一个线程；调度器、任务表、浏览器池等状态都在本进程内，故保持单进程）
+    app.run(host=FLASK_HOST, port=FLASK_PORT, debug=FLASK_DEBUG, threaded=True)
 
@@ -3,9 +3,13 @@ from __future__ import annotations
 import asyncio
 import logging
 import random
+import sqlite3
+import threading
 import time
+from collections import deque
+from functools import lru_cache
 from enum import Enum
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from urllib.parse import urlparse
 
 from .config import (
@@ -14,6 +18,7 @@ from .config import (
     CRAWL_TIMEOUT,
     CRAWL_CONCURRENCY_PER_DOMAIN,
     CRAWL_MIN_DELAY_PER_DOMAIN,
+    CRAWL_INTERLEAVE_BY_SITE,
     RESULT_RETRY_EXTRA_PASSES,
     is_platform_allowed,
     CRAWL_RETRY_DELAY,
@@ -24,11 +29,18 @@ from .config import (
     CRAWL_RETRY_NETWORK_MAX,
     CRAWL_RETRY_PARSE_MAX,
     CRAWL_RETRY_SSL_MAX,
+    ARTICLE_ADD_CACHE_SECONDS,
 )
 from .task_manager import get_task_manager
 from .browser_pool import get_browser_pool
 from .extractors import extract_article_info, create_shared_crawler
-from .database import add_articles_batch, add_read_counts_batch
+from .database import (
+    add_articles_batch,
+    add_articles_with_read_counts,
+    add_read_counts_batch,
+    get_existing_articles_by_urls,
+    get_recent_articles_by_urls,
+)
 from .retry_policy import RESULT_RETRYABLE_ERROR_CODES
 from .url_utils import validate_and_normalize_url
 
@@ -243,6 +255,25 @@ async def _crawl_single_with_retry(
         }
 
 
+# 批量爬取的并发上限按事件循环共享：同一 loop 上重叠的多个批次/任务合计不超过 BATCH_PROCESS_CONCURRENCY，
+# 避免并发超出浏览器池而频繁退回临时创建浏览器
+_batch_semaphores_by_loop: Dict[asyncio.AbstractEventLoop, asyncio.BoundedSemaphore] = {}
+_batch_semaphore_guard = threading.Lock()
+
+
+def _get_batch_semaphore() -> asyncio.BoundedSemaphore:
+    """返回当前事件循环共享的批量并发信号量（懒创建，线程安全）"""
+    loop = asyncio.get_running_loop()
+    with _batch_semaphore_guard:
+        for closed_loop in [l for l in _batch_semaphores_by_loop if l.is_closed()]:
+            _batch_semaphores_by_loop.pop(closed_loop, None)
+        sem = _batch_semaphores_by_loop.get(loop)
+        if sem is None:
+            sem = asyncio.BoundedSemaphore(BATCH_PROCESS_CONCURRENCY)
+            _batch_semaphores_by_loop[loop] = sem
+        return sem
+
+
 async def _crawl_batch_with_retry(
     urls: List[str],
     browser_pool,
@@ -252,7 +283,7 @@ async def _crawl_batch_with_retry(
     """带重试的批量爬取"""
     results: List[Optional[Dict]] = [None] * len(urls)
 
-    semaphore = asyncio.Semaphore(BATCH_PROCESS_CONCURRENCY)
+    semaphore = _get_batch_semaphore()
 
     async def process_with_semaphore(idx: int, url: str):
         async with semaphore:
@@ -383,6 +414,97 @@ class _DomainThrottleController:
         return
 
 
+def _interleave_order_by_host(urls: List[str]) -> List[int]:
+    """按域名 round-robin 排列 URL 下标，避免同域名 URL 扎堆占满一批的并发槽、空等该域名的信号量。"""
+    groups: Dict[str, deque] = {}
+    for idx, url in enumerate(urls):
+        groups.setdefault(_DomainThrottleController._domain(url), deque()).append(idx)
+    order: List[int] = []
+    queues = list(groups.values())
+    while queues:
+        for q in queues:
+            order.append(q.popleft())
+        queues = [q for q in queues if q]
+    return order
+
+
+def _normalize_allowed_urls(urls: List[str]) -> Dict[str, str]:
+    """返回 {原始 url: 规范化 url}，只保留格式有效且平台允许的 URL。"""
+    normalized_by_url: Dict[str, str] = {}
+    for url in urls:
+        is_valid, normalized_url, site = validate_and_normalize_url(url)
+        if is_valid and is_platform_allowed(site or ""):
+            normalized_by_url[url] = normalized_url
+    return normalized_by_url
+
+
+def lookup_recent_results(urls: List[str]) -> Dict[str, Dict]:
+    """查找库中已存在且最近爬取过的文章，返回 {原始 url: 成功结果}。
+
+    命中的 URL 直接复用库内的标题与最新阅读数（结果带 existing=True、cached=True），不再启动浏览器爬取。
+    """
+    if ARTICLE_ADD_CACHE_SECONDS <= 0 or not urls:
+        return {}
+
+    normalized_by_url = _normalize_allowed_urls(urls)
+    if not normalized_by_url:
+        return {}
+
+    try:
+        recent = get_recent_articles_by_urls(
+            list(dict.fromkeys(normalized_by_url.values())), ARTICLE_ADD_CACHE_SECONDS
+        )
+    except Exception:
+        logger.warning("查询最近爬取结果失败，全部重新爬取", exc_info=True)
+        return {}
+
+    results = _existing_article_results(normalized_by_url, recent)
+    for result in results.values():
+        result["cached"] = True
+    return results
+
+
+def _existing_article_results(normalized_by_url: Dict[str, str], articles: Dict[str, Dict]) -> Dict[str, Dict]:
+    """把库内文章转为成功结果 {原始 url: 结果}：existing=True，数据取库内标题与最新阅读数。"""
+    results: Dict[str, Dict] = {}
+    for url, normalized_url in normalized_by_url.items():
+        article = articles.get(normalized_url)
+        if not article:
+            continue
+        results[url] = {
+            "url": normalized_url,
+            "success": True,
+            "existing": True,
+            "data": {
+                "id": article["id"],
+                "title": article.get("title"),
+                "site": article.get("site"),
+                "read_count": article["latest_count"],
+                "initial_count": article["latest_count"],
+            },
+        }
+    return results
+
+
+def lookup_existing_results(urls: List[str]) -> Dict[str, Dict]:
+    """查找库中已存在的文章（不限爬取时间），返回 {原始 url: 成功结果}。
+
+    与 lookup_recent_results 同一约定：已跟踪的文章重复提交视为成功（existing=True），返回库内数据，
+    不再爬取也不写库；用一次索引查询替代「先启动浏览器爬取、写库时才发现重复」。
+    """
+    normalized_by_url = _normalize_allowed_urls(urls)
+    if not normalized_by_url:
+        return {}
+
+    try:
+        existing = get_existing_articles_by_urls(list(dict.fromkeys(normalized_by_url.values())))
+    except Exception:
+        logger.warning("查询已存在文章失败，全部按新文章处理", exc_info=True)
+        return {}
+
+    return _existing_article_results(normalized_by_url, existing)
+
+
 async def _process_urls_async(task_id: str, urls: List[str]):
     """异步处理URL列表（用于任务队列）"""
     task_manager = get_task_manager()
@@ -390,36 +512,43 @@ async def _process_urls_async(task_id: str, urls: List[str]):
     total = len(urls)
 
     browser_pool = get_browser_pool()
+    # 整个任务共享域名节流状态，避免分批后对同一平台并发突增
+    domain_controller = _DomainThrottleController()
 
+    # 成功/失败数随批次累加，不必每批重扫全部结果
+    success = 0
     batch_size = BATCH_PROCESS_SIZE
     for i in range(0, total, batch_size):
         batch_urls = urls[i : i + batch_size]
-        batch_results = await _process_batch(batch_urls, browser_pool)
+        batch_results = await _process_batch(
+            batch_urls, browser_pool, domain_controller=domain_controller
+        )
         results.extend(batch_results)
+        success += sum(1 for r in batch_results if r and r.get("success"))
 
         task_manager.update_task_progress(
             task_id,
             {
                 "processed": len(results),
                 "total": total,
-                "success": sum(1 for r in results if r and r.get("success")),
-                "failed": sum(1 for r in results if not (r and r.get("success"))),
+                "success": success,
+                "failed": len(results) - success,
             },
         )
 
-    task = task_manager.get_task(task_id)
-    if task:
-        task["results"] = results
+    task_manager.set_task_result(task_id, results)
 
 
 async def _process_urls_sync(urls: List[str]):
     """同步处理URL列表（用于小批量）"""
     browser_pool = get_browser_pool()
-    return await _process_batch(urls, browser_pool)
+    return await _process_batch(
+        urls, browser_pool, domain_controller=_DomainThrottleController()
+    )
 
 
 async def crawl_urls_for_results(
-    urls: List[str], on_result=None
+    urls: List[str], on_result=None, domain_controller: Optional[_DomainThrottleController] = None
 ) -> List[Optional[Dict]]:
     """仅爬取 URL 列表并返回结构化结果，不写入数据库。
 
@@ -429,6 +558,9 @@ async def crawl_urls_for_results(
     - 第一轮：每篇文章带重试机制爬取
     - 第二轮：集中重试第一轮失败的文章
 
+    同一域名的并发与间隔由 domain_controller 控制；多次调用传入同一实例即可共享域名限额
+    （未传入时本次调用独享一个）。CRAWL_INTERLEAVE_BY_SITE 开启时按域名交错爬取顺序。
+
     Returns:
         与 urls 顺序对应的列表，每项为:
         - 成功: {"url", "success": True, "data": {"title", "site", "read_count"}}
@@ -437,12 +569,16 @@ async def crawl_urls_for_results(
     browser_pool = get_browser_pool()
     batch_size = BATCH_PROCESS_SIZE
     all_results: List[Optional[Dict]] = []
-    domain_controller = _DomainThrottleController()
+    if domain_controller is None:
+        domain_controller = _DomainThrottleController()
     logger.info("开始爬取 %s 篇文章", len(urls))
 
+    order = _interleave_order_by_host(urls) if CRAWL_INTERLEAVE_BY_SITE else None
+    crawl_urls = [urls[i] for i in order] if order else urls
+
     # 第一轮：批量爬取（保留 crawl_single_url_for_result 作为单次爬取入口，便于测试/复用）
-    for i in range(0, len(urls), batch_size):
-        batch_urls = urls[i : i + batch_size]
+    for i in range(0, len(crawl_urls), batch_size):
+        batch_urls = crawl_urls[i : i + batch_size]
         batch_results = await _crawl_batch_for_results(
             batch_urls,
             browser_pool,
@@ -453,7 +589,7 @@ async def crawl_urls_for_results(
 
     # 第二轮：集中重试第一轮失败的文章
     all_results = await _merge_retry_passes(
-        urls=urls,
+        urls=crawl_urls,
         all_results=all_results,
         extra_passes=RESULT_RETRY_EXTRA_PASSES,
         batch_size=batch_size,
@@ -461,45 +597,164 @@ async def crawl_urls_for_results(
         domain_controller=domain_controller,
         on_result=on_result,
     )
+    if order:
+        # 还原为与 urls 对应的顺序
+        restored: List[Optional[Dict]] = [None] * len(urls)
+        for pos, idx in enumerate(order):
+            restored[idx] = all_results[pos]
+        all_results = restored
     success_count = sum(1 for r in all_results if r and r.get("success"))
     logger.info("爬取完成: %s/%s 成功", success_count, len(urls))
     return all_results
 
 
-async def crawl_single_url_for_result(
-    url: str,
-    browser_pool=None,
-    domain_controller: Optional[_DomainThrottleController] = None,
-) -> Dict:
-    """爬取单个 URL，返回统一结果结构，不写库。"""
-    raw_url = url
-    normalized_url = url
+class _SharedFallbackCrawler:
+    """一批 URL 共用的后备浏览器：池满时首次需要才创建，批次结束时关闭；多个 worker 可同时在其上开页面。
+
+    按租约计数：爬取出错的实例退役（不再分给新租约，下次 get() 新建），最后一个租约归还时才关闭，
+    不打断仍在其上爬取的其他 worker。
+    """
+
+    def __init__(self):
+        self._crawler = None
+        self._leases: Dict[object, int] = {}
+        self._lock = asyncio.Lock()
+
+    async def get(self):
+        async with self._lock:
+            if self._crawler is None:
+                self._crawler = await create_shared_crawler()
+            self._leases[self._crawler] = self._leases.get(self._crawler, 0) + 1
+            return self._crawler
+
+    async def release(self, crawler, failed: bool = False):
+        """归还一次租约；failed=True 表示该实例刚爬取出错，退役之。退役且无人使用的实例立即关闭。"""
+        async with self._lock:
+            remaining = self._leases.get(crawler, 0) - 1
+            if remaining > 0:
+                self._leases[crawler] = remaining
+            else:
+                self._leases.pop(crawler, None)
+            if failed and crawler is self._crawler:
+                self._crawler = None
+            if remaining > 0 or crawler is self._crawler:
+                return
+        try:
+            await crawler.__aexit__(None, None, None)
+        except Exception:
+            logger.warning("关闭退役的后备浏览器失败", exc_info=True)
+
+    async def close(self):
+        crawler, self._crawler = self._crawler, None
+        if crawler is not None:
+            await crawler.__aexit__(None, None, None)
+
+
+class _CrawlerLease:
+    """批量 worker 持有的浏览器实例：首次使用时获取，跨多个 URL 复用；爬取出错或超时后归还，下次重新获取。
+
+    池满时改用 fallback（整批共用的后备浏览器，由批次负责关闭）；未传 fallback 时自建独立实例。
+    """
+
+    def __init__(self, browser_pool, fallback: Optional[_SharedFallbackCrawler] = None):
+        self._browser_pool = browser_pool
+        self._fallback = fallback
+        self._crawler = None
+        self._from_pool = False
+
+    async def get(self):
+        if self._crawler is None:
+            crawler = await self._browser_pool.acquire()
+            if crawler:
+                self._from_pool = True
+            elif self._fallback is not None:
+                crawler = await self._fallback.get()
+                self._from_pool = False
+            else:
+                crawler = await create_shared_crawler()
+                self._from_pool = False
+            self._crawler = crawler
+        return self._crawler
+
+    async def close(self, failed: bool = False):
+        """归还持有的实例；failed=True 表示该实例刚爬取出错，共用的后备实例随之退役。"""
+        crawler, self._crawler = self._crawler, None
+        if crawler is None:
+            return
+        if self._from_pool:
+            await self._browser_pool.release(crawler)
+        elif self._fallback is None:
+            await crawler.__aexit__(None, None, None)
+        else:
+            await self._fallback.release(crawler, failed=failed)
+
+
+# 预检失败结果的公共字段：按模板展开，不必每个 URL 重建相同的键
+_INVALID_URL_RESULT = {
+    "success": False,
+    "error": "无效的URL格式（只支持 http/https）",
+    "error_code": "invalid_url",
+}
+_WEIXIN_NOT_SUPPORTED_RESULT = {
+    "success": False,
+    "error": "微信文章正在开发中",
+    "error_code": "weixin_not_supported",
+}
+
+
+@lru_cache(maxsize=64)
+def _platform_not_allowed_result(site: Optional[str]) -> Dict:
+    return {
+        "success": False,
+        "error": f'平台 "{site or "未知"}" 不在允许列表中，已跳过',
+        "error_code": "platform_not_allowed",
+    }
+
+
+def _precheck_url(url: str) -> Tuple[Optional[Dict], str, Optional[str]]:
+    """校验并规范化 URL，返回 (失败结果, 规范化 url, site)；可以爬取时失败结果为 None。"""
     try:
         is_valid, normalized_url, site = validate_and_normalize_url(url)
         if not is_valid:
-            return {
-                "url": raw_url,
-                "success": False,
-                "error": "无效的URL格式（只支持 http/https）",
-                "error_code": "invalid_url",
-            }
+            return {"url": url, **_INVALID_URL_RESULT}, normalized_url, site
 
         if not is_platform_allowed(site or ""):
-            return {
-                "url": raw_url,
-                "success": False,
-                "error": f'平台 "{site or "未知"}" 不在允许列表中，已跳过',
-                "error_code": "platform_not_allowed",
-            }
+            return {"url": url, **_platform_not_allowed_result(site)}, normalized_url, site
 
         # 微信文章暂不支持
         if site and ("weixin" in site or "qq.com" in site):
-            return {
-                "url": raw_url,
-                "success": False,
-                "error": "微信文章正在开发中",
-                "error_code": "weixin_not_supported",
-            }
+            return {"url": url, **_WEIXIN_NOT_SUPPORTED_RESULT}, normalized_url, site
+    except Exception as e:
+        return {
+            "url": url,
+            "success": False,
+            "error": str(e),
+            "error_code": "crawl_failed",
+        }, url, None
+    return None, normalized_url, site
+
+
+async def crawl_single_url_for_result(
+    url: str,
+    browser_pool=None,
+    domain_controller: Optional[_DomainThrottleController] = None,
+    crawler_lease: Optional[_CrawlerLease] = None,
+    prechecked: Optional[Tuple[str, Optional[str]]] = None,
+) -> Dict:
+    """爬取单个 URL，返回统一结果结构，不写库。
+
+    传入 crawler_lease 时复用其持有的浏览器实例，不再逐个 URL 获取/归还；
+    传入 prechecked=(规范化 url, site) 表示调用方已用 _precheck_url 校验过，跳过重复校验。
+    """
+    raw_url = url
+    normalized_url = url
+    try:
+        if prechecked is None:
+            error_result, normalized_url, site = _precheck_url(url)
+            if error_result is not None:
+                return error_result
+        else:
+            normalized_url, site = prechecked
 
         if browser_pool is None:
             browser_pool = get_browser_pool()
@@ -513,23 +768,32 @@ async def crawl_single_url_for_result(
                 await domain_controller.wait_turn(normalized_url)
 
             try:
-                crawler = await browser_pool.acquire()
-                if not crawler:
-                    crawler = await create_shared_crawler()
-                    use_pool = False
+                if crawler_lease is not None:
+                    crawler = await crawler_lease.get()
                 else:
-                    use_pool = True
+                    crawler = await browser_pool.acquire()
+                    if not crawler:
+                        crawler = await create_shared_crawler()
+                        use_pool = False
+                    else:
+                        use_pool = True
 
+                crawled_ok = False
                 try:
                     info = await extract_article_info(normalized_url, crawler)
                     title = info.get("title")
                     count = info.get("read_count")
+                    crawled_ok = True
                 except Exception as e:
                     logger.warning("爬取失败")
                     title = None
                     count = None
                 finally:
-                    if use_pool:
+                    if crawler_lease is not None:
+                        # 出错或被超时取消的实例状态不可信，归还后由下一个 URL 重新获取
+                        if not crawled_ok:
+                            await crawler_lease.close(failed=True)
+                    elif use_pool:
                         await browser_pool.release(crawler)
                     else:
                         await crawler.__aexit__(None, None, None)
@@ -595,37 +859,16 @@ async def _crawl_batch_for_results(
     domain_controller: Optional[_DomainThrottleController] = None,
     on_result=None,
 ) -> List[Optional[dict]]:
-    """爬取一批 URL，返回结果列表，不写库。"""
-    processed_results: List[Optional[dict]] = [None] * len(urls)
-
-    async def process_single_url(idx: int, url: str):
-        result = await crawl_single_url_for_result(
-            url,
-            browser_pool=browser_pool,
-            domain_controller=domain_controller,
-        )
-        return idx, result
+    """爬取一批 URL，返回结果列表，不写库。
 
-    semaphore = asyncio.Semaphore(BATCH_PROCESS_CONCURRENCY)
-
-    async def process_with_semaphore(idx: int, url: str):
-        async with semaphore:
-            try:
-                return await process_single_url(idx, url)
-            except Exception as e:
-                return idx, {
-                    "url": url,
-                    "success": False,
-                    "error": str(e),
-                    "error_code": "crawl_failed",
-                }
+    最多 BATCH_PROCESS_CONCURRENCY 个 worker 从队列取 URL，每个 worker 持有一个浏览器实例处理多个 URL，
+    避免逐个 URL 获取/归还；池满的 worker 共用整批唯一的后备浏览器。worker 在存活期间占用共享的批量并发名额。
+    """
+    processed_results: List[Optional[dict]] = [None] * len(urls)
+    if not urls:
+        return processed_results
 
-    tasks = [
-        asyncio.create_task(process_with_semaphore(i, url))
-        for i, url in enumerate(urls)
-    ]
-    for completed in asyncio.as_completed(tasks):
-        idx, payload = await completed
+    def record(idx: int, payload: dict):
         processed_results[idx] = payload
         if on_result is not None:
             try:
@@ -633,17 +876,95 @@ async def _crawl_batch_for_results(
             except Exception:
                 logger.warning("on_result callback failed", exc_info=True)
 
+    # 同步预检：无效 / 不允许的 URL 直接出结果，只有可爬取的 URL 进入队列
+    queue: asyncio.Queue = asyncio.Queue()
+    for idx, url in enumerate(urls):
+        error_result, normalized_url, site = _precheck_url(url)
+        if error_result is not None:
+            record(idx, error_result)
+        else:
+            queue.put_nowait((idx, url, (normalized_url, site)))
+
+    semaphore = _get_batch_semaphore()
+    fallback = _SharedFallbackCrawler()
+
+    async def worker():
+        async with semaphore:
+            lease = _CrawlerLease(browser_pool, fallback)
+            try:
+                while not queue.empty():
+                    idx, url, prechecked = queue.get_nowait()
+                    try:
+                        payload = await crawl_single_url_for_result(
+                            url,
+                            browser_pool=browser_pool,
+                            domain_controller=domain_controller,
+                            crawler_lease=lease,
+                            prechecked=prechecked,
+                        )
+                    except Exception as e:
+                        payload = {
+                            "url": url,
+                            "success": False,
+                            "error": str(e),
+                            "error_code": "crawl_failed",
+                        }
+                    record(idx, payload)
+            finally:
+                await lease.close()
+
+    workers = min(BATCH_PROCESS_CONCURRENCY, queue.qsize())
+    try:
+        await asyncio.gather(*(worker() for _ in range(workers)))
+    finally:
+        await fallback.close()
+
     return processed_results
 
 
-async def _process_batch(urls: List[str], browser_pool) -> List[Optional[dict]]:
-    """处理一批URL：先爬取，再写入 SQLite。"""
-    processed_results = await _crawl_batch_for_results(urls, browser_pool)
+def _add_read_counts_bisect(records: List[tuple]) -> int:
+    """批量写入阅读数；整批因坏记录（IntegrityError）失败时对半拆分重试，只跳过真正写不进去的单条记录。
+
+    返回成功写入的条数。少数坏记录不会让整批退化为逐行写入，也不会让已入库的文章丢失初始阅读数。
+    库被锁、磁盘 I/O 等整库错误与记录无关，拆分只会放大写入次数，直接向上抛出。
+    """
+    if not records:
+        return 0
+    try:
+        add_read_counts_batch(records)
+        return len(records)
+    except sqlite3.IntegrityError:
+        if len(records) == 1:
+            logger.warning("写入阅读数失败，跳过: %s", records[0], exc_info=True)
+            return 0
+    mid = len(records) // 2
+    return _add_read_counts_bisect(records[:mid]) + _add_read_counts_bisect(records[mid:])
+
+
+async def _process_batch(
+    urls: List[str],
+    browser_pool,
+    domain_controller: Optional[_DomainThrottleController] = None,
+) -> List[Optional[dict]]:
+    """处理一批URL：先爬取，再写入 SQLite。
+
+    总并发受 BATCH_PROCESS_CONCURRENCY 限制；传入 domain_controller 时另按域名限流。
+    库内已存在的 URL 直接返回库内结果（existing=True；最近爬取过的另带 cached=True），不爬取也不写库。
+    """
+    known = lookup_recent_results(urls)
+    known.update(lookup_existing_results([url for url in urls if url not in known]))
+    urls_to_crawl = [url for url in urls if url not in known]
+    crawled = iter(
+        await _crawl_batch_for_results(urls_to_crawl, browser_pool, domain_controller)
+        if urls_to_crawl
+        else ()
+    )
+    processed_results = [known[url] if url in known else next(crawled) for url in urls]
 
     articles_to_add = []
     read_counts_to_add = []
     for item in processed_results:
-        if item and item.get("success"):
+        if item and item.get("success") and not item.get("existing"):
             articles_to_add.append(
                 (item.get("url"), item["data"].get("title"), item["data"].get("site"))
             )
@@ -652,7 +973,17 @@ async def _process_batch(urls: List[str], browser_pool) -> List[Optional[dict]]:
     if not articles_to_add:
         return processed_results
 
-    article_ids = add_articles_batch(articles_to_add)
+    try:
+        # 文章与初始阅读数同一事务写入，整批只提交一次
+        article_ids = add_articles_with_read_counts(
+            [(*article, count_tuple[0]) for article, count_tuple in zip(articles_to_add, read_counts_to_add)]
+        )
+        counts_written = True
+    except Exception:
+        # 合并写入已整体回滚：退回分步写入，坏的阅读数记录由二分重试单独跳过
+        logger.warning("文章与阅读数合并写入失败，改为分步写入", exc_info=True)
+        article_ids = add_articles_batch(articles_to_add)
+        counts_written = False
 
     if len(article_ids) != len(articles_to_add):
         error_msg = f"批量插入失败: 返回 {len(article_ids)} 个ID, 期望 {len(articles_to_add)} 个"
@@ -672,17 +1003,18 @@ async def _process_batch(urls: List[str], browser_pool) -> List[Optional[dict]]:
         logger.error(error_msg)
         raise ValueError(error_msg)
 
-    read_count_records = []
-    for article_id, count_tuple in zip(article_ids, read_counts_to_add):
-        if article_id is not None and count_tuple:
-            read_count_records.append((article_id, count_tuple[0]))
+    if not counts_written:
+        read_count_records = []
+        for article_id, count_tuple in zip(article_ids, read_counts_to_add):
+            if article_id is not None and count_tuple:
+                read_count_records.append((article_id, count_tuple[0]))
 
-    if read_count_records:
-        add_read_counts_batch(read_count_records)
+        if read_count_records:
+            _add_read_counts_bisect(read_count_records)
 
     article_idx = 0
     for result in processed_results:
-        if result and result.get("success") and article_idx < len(article_ids):
+        if result and result.get("success") and not result.get("existing") and article_idx < len(article_ids):
             result["data"]["id"] = article_ids[article_idx]
             result["data"]["initial_count"] = result["data"].get("read_count", 0)
             article_idx += 1
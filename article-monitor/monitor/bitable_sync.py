@@ -3,14 +3,18 @@ Bitable 同步编排：从飞书多维表格读取发布链接 → 爬取 → 
 列名可配置，v1 仅写总阅读量与失败原因；24h/72h 预留可写空或占位。
 """
 import asyncio
+import atexit
 import logging
+import re
 import threading
 import time
 from collections import defaultdict, deque
 from typing import Any, Dict, List, Optional, Tuple
 
-from .article_service import crawl_urls_for_results
+from .article_service import _DomainThrottleController, crawl_urls_for_results
+from .browser_pool import get_browser_pool
 from .config import (
+    BITABLE_WRITE_BATCH_SIZE,
     FEISHU_APP_ID,
     FEISHU_APP_SECRET,
     FEISHU_BITABLE_APP_TOKEN,
@@ -21,14 +25,45 @@ from .config import (
     FEISHU_BITABLE_FIELD_READ_72H,
     FEISHU_BITABLE_FIELD_ERROR,
 )
+from .logging_context import current_log_context_or_none, with_log_context
 from .feishu_client import (
-    list_all_bitable_records,
+    iter_bitable_record_pages,
     batch_update_bitable_records,
     truncate_error_message,
 )
 
 logger = logging.getLogger(__name__)
 
+_url_match = re.compile(r"https?://").match
+
+# 常驻同步事件循环：浏览器池中的爬虫实例绑定在创建它的 loop 上，跨多次同步复用同一 loop 才能复用实例
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    """获取（必要时启动）常驻 Bitable 同步事件循环线程"""
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None or _sync_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="bitable-sync-loop", daemon=True).start()
+            _sync_loop = loop
+        return _sync_loop
+
+
+@atexit.register
+def _shutdown_sync_loop():
+    """进程退出时在所属 loop 上关闭浏览器实例并停止 loop"""
+    loop = _sync_loop
+    if loop is None or loop.is_closed() or not loop.is_running():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(get_browser_pool().close_all(), loop).result(timeout=10)
+    except Exception as e:
+        logger.debug(f"关闭浏览器池失败: {e}")
+    loop.call_soon_threadsafe(loop.stop)
+
 
 def _empty_sync_result(message: str, *, success: bool = False) -> Dict[str, Any]:
     return {
@@ -77,20 +112,14 @@ def _source_result_key_from_table_row(tr: Dict[str, Any]) -> Tuple[str, str]:
 
 
 def _extract_url_from_field(value: Any) -> Optional[str]:
-    """从 Bitable 字段原始值中提取 URL 字符串。"""
-    if value is None:
-        return None
+    """从 Bitable 字段原始值中提取 URL 字符串（列表字段取第一项）。"""
+    if isinstance(value, list):
+        value = value[0] if value else None
     if isinstance(value, str):
         s = value.strip()
-        return s if s.startswith(("http://", "https://")) else None
+        return s if _url_match(s) is not None else None
     if isinstance(value, dict):
         return value.get("link") or value.get("text") or value.get("url")
-    if isinstance(value, list) and value:
-        first = value[0]
-        if isinstance(first, str):
-            return first.strip() if first.strip().startswith(("http://", "https://")) else None
-        if isinstance(first, dict):
-            return first.get("link") or first.get("text") or first.get("url")
     return None
 
 
@@ -111,6 +140,120 @@ def _build_column_config(
     }
 
 
+class _TableWriteBack:
+    """单表回写缓冲：逐行登记爬取结果，攒满 BITABLE_WRITE_BATCH_SIZE 条即在后台线程提交一批写回。
+
+    各批写回依次串行执行，表很大、爬取很快时也不会同时占用多个线程、并发打满飞书接口。
+
+    表记录全部拉取成功前只缓冲不提交：拉取中途失败的表整体判为失败，不能留下部分写回。
+    """
+
+    def __init__(self, source: Dict[str, Any], cols: Dict[str, str]):
+        self.source = source
+        self.cols = cols
+        self.row_count = 0
+        self.updated = 0
+        self.failed = 0
+        self._errors: List[Tuple[int, Dict[str, str]]] = []
+        self._pending: List[Tuple[str, Dict[str, Any]]] = []
+        self._writes: List[asyncio.Future] = []
+        self._fetched = False
+        self._abandoned = False
+
+    def add_row(self) -> int:
+        """登记一行，返回行号（用于错误列表按表内顺序输出）。"""
+        self.row_count += 1
+        return self.row_count - 1
+
+    def add_result(self, row_index: int, record_id: str, url: str, crawl_result: Dict[str, Any]):
+        if self._abandoned:
+            return
+        cols = self.cols
+        fields_to_write: Dict[str, Any] = {}
+        if crawl_result.get("success"):
+            data = crawl_result.get("data") or {}
+            total = data.get("read_count")
+            if total is not None:
+                fields_to_write[cols["total_read"]] = total
+            fields_to_write[cols["error"]] = ""
+            self.updated += 1
+        else:
+            err_msg = crawl_result.get("error", "未知错误")
+            fields_to_write[cols["error"]] = truncate_error_message(err_msg)
+            self.failed += 1
+            self._errors.append((row_index, {
+                "record_id": record_id,
+                "url": crawl_result.get("url", url),
+                "error": err_msg,
+            }))
+        self._pending.append((record_id, fields_to_write))
+        if self._fetched and len(self._pending) >= BITABLE_WRITE_BATCH_SIZE:
+            self._flush()
+
+    def mark_fetched(self):
+        """全部记录页拉取成功：此后结果攒满一批即写回，拉取期间缓冲的结果立即按批提交。"""
+        self._fetched = True
+        if len(self._pending) >= BITABLE_WRITE_BATCH_SIZE:
+            self._flush()
+
+    def mark_abandoned(self):
+        """拉取失败：丢弃已缓冲的结果，之后到达的结果也不再登记或写回。"""
+        self._abandoned = True
+        self._pending = []
+
+    def _flush(self):
+        if not self._pending or self._abandoned:
+            return
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), BITABLE_WRITE_BATCH_SIZE):
+            previous = self._writes[-1] if self._writes else None
+            self._writes.append(asyncio.ensure_future(
+                self._write_after(previous, pending[start:start + BITABLE_WRITE_BATCH_SIZE])
+            ))
+
+    async def _write_after(self, previous: Optional[asyncio.Future], chunk: List[Tuple[str, Dict[str, Any]]]):
+        """等上一批写回结束（无论成败）再提交本批：同一张表同时只有一个写回线程在跑。"""
+        if previous is not None:
+            await asyncio.wait([previous])
+        await asyncio.to_thread(
+            batch_update_bitable_records,
+            self.source["app_token"],
+            self.source["table_id"],
+            chunk,
+        )
+
+    async def abandon(self):
+        """拉取失败的表：等待已发出的写回结束（拉取成功前不会发出写回）。"""
+        self.mark_abandoned()
+        await asyncio.gather(*self._writes, return_exceptions=True)
+
+    async def finish(self) -> Dict[str, Any]:
+        """提交剩余结果、等待全部写回完成，返回该表的同步结果。"""
+        source = self.source
+        self._flush()
+        table_item = BitableSyncService._build_table_result_item(
+            source["app_token"],
+            source["table_id"],
+            success=True,
+            processed=self.row_count,
+            updated=self.updated,
+            failed=self.failed,
+            errors=[err for _, err in sorted(self._errors, key=lambda e: e[0])],
+        )
+        if not self.row_count:
+            table_item["message"] = "未找到有效发布链接"
+            return table_item
+
+        write_outcomes = await asyncio.gather(*self._writes, return_exceptions=True)
+        for outcome in write_outcomes:
+            if isinstance(outcome, BaseException):
+                logger.error("Bitable 批量写回失败: table_id=%s", source["table_id"], exc_info=outcome)
+                table_item["success"] = False
+                table_item["message"] = f"Bitable 批量更新失败: {outcome}"
+                break
+        return table_item
+
+
 class BitableSyncService:
     """Bitable 同步服务：聚合单表、多表同步与结果汇总逻辑。"""
 
@@ -163,17 +306,27 @@ class BitableSyncService:
         max_concurrency: int = 3,
         progress_callback=None,
     ) -> Dict[str, Any]:
-        """集中提取多表 URL，统一爬取后按表回写，保证结果归属。"""
+        """逐页拉取 URL 并即时爬取，结果按表分批回写（拉取、爬取、写回相互重叠），保证结果归属。"""
         invalid_out = self._validate_sync_input(sources, max_concurrency)
         if invalid_out is not None:
             return invalid_out
 
-        table_jobs, table_results = self._collect_table_jobs_and_initial_results(sources)
-        url_result_map = self._crawl_dedup_urls(table_jobs, progress_callback=progress_callback)
+        slots, pending = self._normalize_sources(sources)
+        outcomes = self._fetch_and_crawl(
+            [normalized for _, normalized in pending],
+            progress_callback=progress_callback,
+        )
 
-        for job in table_jobs:
-            table_results.append(self._sync_single_job(job, url_result_map))
+        # 与历史行为一致：来源/拉取错误按来源顺序在前，各表同步结果随后
+        job_results: List[Dict[str, Any]] = []
+        for (index, _), (fetched_ok, table_item) in zip(pending, outcomes):
+            if fetched_ok:
+                job_results.append(table_item)
+            else:
+                slots[index] = table_item
 
+        table_results = [item for item in slots if item is not None]
+        table_results.extend(job_results)
         return self._build_overall_result(table_results)
 
     @staticmethod
@@ -191,12 +344,13 @@ class BitableSyncService:
             return out
         return None
 
-    def _collect_table_jobs_and_initial_results(
+    def _normalize_sources(
         self,
         sources: List[Dict[str, Any]],
-    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-        table_jobs: List[Dict[str, Any]] = []
-        table_results: List[Dict[str, Any]] = []
+    ) -> Tuple[List[Optional[Dict[str, Any]]], List[Tuple[int, Dict[str, Any]]]]:
+        """校验来源配置；返回 (按来源顺序的结果槽位, 待拉取的 (槽位下标, normalized_source))。"""
+        slots: List[Optional[Dict[str, Any]]] = []
+        pending: List[Tuple[int, Dict[str, Any]]] = []
 
         for raw_source in sources:
             normalized, source_error = _normalize_source_item(raw_source)
@@ -207,175 +361,193 @@ class BitableSyncService:
                 raw_app = (raw_source.get("app_token") or FEISHU_BITABLE_APP_TOKEN or "").strip()
 
             if source_error:
-                table_results.append(
+                slots.append(
                     self._build_table_result_item(raw_app, raw_tid, success=False, message=source_error)
                 )
                 continue
 
             if not normalized.get("app_token"):
-                table_results.append(
+                slots.append(
                     self._build_table_result_item("", normalized["table_id"], success=False, message="缺少 app_token")
                 )
                 continue
 
-            job_or_error = self._build_job_from_source(normalized)
-            if "message" in job_or_error:
-                table_results.append(job_or_error)
-            else:
-                table_jobs.append(job_or_error)
+            pending.append((len(slots), normalized))
+            slots.append(None)
 
-        return table_jobs, table_results
+        return slots, pending
 
-    def _build_job_from_source(self, normalized: Dict[str, Any]) -> Dict[str, Any]:
-        cols = _build_column_config(
-            field_url=normalized.get("field_url"),
-            field_total_read=normalized.get("field_total_read"),
-            field_read_24h=normalized.get("field_read_24h"),
-            field_read_72h=normalized.get("field_read_72h"),
-            field_error=normalized.get("field_error"),
-        )
+    async def _fetch_job_from_source(
+        self,
+        writer: "_TableWriteBack",
+        on_page_rows,
+    ) -> Optional[Dict[str, Any]]:
+        """逐页拉取表记录（阻塞的 SDK 调用放到线程中），每页解析出的行立即交给 on_page_rows；失败时返回错误结果。"""
+        source = writer.source
         try:
-            records = list_all_bitable_records(normalized["app_token"], normalized["table_id"])
+            url_field = writer.cols["url"]
+            # 同步只读取链接列：请求服务端字段投影，宽表的响应体与 JSON 解析量随之缩小
+            pages = iter(
+                iter_bitable_record_pages(source["app_token"], source["table_id"], field_names=[url_field])
+            )
+            while True:
+                page = await asyncio.to_thread(next, pages, None)
+                if page is None:
+                    writer.mark_fetched()
+                    return None
+                on_page_rows(writer, self._rows_from_records(page, url_field))
         except Exception as exc:
-            logger.exception("拉取 Bitable 记录失败: table_id=%s", normalized["table_id"])
+            # 立即作废该表的回写：已提交的爬取任务稍后送达的结果不会再写回这张失败的表
+            writer.mark_abandoned()
+            logger.exception("拉取 Bitable 记录失败: table_id=%s", source["table_id"])
             return self._build_table_result_item(
-                normalized["app_token"],
-                normalized["table_id"],
+                source["app_token"],
+                source["table_id"],
                 success=False,
                 message=str(exc),
             )
 
+    @staticmethod
+    def _rows_from_records(records: List[Dict[str, Any]], url_field: str) -> List[Tuple[str, str]]:
+        """从一页记录中提取 (record_id, url) 行，跳过无 record_id 或无有效链接的记录。"""
         rows: List[Tuple[str, str]] = []
+        # 大表逐行循环：提前绑定局部名，避免每行的全局/属性查找
+        extract_url = _extract_url_from_field
+        append_row = rows.append
         for rec in records:
             rid = rec.get("record_id") or rec.get("recordId")
             if not rid:
                 continue
-            raw = (rec.get("fields") or {}).get(cols["url"])
-            url = _extract_url_from_field(raw)
+            fields = rec.get("fields")
+            url = extract_url(fields.get(url_field)) if fields else None
             if url:
-                rows.append((rid, url))
+                append_row((rid, url))
+        return rows
 
-        return {"source": normalized, "cols": cols, "rows": rows}
-
-    @staticmethod
-    def _crawl_dedup_urls(table_jobs: List[Dict[str, Any]], progress_callback=None) -> Dict[str, Dict[str, Any]]:
-        dedup_urls: List[str] = []
-        seen_urls = set()
-        for job in table_jobs:
-            for _, url in job["rows"]:
-                if url not in seen_urls:
-                    seen_urls.add(url)
-                    dedup_urls.append(url)
-
-        url_result_map: Dict[str, Dict[str, Any]] = {}
-        total_urls = len(dedup_urls)
-        processed_urls = 0
-        if progress_callback is not None:
-            progress_callback({
-                "stage": "crawling",
-                "batch_url_progress": {"processed": 0, "total": total_urls},
-            })
-        if not dedup_urls:
-            return url_result_map
-
-        loop = asyncio.new_event_loop()
-        try:
-            def _on_crawl_result(payload: Dict[str, Any]):
-                nonlocal processed_urls
-                processed_urls += 1
-                if progress_callback is not None:
-                    progress_callback({
-                        "stage": "crawling",
-                        "batch_url_progress": {"processed": processed_urls, "total": total_urls},
-                        "last_url": payload.get("url"),
-                        "last_error": payload.get("error") if not payload.get("success") else None,
-                    })
-
-            try:
-                crawl_results = loop.run_until_complete(
-                    crawl_urls_for_results(dedup_urls, on_result=_on_crawl_result)
-                )
-            except TypeError:
-                crawl_results = loop.run_until_complete(crawl_urls_for_results(dedup_urls))
-        finally:
-            loop.close()
-
-        for url, result in zip(dedup_urls, crawl_results):
-            url_result_map[url] = result
-        return url_result_map
-
-    def _sync_single_job(
+    def _fetch_and_crawl(
         self,
-        job: Dict[str, Any],
-        url_result_map: Dict[str, Dict[str, Any]],
-    ) -> Dict[str, Any]:
-        source = job["source"]
-        cols = job["cols"]
-        rows = job["rows"]
-
-        records_to_update, updated, failed, errors_list = self._build_updates_for_rows(rows, cols, url_result_map)
-
-        table_item = self._build_table_result_item(
-            source["app_token"],
-            source["table_id"],
-            success=True,
-            processed=len(rows),
-            updated=updated,
-            failed=failed,
-            errors=errors_list,
+        normalized_sources: List[Dict[str, Any]],
+        progress_callback=None,
+    ) -> List[Tuple[bool, Dict[str, Any]]]:
+        """在常驻同步事件循环上运行拉取/爬取/回写流水线并阻塞等待，按来源顺序返回 (是否拉取成功, 表结果)。"""
+        pipeline = with_log_context(
+            self._fetch_and_crawl_async(normalized_sources, progress_callback),
+            current_log_context_or_none(),
         )
-        if not rows:
-            table_item["message"] = "未找到有效发布链接"
-            return table_item
+        return asyncio.run_coroutine_threadsafe(pipeline, _get_sync_loop()).result()
 
-        try:
-            if records_to_update:
-                batch_update_bitable_records(source["app_token"], source["table_id"], records_to_update)
-            return table_item
-        except Exception as exc:
-            logger.exception("Bitable 批量写回失败: table_id=%s", source["table_id"])
-            table_item["success"] = False
-            table_item["message"] = f"Bitable 批量更新失败: {exc}"
-            return table_item
+    async def _fetch_and_crawl_async(
+        self,
+        normalized_sources: List[Dict[str, Any]],
+        progress_callback=None,
+    ) -> List[Tuple[bool, Dict[str, Any]]]:
+        """
+        生产者-消费者流水线：按顺序逐页拉取各表记录（生产者），
+        每拉到一页即把未见过的 URL 交给爬取任务（消费者），后续页/表的拉取与已提交的爬取重叠进行。
+        每个爬取任务（一页新 URL）完成后，其结果分发给引用这些 URL 的各表行；
+        表记录拉取完成后，各表攒满一批即在后台线程写回，与剩余爬取并行。
+        多表共用的 URL 只爬一次；爬取并发仍由 article_service 的批处理信号量统一限制，
+        各页的爬取任务共用同一个域名节流器，同一站点的并发与间隔按整次同步计算。
+        """
+        url_result_map: Dict[str, Dict[str, Any]] = {}
+        # 尚未拿到爬取结果的 URL -> 等待该结果的 (writer, 行号, record_id)
+        waiting_rows: Dict[str, List[Tuple["_TableWriteBack", int, str]]] = defaultdict(list)
+        progress = {"processed": 0, "total": 0}
+        crawl_tasks: List[asyncio.Future] = []
+        domain_controller = _DomainThrottleController()
+
+        def _emit_progress(payload: Optional[Dict[str, Any]] = None):
+            if progress_callback is None:
+                return
+            event: Dict[str, Any] = {"stage": "crawling", "batch_url_progress": dict(progress)}
+            if payload is not None:
+                event["last_url"] = payload.get("url")
+                event["last_error"] = payload.get("error") if not payload.get("success") else None
+            progress_callback(event)
+
+        def _on_crawl_result(payload: Dict[str, Any]):
+            progress["processed"] += 1
+            _emit_progress(payload)
+
+        def _on_urls_crawled(results: Dict[str, Dict[str, Any]]):
+            url_result_map.update(results)
+            for url, result in results.items():
+                for writer, row_index, record_id in waiting_rows.pop(url, ()):
+                    writer.add_result(row_index, record_id, url, result)
+
+        def _dispatch_rows(writer: "_TableWriteBack", page_rows: List[Tuple[str, str]]):
+            new_urls: List[str] = []
+            for record_id, url in page_rows:
+                row_index = writer.add_row()
+                result = url_result_map.get(url)
+                if result is not None:
+                    writer.add_result(row_index, record_id, url, result)
+                    continue
+                # 保序去重：本页内重复与先前页/表已提交的 URL 只登记等待，不重复爬取
+                if url not in waiting_rows:
+                    new_urls.append(url)
+                waiting_rows[url].append((writer, row_index, record_id))
+            if not new_urls:
+                return
+            progress["total"] += len(new_urls)
+            _emit_progress()
+            crawl_tasks.append(asyncio.ensure_future(
+                self._crawl_urls_into(new_urls, _on_urls_crawled, _on_crawl_result, domain_controller)
+            ))
+
+        _emit_progress()
+        writers: List[_TableWriteBack] = []
+        abandoned: List[_TableWriteBack] = []
+        outcomes: List[Tuple[bool, Optional[Dict[str, Any]]]] = []
+        for normalized in normalized_sources:
+            cols = _build_column_config(
+                field_url=normalized.get("field_url"),
+                field_total_read=normalized.get("field_total_read"),
+                field_read_24h=normalized.get("field_read_24h"),
+                field_read_72h=normalized.get("field_read_72h"),
+                field_error=normalized.get("field_error"),
+            )
+            writer = _TableWriteBack(normalized, cols)
+            fetch_error = await self._fetch_job_from_source(writer, _dispatch_rows)
+            if fetch_error is not None:
+                abandoned.append(writer)
+                outcomes.append((False, fetch_error))
+            else:
+                writers.append(writer)
+                outcomes.append((True, None))
+
+        if crawl_tasks:
+            crawl_outcomes = await asyncio.gather(*crawl_tasks, return_exceptions=True)
+            for outcome in crawl_outcomes:
+                if isinstance(outcome, BaseException):
+                    raise outcome
+        # 爬取返回条数不足等情况：仍在等待的行按缺失结果处理
+        for url, waiters in waiting_rows.items():
+            missing = {"success": False, "url": url, "error": "未找到对应爬取结果"}
+            for writer, row_index, record_id in waiters:
+                writer.add_result(row_index, record_id, url, missing)
+        waiting_rows.clear()
+
+        await asyncio.gather(*(writer.abandon() for writer in abandoned))
+        table_items = iter(await asyncio.gather(*(writer.finish() for writer in writers)))
+        return [
+            (fetched_ok, next(table_items) if fetched_ok else fetch_error)
+            for fetched_ok, fetch_error in outcomes
+        ]
 
     @staticmethod
-    def _build_updates_for_rows(
-        rows: List[Tuple[str, str]],
-        cols: Dict[str, str],
-        url_result_map: Dict[str, Dict[str, Any]],
-    ) -> Tuple[List[Tuple[str, Dict[str, Any]]], int, int, List[Dict[str, str]]]:
-        updated = 0
-        failed = 0
-        errors_list: List[Dict[str, str]] = []
-        records_to_update: List[Tuple[str, Dict[str, Any]]] = []
-
-        for record_id, url in rows:
-            crawl_result = url_result_map.get(url) or {
-                "success": False,
-                "url": url,
-                "error": "未找到对应爬取结果",
-            }
-            fields_to_write: Dict[str, Any] = {}
-            if crawl_result.get("success"):
-                data = crawl_result.get("data") or {}
-                total = data.get("read_count")
-                if total is not None:
-                    fields_to_write[cols["total_read"]] = total
-                fields_to_write[cols["error"]] = ""
-                updated += 1
-            else:
-                err_msg = crawl_result.get("error", "未知错误")
-                fields_to_write[cols["error"]] = truncate_error_message(err_msg)
-                failed += 1
-                errors_list.append({
-                    "record_id": record_id,
-                    "url": crawl_result.get("url", url),
-                    "error": err_msg,
-                })
-            if fields_to_write:
-                records_to_update.append((record_id, fields_to_write))
-
-        return records_to_update, updated, failed, errors_list
+    async def _crawl_urls_into(
+        urls: List[str],
+        on_urls_crawled,
+        on_result,
+        domain_controller: _DomainThrottleController,
+    ) -> None:
+        try:
+            pending = crawl_urls_for_results(urls, on_result=on_result, domain_controller=domain_controller)
+        except TypeError:
+            pending = crawl_urls_for_results(urls)
+        crawl_results = await pending
+        on_urls_crawled(dict(zip(urls, crawl_results)))
 
     @staticmethod
     def _build_table_result_item(
@@ -1,15 +1,16 @@
 """
 浏览器实例池 - 复用浏览器实例，减少创建开销
 优化：管理浏览器实例生命周期，提升性能和稳定性
-池锁按事件循环懒创建，避免爬取在子线程的 loop 中运行时出现「bound to a different event loop」
+池状态由线程锁保护（临界区内不 await），多线程、多事件循环共用时同样安全；
+浏览器的创建与关闭都在锁外进行，并发获取者可同时冷启动各自的实例
 """
 
 import asyncio
 import threading
+import time
 import logging
 from typing import Optional, List, Dict
 from collections import deque
-from datetime import datetime, timedelta
 from crawl4ai import AsyncWebCrawler
 from .extractors import get_browser_config, ensure_browser_config
 from .config import (
@@ -22,20 +23,6 @@ from .config import (
 logger = logging.getLogger(__name__)
 
 
-def _get_pool_lock_for_loop(
-    pool_lock_guard: threading.Lock,
-    pool_lock_by_loop: Dict[asyncio.AbstractEventLoop, asyncio.Lock],
-) -> asyncio.Lock:
-    """返回当前事件循环对应的池锁（懒创建，线程安全）。仅可在 async 上下文中调用。"""
-    loop = asyncio.get_running_loop()
-    with pool_lock_guard:
-        for closed_loop in [loop for loop in pool_lock_by_loop if loop.is_closed()]:
-            pool_lock_by_loop.pop(closed_loop, None)
-        if loop not in pool_lock_by_loop:
-            pool_lock_by_loop[loop] = asyncio.Lock()
-        return pool_lock_by_loop[loop]
-
-
 class BrowserPool:
     """浏览器实例池（单例模式）"""
 
@@ -54,67 +41,107 @@ class BrowserPool:
         if self._initialized:
             return
         self._initialized = True
-        self._pool_lock_guard = threading.Lock()
-        self._pool_lock_by_loop: Dict[asyncio.AbstractEventLoop, asyncio.Lock] = {}
+        # 只保护 _pool / _in_use / _reserved / _crawler_loops 的读写，锁内不做任何 await
+        self._state_lock = threading.Lock()
+        # 空闲实例队列，元素为 (释放时的 monotonic 时间, 实例)，左侧最旧
         self._pool: deque = deque()
         self._in_use: set = set()
+        # 已占用容量但仍在锁外创建中的实例数
+        self._reserved = 0
+        # 实例与创建它的事件循环绑定，跨 loop 复用会触发「attached to a different loop」
+        self._crawler_loops: Dict[AsyncWebCrawler, asyncio.AbstractEventLoop] = {}
         self._max_size = BROWSER_POOL_MAX_SIZE  # 由 config 控制，低資源時 2
         self._min_size = max(
             1, min(BROWSER_POOL_MIN_SIZE, BROWSER_POOL_MAX_SIZE)
         )  # 最小池大小，不超過 max
         self._max_idle_time = 300  # 最大空闲时间（秒）
-        self._last_cleanup = datetime.now()
+        self._last_cleanup = time.monotonic()
         self._cleanup_interval = 60  # 清理间隔（秒）
 
-    def _get_pool_lock(self) -> asyncio.Lock:
-        """返回当前事件循环对应的池锁（仅可在 async 上下文中调用）。"""
-        return _get_pool_lock_for_loop(self._pool_lock_guard, self._pool_lock_by_loop)
-
     async def acquire(self) -> Optional[AsyncWebCrawler]:
-        """获取浏览器实例"""
-        pool_lock = self._get_pool_lock()
-        async with pool_lock:
-            # 清理空闲实例
-            await self._cleanup_idle()
-
-            # 从池中获取实例
-            while self._pool:
-                crawler = self._pool.popleft()
-                if crawler not in self._in_use:
-                    self._in_use.add(crawler)
-                    return crawler
+        """获取浏览器实例
 
-            # 如果池为空且未达到最大大小，创建新实例
-            if len(self._in_use) < self._max_size:
-                try:
-                    crawler = await self._create_crawler()
-                    self._in_use.add(crawler)
-                    logger.debug(f"创建新浏览器实例，当前使用: {len(self._in_use)}")
-                    return crawler
-                except Exception as e:
-                    logger.error(f"创建浏览器实例失败: {e}")
-                    return None
+        锁内只做取用/预留容量；新实例在锁外创建，多个获取者可并行冷启动，
+        预留计数保证使用中 + 创建中的实例总数不超过上限。
+        """
+        # 清理空闲实例
+        await self._cleanup_idle()
+
+        loop = asyncio.get_running_loop()
+        with self._state_lock:
+            # 从池中获取属于当前事件循环的实例
+            crawler = self._take_for_loop(loop)
+            if crawler is not None:
+                self._in_use.add(crawler)
+                return crawler
 
             # 达到最大大小，返回 None（调用者应等待或创建独立实例）
-            logger.debug(f"浏览器池已满，当前使用: {len(self._in_use)}")
-            return None
+            if len(self._in_use) + self._reserved >= self._max_size:
+                logger.debug(f"浏览器池已满，当前使用: {len(self._in_use)}")
+                return None
+            self._reserved += 1
+
+        # 池为空且未达到最大大小：在锁外创建新实例
+        crawler = None
+        try:
+            crawler = await self._create_crawler()
+        except Exception as e:
+            logger.error(f"创建浏览器实例失败: {e}")
+        finally:
+            with self._state_lock:
+                self._reserved -= 1
+                if crawler is not None:
+                    self._in_use.add(crawler)
+                    self._crawler_loops[crawler] = loop
+                in_use_count = len(self._in_use)
+        if crawler is not None:
+            logger.debug(f"创建新浏览器实例，当前使用: {in_use_count}")
+        return crawler
+
+    def _take_for_loop(
+        self, loop: asyncio.AbstractEventLoop
+    ) -> Optional[AsyncWebCrawler]:
+        """从池中取出绑定到 loop 的空闲实例（优先最近释放的，让久置的实例自然老化被清理）；
+        所属 loop 已关闭的实例直接丢弃（无法再清理）。"""
+        alive: deque = deque()
+        for entry in self._pool:
+            owner = self._crawler_loops.get(entry[1])
+            if owner is not None and owner.is_closed():
+                self._crawler_loops.pop(entry[1], None)
+                logger.debug("丢弃所属事件循环已关闭的浏览器实例")
+                continue
+            alive.append(entry)
+        self._pool = alive
+
+        for index in range(len(alive) - 1, -1, -1):
+            crawler = alive[index][1]
+            if crawler not in self._in_use and self._crawler_loops.get(crawler) in (None, loop):
+                del alive[index]
+                return crawler
+        return None
 
     async def release(self, crawler: AsyncWebCrawler):
         """释放浏览器实例回池"""
-        pool_lock = self._get_pool_lock()
-        async with pool_lock:
-            if crawler in self._in_use:
-                self._in_use.remove(crawler)
-                # 检查实例是否仍然有效
-                if await self._is_crawler_valid(crawler):
-                    self._pool.append(crawler)
-                    logger.debug(f"浏览器实例已释放回池，池大小: {len(self._pool)}")
-                else:
-                    logger.debug("浏览器实例无效，丢弃")
-                    try:
-                        await crawler.__aexit__(None, None, None)
-                    except Exception as cleanup_error:
-                        logger.debug(f"清理无效浏览器实例时出错: {cleanup_error}")
+        # 检查实例是否仍然有效
+        valid = await self._is_crawler_valid(crawler)
+        with self._state_lock:
+            if crawler not in self._in_use:
+                return
+            self._in_use.remove(crawler)
+            if valid:
+                self._pool.append((time.monotonic(), crawler))
+                pool_size = len(self._pool)
+            else:
+                self._crawler_loops.pop(crawler, None)
+
+        if valid:
+            logger.debug(f"浏览器实例已释放回池，池大小: {pool_size}")
+            return
+        logger.debug("浏览器实例无效，丢弃")
+        try:
+            await crawler.__aexit__(None, None, None)
+        except Exception as cleanup_error:
+            logger.debug(f"清理无效浏览器实例时出错: {cleanup_error}")
 
     async def _is_crawler_valid(self, crawler: AsyncWebCrawler) -> bool:
         """检查浏览器实例是否仍然有效"""
@@ -151,25 +178,35 @@ class BrowserPool:
         return crawler
 
     async def _cleanup_idle(self):
-        """清理空闲时间过长的实例（优化：真正使用空闲时间判断）"""
-        now = datetime.now()
-        if (now - self._last_cleanup).total_seconds() < self._cleanup_interval:
-            return
-
-        self._last_cleanup = now
+        """清理空闲时间超过 _max_idle_time 的实例（至少保留 _min_size 个）
 
-        # 清理池中空闲时间过长的实例
-        # 注意：由于我们没有跟踪每个实例的空闲时间，这里简化处理
-        # 如果池大小超过最小值，移除多余的（保持最小池大小）
+        只淘汰属于当前事件循环的实例：关闭须在实例所属的 loop 上进行，其他 loop 的实例留给它们自己的调用者清理。
+        """
+        now = time.monotonic()
+        loop = asyncio.get_running_loop()
         to_remove = []
-        pool_size = len(self._pool)
-
-        if pool_size > self._min_size:
-            # 移除多余的实例（从最旧的开始）
-            remove_count = pool_size - self._min_size
-            for _ in range(remove_count):
-                if self._pool:
-                    to_remove.append(self._pool.popleft())
+        with self._state_lock:
+            if now - self._last_cleanup < self._cleanup_interval:
+                return
+
+            self._last_cleanup = now
+
+            # 池按释放时间排列，从最旧的开始淘汰，关闭操作在锁外进行
+            kept: deque = deque()
+            remaining = len(self._pool)
+            for entry in self._pool:
+                released_at, crawler = entry
+                if (
+                    remaining > self._min_size
+                    and now - released_at > self._max_idle_time
+                    and self._crawler_loops.get(crawler) in (None, loop)
+                ):
+                    self._crawler_loops.pop(crawler, None)
+                    to_remove.append(crawler)
+                    remaining -= 1
+                else:
+                    kept.append(entry)
+            self._pool = kept
 
         for crawler in to_remove:
             try:
@@ -180,27 +217,55 @@ class BrowserPool:
         if to_remove:
             logger.debug(f"清理了 {len(to_remove)} 个空闲浏览器实例")
 
+    async def close_loop_crawlers(self):
+        """关闭绑定到当前事件循环的实例（空闲及使用中），其他 loop 的实例不受影响。
+
+        短生命周期的事件循环（如 asyncio.run 执行的整轮爬取）结束前调用：
+        loop 关闭后其实例无法再被关闭，只能丢弃引用，浏览器进程会残留。
+        """
+        loop = asyncio.get_running_loop()
+        with self._state_lock:
+            owned = {c for c, owner in self._crawler_loops.items() if owner is loop}
+            if not owned:
+                return
+            self._pool = deque(entry for entry in self._pool if entry[1] not in owned)
+            self._in_use -= owned
+            for crawler in owned:
+                del self._crawler_loops[crawler]
+
+        for crawler in owned:
+            try:
+                await crawler.__aexit__(None, None, None)
+            except Exception as e:
+                logger.debug(f"关闭浏览器实例时出错: {e}")
+        logger.info(f"已关闭当前事件循环的浏览器实例（{len(owned)} 个）")
+
     async def close_all(self):
-        """关闭所有浏览器实例"""
-        pool_lock = self._get_pool_lock()
-        async with pool_lock:
-            # 关闭池中的实例
-            while self._pool:
-                crawler = self._pool.popleft()
-                try:
-                    await crawler.__aexit__(None, None, None)
-                except Exception as e:
-                    logger.debug(f"关闭池中浏览器实例时出错: {e}")
-
-            # 关闭使用中的实例
-            for crawler in list(self._in_use):
-                try:
-                    await crawler.__aexit__(None, None, None)
-                except Exception as e:
-                    logger.debug(f"关闭使用中浏览器实例时出错: {e}")
-                self._in_use.remove(crawler)
-
-            logger.info("所有浏览器实例已关闭")
+        """关闭所有浏览器实例
+
+        只有绑定到当前事件循环的实例能被正常关闭；其余实例所属 loop 已不可用，直接丢弃引用。
+        """
+        current_loop = asyncio.get_running_loop()
+        with self._state_lock:
+            # 关闭池中及使用中的实例：锁内取快照并清空，关闭在锁外进行
+            to_close = [
+                crawler
+                for crawler in [c for _, c in self._pool] + list(self._in_use)
+                if self._crawler_loops.get(crawler) in (None, current_loop)
+            ]
+            self._pool.clear()
+            self._in_use.clear()
+            self._crawler_loops.clear()
+
+        closed = 0
+        for crawler in to_close:
+            try:
+                await crawler.__aexit__(None, None, None)
+                closed += 1
+            except Exception as e:
+                logger.debug(f"关闭浏览器实例时出错: {e}")
+        if closed:
+            logger.info(f"所有浏览器实例已关闭（{closed} 个）")
 
 
 # 全局浏览器池实例
@@ -83,6 +83,9 @@ CRAWL_RETRY_JITTER = os.getenv('CRAWL_RETRY_JITTER', 'True').lower() in ('true',
 # 在首轮之后，最多额外重试 N 轮（只重试可重试失败项）
 RESULT_RETRY_EXTRA_PASSES = max(0, int(os.getenv('RESULT_RETRY_EXTRA_PASSES', '1')))
 
+# 添加文章时复用库内最近爬取结果的时效（秒）：已存在且最新阅读数在此时间内的 URL 不再重新爬取；0 表示关闭
+ARTICLE_ADD_CACHE_SECONDS = max(0.0, float(os.getenv('ARTICLE_ADD_CACHE_SECONDS', '3600')))
+
 # 不同错误类型的重试配置
 CRAWL_RETRY_NETWORK_MAX = int(os.getenv('CRAWL_RETRY_NETWORK_MAX', '10'))  # 网络错误最大重试次数
 CRAWL_RETRY_PARSE_MAX = int(os.getenv('CRAWL_RETRY_PARSE_MAX', '3'))  # 解析错误最大重试次数
@@ -106,6 +109,12 @@ ANTI_SCRAPING_STEALTH_MODE = os.getenv('ANTI_SCRAPING_STEALTH_MODE', 'True').low
 ANTI_SCRAPING_MIN_DELAY = float(os.getenv('ANTI_SCRAPING_MIN_DELAY', '1.0'))
 ANTI_SCRAPING_MAX_DELAY = float(os.getenv('ANTI_SCRAPING_MAX_DELAY', '5.0'))
 
+# 同时处于延迟/请求中的任务上限（防止 gather 下所有任务同时唤醒打到目标站点）
+ANTI_SCRAPING_MAX_CONCURRENCY = int(os.getenv('ANTI_SCRAPING_MAX_CONCURRENCY', '8'))
+
+# 统一指纹模式：固定使用同一个标准浏览器配置，不再随机轮换
+ANTI_SCRAPING_HOMOGENEOUS = os.getenv('ANTI_SCRAPING_HOMOGENEOUS', 'False').lower() in ('true', '1', 'yes')
+
 # User-Agent 轮换间隔（每隔多少个请求更换）
 ANTI_SCRAPING_UA_ROTATION_MIN = int(os.getenv('ANTI_SCRAPING_UA_ROTATION_MIN', '10'))
 ANTI_SCRAPING_UA_ROTATION_MAX = int(os.getenv('ANTI_SCRAPING_UA_ROTATION_MAX', '30'))
@@ -123,6 +132,8 @@ TOR_BLOCKED_RETRY_MAX = max(0, int(os.getenv('TOR_BLOCKED_RETRY_MAX', '1')))
 FLASK_HOST = os.getenv('FLASK_HOST', '127.0.0.1')
 FLASK_PORT = int(os.getenv('FLASK_PORT', '5001'))
 FLASK_DEBUG = os.getenv('FLASK_DEBUG', 'False').lower() in ('true', '1', 'yes')
+# 允许跨域访问 /api/* 的来源（逗号分隔，默认 *）；非 API 路由不做 CORS 处理
+CORS_ORIGINS = [o.strip() for o in os.getenv('CORS_ORIGINS', '*').split(',') if o.strip()] or ['*']
 
 # 支持的网站
 SUPPORTED_SITES = {
@@ -162,7 +173,7 @@ def is_platform_allowed(site: str) -> bool:
         return True
     return site in ALLOWED_PLATFORMS if site else False
 
-from .platform_rules import PLATFORM_EXTRACTORS
+from .platform_rules import PLATFORM_EXTRACTORS, get_compiled_patterns
 
 # ==================== 應用常量 ====================
 # CSV 導出相關
@@ -175,12 +186,17 @@ MAX_CONCURRENT_TASKS = int(os.getenv('MAX_CONCURRENT_TASKS', str(_MAX_CONCURRENT
 
 # 批量處理相關
 BATCH_PROCESS_SIZE = 10  # 批量處理 URL 的批次大小
-BATCH_PROCESS_CONCURRENCY = 5  # 批量處理的並發數
+# 批量處理的並發數（同一事件循環上所有批次共用此上限）
+BATCH_PROCESS_CONCURRENCY = max(1, int(os.getenv('BATCH_PROCESS_CONCURRENCY', '5')))
 
 # 健康檢查相關
 HEALTH_CHECK_TIMEOUT = 3  # 健康檢查超時時間（秒）
 _MAX_HEALTH_CHECK_WORKERS_DEFAULT = 4 if _RESOURCE_PROFILE else 20
 MAX_HEALTH_CHECK_WORKERS = int(os.getenv('MAX_HEALTH_CHECK_WORKERS', str(_MAX_HEALTH_CHECK_WORKERS_DEFAULT)))
+# 網路連通性檢查結果的快取秒數（過期後於背景刷新，請求直接返回上次結果；0 = 不快取）
+HEALTH_NETWORK_CACHE_SECONDS = max(0.0, float(os.getenv('HEALTH_NETWORK_CACHE_SECONDS', '10')))
+# GET /api/articles 列表的進程內快取秒數（面板輪詢時最多每個週期查一次庫；本進程寫入類請求後立即失效；0 = 不快取）
+ARTICLES_LIST_CACHE_SECONDS = max(0.0, float(os.getenv('ARTICLES_LIST_CACHE_SECONDS', '5')))
 
 # 瀏覽器池（低資源時 max=2, min=1，與 CRAWL_CONCURRENCY=2 搭配）
 _BROWSER_POOL_MAX_DEFAULT = 2 if _RESOURCE_PROFILE else 5
@@ -191,6 +207,9 @@ BROWSER_POOL_MIN_SIZE = int(os.getenv('BROWSER_POOL_MIN_SIZE', str(_BROWSER_POOL
 # SQLite 每連接 cache 大小（KB）。低資源時 2MB，否則 64MB。PRAGMA cache_size 使用負值表示頁數（約 1 頁=1KB）
 _SQLITE_CACHE_KB_DEFAULT = 2048 if _RESOURCE_PROFILE else 65536
 SQLITE_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', str(_SQLITE_CACHE_KB_DEFAULT)))
+# SQLite 每連接 mmap 大小（MB），讀取直接走頁快取映射、免去 read() 拷貝；0 = 關閉。低資源時預設關閉
+_SQLITE_MMAP_MB_DEFAULT = 0 if _RESOURCE_PROFILE else 256
+SQLITE_MMAP_SIZE_MB = max(0, int(os.getenv('SQLITE_MMAP_SIZE_MB', str(_SQLITE_MMAP_MB_DEFAULT))))
 
 # ==================== 飞书 Bitable 配置 ====================
 FEISHU_APP_ID = os.getenv('FEISHU_APP_ID', '').strip()
@@ -216,3 +235,6 @@ def _parse_error_message_max_len() -> int:
 
 
 FEISHU_BITABLE_ERROR_MESSAGE_MAX_LEN = _parse_error_message_max_len()
+
+# 同步时每攒满多少条结果就提交一批写回（与爬取并行）；飞书 batch_update 单次上限 500
+BITABLE_WRITE_BATCH_SIZE = min(500, max(1, int(os.getenv('BITABLE_WRITE_BATCH_SIZE', '500'))))
@@ -22,6 +22,7 @@ from .database import (
     update_article_status,
 )
 from .extractors import extract_article_info, create_shared_crawler
+from .browser_pool import get_browser_pool
 from urllib.parse import urlparse
 from .config import (
     SUPPORTED_SITES,
@@ -501,10 +502,11 @@ async def _crawl_with_retry(
                     return False
 
                 # 检查是否需要更新（避免重复相同数据）
-                # 优先使用预加载的最新阅读数，避免数据库查询
-                latest_count = article.get("_latest_count")
-                if latest_count is None:
-                    # 如果预加载失败，回退到数据库查询
+                # 优先使用预加载的最新阅读数（None 表示已预加载但尚无记录），避免数据库查询
+                if "_latest_count" in article:
+                    latest_count = article["_latest_count"]
+                else:
+                    # 未经批量预加载的调用方，回退到数据库查询
                     latest = get_latest_read_count(article_id)
                     latest_count = latest["count"] if latest else None
 
@@ -516,6 +518,7 @@ async def _crawl_with_retry(
 
                 # 保存阅读数
                 add_read_count(article_id, count)
+                article["_latest_count"] = count
 
                 # 更新状态为成功
                 update_article_status(article_id, "OK")
@@ -783,8 +786,6 @@ async def crawl_all_articles():
             logger.info("开始集中重试")
 
             # 使用浏览器池进行集中重试
-            from .browser_pool import get_browser_pool
-
             browser_pool = get_browser_pool()
 
             # 批量重试（使用浏览器池）
@@ -882,6 +883,15 @@ async def crawl_all_articles():
         reset_log_context(context_token)
 
 
+async def _crawl_all_and_close_browsers():
+    """整轮爬取，结束后关闭本轮事件循环放回池中的浏览器实例。"""
+    try:
+        await crawl_all_articles()
+    finally:
+        # asyncio.run 返回后 loop 即关闭，池中属于它的实例再也无法关闭，须在 loop 结束前关闭
+        await get_browser_pool().close_loop_crawlers()
+
+
 def crawl_all_sync():
     """同步包装器；若已有爬取在運行則跳過（防定時任務疊加）"""
     progress = get_crawl_progress()
@@ -889,7 +899,7 @@ def crawl_all_sync():
         logger.info("爬取已在進行中，跳過本次定時觸發")
         return
     try:
-        asyncio.run(crawl_all_articles())
+        asyncio.run(_crawl_all_and_close_browsers())
     except Exception as e:
         with _crawl_progress_lock:
             _crawl_progress["is_running"] = False
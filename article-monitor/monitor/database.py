@@ -3,7 +3,7 @@
 """
 from typing import List, Dict, Optional
 
-from .db.connection import get_db, init_db
+from .db.connection import get_db, init_db, get_data_generation, mark_data_changed
 from .db.article_repo import (
     update_article_status,
     get_platform_failures,
@@ -13,6 +13,10 @@ from .db.article_repo import (
     get_all_articles,
     get_all_articles_with_latest_count,
     add_articles_batch,
+    add_articles_with_read_counts,
+    get_articles_by_ids,
+    get_recent_articles_by_urls,
+    get_existing_articles_by_urls,
     get_article_by_id,
     delete_article,
     update_article_title,
@@ -22,6 +26,8 @@ from .db.read_count_repo import (
     add_read_count,
     add_read_counts_batch,
     get_read_counts,
+    get_read_counts_bulk,
+    iter_all_article_history,
     get_latest_read_count,
     get_latest_read_counts_batch,
     delete_read_count_by_timestamp,
@@ -29,7 +35,7 @@ from .db.read_count_repo import (
     get_all_read_counts_summary,
     clear_cache,
 )
-from .db.settings_repo import get_setting, set_setting
+from .db.settings_repo import get_setting, get_cached_setting, set_setting
 from .db.read_count_repo import get_platform_health
 
 
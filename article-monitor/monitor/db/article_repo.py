@@ -1,6 +1,14 @@
+import sqlite3
 from typing import List, Dict, Optional
 
-from .connection import get_db
+from .connection import get_db, mark_data_changed
+
+
+# 多行 INSERT 每条语句的行数（每行 3 个参数，远低于 SQLITE_MAX_VARIABLE_NUMBER）
+ARTICLE_INSERT_CHUNK_SIZE = 500
+
+# INSERT ... RETURNING 需要 SQLite 3.35+；更旧的版本退回逐行插入
+_SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
 
 
 def update_article_status(article_id: int, status: str, error: Optional[str] = None) -> None:
@@ -16,6 +24,7 @@ def update_article_status(article_id: int, status: str, error: Optional[str] = N
     )
     conn.commit()
     conn.close()
+    mark_data_changed()
 
 
 def get_platform_failures() -> List[Dict]:
@@ -125,6 +134,7 @@ def add_article(url: str, title: Optional[str] = None, site: Optional[str] = Non
         )
         article_id = cursor.lastrowid
         conn.commit()
+        mark_data_changed()
         return article_id
     except Exception:
         cursor.execute('SELECT id FROM articles WHERE url = ?', (url,))
@@ -176,28 +186,63 @@ def get_all_articles_with_latest_count() -> List[Dict]:
     return articles
 
 
+def _insert_articles_rowwise(cursor: sqlite3.Cursor, articles: List[tuple]) -> List[Optional[int]]:
+    article_ids: List[Optional[int]] = []
+    for url, title, site in articles:
+        try:
+            cursor.execute(
+                'INSERT INTO articles (url, title, site) VALUES (?, ?, ?)',
+                (url, title, site),
+            )
+            article_ids.append(cursor.lastrowid)
+        except Exception:
+            cursor.execute('SELECT id FROM articles WHERE url = ?', (url,))
+            row = cursor.fetchone()
+            article_ids.append(row['id'] if row else None)
+    return article_ids
+
+
+def _insert_articles(cursor: sqlite3.Cursor, articles: List[tuple]) -> List[Optional[int]]:
+    """在调用方的事务内写入 (url, title, site)，返回与输入一一对应的 id；URL 已存在时取已有 id。
+
+    每 ARTICLE_INSERT_CHUNK_SIZE 行一条多行 INSERT ... RETURNING，已存在的 URL 再用一次 IN 查询补齐。
+    """
+    if not _SQLITE_HAS_RETURNING:
+        return _insert_articles_rowwise(cursor, articles)
+
+    # RETURNING 的行序不保证与 VALUES 一致，按 url 对回
+    ids_by_url: Dict[str, int] = {}
+    for start in range(0, len(articles), ARTICLE_INSERT_CHUNK_SIZE):
+        chunk = articles[start:start + ARTICLE_INSERT_CHUNK_SIZE]
+        values = ','.join(['(?, ?, ?)'] * len(chunk))
+        cursor.execute(
+            f'INSERT INTO articles (url, title, site) VALUES {values} '
+            'ON CONFLICT(url) DO NOTHING RETURNING id, url',
+            [value for article in chunk for value in article],
+        )
+        ids_by_url.update((row['url'], row['id']) for row in cursor.fetchall())
+
+    existing = list(dict.fromkeys(url for url, _, _ in articles if url not in ids_by_url))
+    for start in range(0, len(existing), ARTICLE_INSERT_CHUNK_SIZE):
+        chunk = existing[start:start + ARTICLE_INSERT_CHUNK_SIZE]
+        placeholders = ','.join(['?'] * len(chunk))
+        cursor.execute(f'SELECT id, url FROM articles WHERE url IN ({placeholders})', chunk)
+        ids_by_url.update((row['url'], row['id']) for row in cursor.fetchall())
+
+    return [ids_by_url.get(url) for url, _, _ in articles]
+
+
 def add_articles_batch(articles: List[tuple]) -> List[int]:
     if not articles:
         return []
 
     conn = get_db()
     cursor = conn.cursor()
-    article_ids: List[int] = []
 
     try:
-        for url, title, site in articles:
-            try:
-                cursor.execute(
-                    'INSERT INTO articles (url, title, site) VALUES (?, ?, ?)',
-                    (url, title, site),
-                )
-                article_ids.append(cursor.lastrowid)
-            except Exception:
-                cursor.execute('SELECT id FROM articles WHERE url = ?', (url,))
-                row = cursor.fetchone()
-                article_ids.append(row['id'] if row else None)
-
+        article_ids = _insert_articles(cursor, articles)
         conn.commit()
+        mark_data_changed()
     except Exception as e:
         conn.rollback()
         from .. import database as legacy_db  # noqa: F401  保留日誌行為
@@ -208,6 +253,131 @@ def add_articles_batch(articles: List[tuple]) -> List[int]:
     return article_ids
 
 
+def add_articles_with_read_counts(rows: List[tuple]) -> List[int]:
+    """在同一事务中写入文章及其初始阅读数，只提交一次。
+
+    rows 为 (url, title, site, count)；URL 已存在时沿用已有文章 id（与 add_articles_batch 一致），
+    阅读数同样写入。返回与 rows 一一对应的文章 id；任一步失败则整体回滚并抛出异常。
+    """
+    if not rows:
+        return []
+
+    conn = get_db()
+    cursor = conn.cursor()
+
+    try:
+        article_ids = _insert_articles(cursor, [row[:3] for row in rows])
+        cursor.executemany(
+            "INSERT INTO read_counts (article_id, count, timestamp) VALUES (?, ?, datetime('now', 'localtime'))",
+            [
+                (article_id, row[3])
+                for article_id, row in zip(article_ids, rows)
+                if article_id is not None
+            ],
+        )
+        conn.commit()
+        mark_data_changed()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    return article_ids
+
+
+def get_articles_by_ids(article_ids: List[int]) -> Dict[int, Dict]:
+    """一次查询取回多篇文章，返回 {id: article}；不存在的 id 不会出现在结果中。"""
+    if not article_ids:
+        return {}
+
+    conn = get_db()
+    cursor = conn.cursor()
+    placeholders = ','.join(['?'] * len(article_ids))
+    cursor.execute(f'SELECT * FROM articles WHERE id IN ({placeholders})', list(article_ids))
+    rows = cursor.fetchall()
+    conn.close()
+    return {row['id']: dict(row) for row in rows}
+
+
+def get_recent_articles_by_urls(urls: List[str], max_age_seconds: float) -> Dict[str, Dict]:
+    """按 URL 取回最新阅读数在 max_age_seconds 内的文章，返回 {url: article}。
+
+    每项包含 articles 表字段以及 latest_count / latest_timestamp；没有阅读数记录、记录已过期、
+    最近一次爬取失败（ERROR）或仅有爬取失败时写入的占位记录（无标题且阅读数为 0）的不返回。
+    """
+    if not urls or max_age_seconds <= 0:
+        return {}
+
+    conn = get_db()
+    cursor = conn.cursor()
+    placeholders = ','.join(['?'] * len(urls))
+    cursor.execute(
+        f'''
+        SELECT 
+            a.*,
+            rc.count as latest_count,
+            rc.timestamp as latest_timestamp
+        FROM articles a
+        JOIN (
+            SELECT 
+                article_id,
+                count,
+                timestamp,
+                ROW_NUMBER() OVER (PARTITION BY article_id ORDER BY timestamp DESC, id DESC) as rn
+            FROM read_counts
+            WHERE article_id IN (SELECT id FROM articles WHERE url IN ({placeholders}))
+        ) rc ON a.id = rc.article_id AND rc.rn = 1
+        WHERE rc.timestamp >= datetime('now', 'localtime', ?)
+          AND COALESCE(a.last_status, '') != 'ERROR'
+          AND NOT (rc.count = 0 AND a.title IS NULL)
+        ''',
+        [*urls, f'-{int(max_age_seconds)} seconds'],
+    )
+    rows = cursor.fetchall()
+    conn.close()
+    return {row['url']: dict(row) for row in rows}
+
+
+def get_existing_articles_by_urls(urls: List[str]) -> Dict[str, Dict]:
+    """按 URL 取回已在 articles 表内的文章（不限爬取时间，走 url 唯一索引），返回 {url: article}。
+
+    每项包含 articles 表字段以及 latest_count / latest_timestamp（尚无阅读数记录时为 None）；
+    最近一次爬取失败（ERROR）或仅为爬取失败时写入的无标题占位记录不算在内，允许用户重新添加以重试。
+    """
+    if not urls:
+        return {}
+
+    conn = get_db()
+    cursor = conn.cursor()
+    placeholders = ','.join(['?'] * len(urls))
+    cursor.execute(
+        f'''
+        SELECT 
+            a.*,
+            rc.count as latest_count,
+            rc.timestamp as latest_timestamp
+        FROM articles a
+        LEFT JOIN (
+            SELECT 
+                article_id,
+                count,
+                timestamp,
+                ROW_NUMBER() OVER (PARTITION BY article_id ORDER BY timestamp DESC, id DESC) as rn
+            FROM read_counts
+            WHERE article_id IN (SELECT id FROM articles WHERE url IN ({placeholders}))
+        ) rc ON a.id = rc.article_id AND rc.rn = 1
+        WHERE a.url IN ({placeholders})
+          AND COALESCE(a.last_status, '') != 'ERROR'
+          AND a.title IS NOT NULL
+        ''',
+        [*urls, *urls],
+    )
+    rows = cursor.fetchall()
+    conn.close()
+    return {row['url']: dict(row) for row in rows}
+
+
 def get_article_by_id(article_id: int) -> Optional[Dict]:
     conn = get_db()
     cursor = conn.cursor()
@@ -224,6 +394,7 @@ def delete_article(article_id: int) -> None:
     cursor.execute('DELETE FROM articles WHERE id = ?', (article_id,))
     conn.commit()
     conn.close()
+    mark_data_changed()
 
 
 def update_article_title(article_id: int, title: str) -> bool:
@@ -239,6 +410,8 @@ def update_article_title(article_id: int, title: str) -> bool:
     updated = cursor.rowcount > 0
     conn.commit()
     conn.close()
+    if updated:
+        mark_data_changed()
     return updated
 
 
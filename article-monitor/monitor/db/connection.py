@@ -1,8 +1,9 @@
 import os
 import sqlite3
 import logging
+import threading
 
-from ..config import DATABASE_PATH, SQLITE_CACHE_SIZE_KB
+from ..config import DATABASE_PATH, SQLITE_CACHE_SIZE_KB, SQLITE_MMAP_SIZE_MB
 
 
 logger = logging.getLogger(__name__)
@@ -11,21 +12,46 @@ logger = logging.getLogger(__name__)
 os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
 
 
-def _apply_db_optimizations(conn: sqlite3.Connection) -> None:
-    """应用数据库性能优化设置（每次新连接都需要设置）"""
-    conn.execute('PRAGMA journal_mode=WAL')
+# 已切换为 WAL 的数据库文件；journal_mode 持久保存在文件中，每个进程每个文件只需设置一次
+_wal_enabled_paths = set()
+
+
+def _apply_db_optimizations(conn: sqlite3.Connection, path: str) -> None:
+    """应用数据库性能优化设置（除 WAL 外均为连接级，每次新连接都需要设置）"""
+    if path not in _wal_enabled_paths:
+        conn.execute('PRAGMA journal_mode=WAL')
+        _wal_enabled_paths.add(path)
     conn.execute('PRAGMA synchronous=NORMAL')
     # 負值表示頁數（約 1 頁=1KB），由 config 控制；低資源時 2MB 減少記憶體
     conn.execute(f'PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}')
+    if SQLITE_MMAP_SIZE_MB:
+        conn.execute(f'PRAGMA mmap_size={SQLITE_MMAP_SIZE_MB * 1024 * 1024}')
     conn.execute('PRAGMA temp_store=MEMORY')
     conn.execute('PRAGMA foreign_keys=ON')
 
 
+# 本进程数据变更代数：文章 / 阅读数的写入提交后递增，读取方据此判断快取是否过期
+_data_generation = 0
+_data_generation_lock = threading.Lock()
+
+
+def mark_data_changed() -> None:
+    """文章或阅读数的写入已提交：递增数据代数，使基于旧代数的快取失效。"""
+    global _data_generation
+    with _data_generation_lock:
+        _data_generation += 1
+
+
+def get_data_generation() -> int:
+    """当前数据代数；与快取时记录的代数不同即表示期间有写入。"""
+    return _data_generation
+
+
 def get_db() -> sqlite3.Connection:
     """获取数据库连接（启用 WAL 模式提升并发性能）"""
     conn = sqlite3.connect(DATABASE_PATH, timeout=30.0)
     conn.row_factory = sqlite3.Row
-    _apply_db_optimizations(conn)
+    _apply_db_optimizations(conn, DATABASE_PATH)
     return conn
 
 
@@ -1,6 +1,7 @@
-from typing import List, Dict, Optional
+import sqlite3
+from typing import Iterator, List, Dict, Optional
 
-from .connection import get_db
+from .connection import get_db, mark_data_changed
 
 
 def add_read_count(article_id: int, count: int) -> None:
@@ -12,6 +13,7 @@ def add_read_count(article_id: int, count: int) -> None:
     )
     conn.commit()
     conn.close()
+    mark_data_changed()
 
 
 def add_read_counts_batch(records: List[tuple]) -> None:
@@ -26,6 +28,7 @@ def add_read_counts_batch(records: List[tuple]) -> None:
             records,
         )
         conn.commit()
+        mark_data_changed()
     except Exception:
         conn.rollback()
         raise
@@ -77,6 +80,117 @@ def get_read_counts(
     return [dict(row) for row in rows]
 
 
+def get_read_counts_bulk(
+    article_ids: List[int],
+    start_date: str = None,
+    end_date: str = None,
+    limit_per_article: int = 100,
+) -> Dict[int, List[Dict]]:
+    """一次查询取回多篇文章的阅读数历史，返回 {article_id: [record, ...]}。
+
+    每篇文章的记录顺序与条数限制和 get_read_counts 一致（timestamp DESC, id DESC）。
+    """
+    if not article_ids:
+        return {}
+
+    conn = get_db()
+    cursor = conn.cursor()
+    placeholders = ','.join(['?'] * len(article_ids))
+    where_clause = f'article_id IN ({placeholders})'
+    params = list(article_ids)
+
+    if start_date:
+        where_clause += ' AND DATE(timestamp) >= ?'
+        params.append(start_date)
+
+    if end_date:
+        where_clause += ' AND DATE(timestamp) <= ?'
+        params.append(end_date)
+
+    params.append(limit_per_article)
+    cursor.execute(
+        f'''
+        SELECT id, article_id, count, timestamp
+        FROM (
+            SELECT 
+                id,
+                article_id,
+                count,
+                timestamp,
+                ROW_NUMBER() OVER (PARTITION BY article_id ORDER BY timestamp DESC, id DESC) as rn
+            FROM read_counts
+            WHERE {where_clause}
+        )
+        WHERE rn <= ?
+        ORDER BY article_id, rn
+        ''',
+        params,
+    )
+    rows = cursor.fetchall()
+    conn.close()
+
+    result: Dict[int, List[Dict]] = {}
+    for row in rows:
+        result.setdefault(row['article_id'], []).append(dict(row))
+    return result
+
+
+# 逐批从游标取行的大小（流式导出时限制单次驻留内存的行数）
+HISTORY_FETCH_SIZE = 5000
+
+
+def iter_all_article_history(
+    start_date: str = None,
+    end_date: str = None,
+    limit_per_article: int = 100,
+) -> Iterator[sqlite3.Row]:
+    """单次 JOIN 查询逐行产出所有文章的阅读数历史（title, site, url, count, timestamp）。
+
+    文章顺序与 get_all_articles 一致（created_at DESC），每篇的记录顺序与条数限制与 get_read_counts 一致；
+    以 fetchmany 分批读取，连接在迭代结束（或生成器被关闭）时释放。
+    """
+    where_clause = '1 = 1'
+    params: list = []
+
+    if start_date:
+        where_clause += ' AND DATE(timestamp) >= ?'
+        params.append(start_date)
+
+    if end_date:
+        where_clause += ' AND DATE(timestamp) <= ?'
+        params.append(end_date)
+
+    params.append(limit_per_article)
+    conn = get_db()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            f'''
+            SELECT a.title, a.site, a.url, rc.count, rc.timestamp
+            FROM articles a
+            JOIN (
+                SELECT
+                    article_id,
+                    count,
+                    timestamp,
+                    ROW_NUMBER() OVER (PARTITION BY article_id ORDER BY timestamp DESC, id DESC) as rn
+                FROM read_counts
+                WHERE {where_clause}
+            ) rc ON rc.article_id = a.id
+            WHERE rc.rn <= ?
+            ORDER BY a.created_at DESC, a.id DESC, rc.rn
+            ''',
+            params,
+        )
+        while True:
+            rows = cursor.fetchmany(HISTORY_FETCH_SIZE)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        conn.close()
+
+
 def get_latest_read_count(article_id: int) -> Optional[Dict]:
     conn = get_db()
     cursor = conn.cursor()
@@ -140,6 +254,8 @@ def delete_read_count_by_timestamp(article_id: int, timestamp: str) -> int:
     deleted_count = cursor.rowcount
     conn.commit()
     conn.close()
+    if deleted_count:
+        mark_data_changed()
     return deleted_count
 
 
@@ -262,6 +378,8 @@ def clear_cache(days: int = None, before_date: str = None) -> int:
     deleted_count = cursor.rowcount
     conn.commit()
     conn.close()
+    if deleted_count:
+        mark_data_changed()
     return deleted_count
 
 
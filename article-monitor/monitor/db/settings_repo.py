@@ -1,7 +1,14 @@
-from typing import Optional
+import time
+from typing import Dict, Optional, Tuple
 
 from .connection import get_db
 
+# 设置值缓存（秒）：面板轮询的 health / settings 接口不必每次都查库
+SETTINGS_CACHE_TTL = 60.0
+
+# {key: (monotonic 时间, 库中的值；不存在为 None)}；set_setting 写入时失效
+_SETTINGS_CACHE: Dict[str, Tuple[float, Optional[str]]] = {}
+
 
 def get_setting(key: str, default_value=None) -> Optional[str]:
     conn = get_db()
@@ -14,6 +21,17 @@ def get_setting(key: str, default_value=None) -> Optional[str]:
     return default_value
 
 
+def get_cached_setting(key: str, default_value=None, ttl: float = SETTINGS_CACHE_TTL) -> Optional[str]:
+    """带 TTL 缓存的 get_setting；本进程内经 set_setting 的修改会立即生效。"""
+    now = time.monotonic()
+    entry = _SETTINGS_CACHE.get(key)
+    if entry is None or now - entry[0] >= ttl:
+        entry = (now, get_setting(key))
+        _SETTINGS_CACHE[key] = entry
+    value = entry[1]
+    return value if value is not None else default_value
+
+
 def set_setting(key: str, value) -> None:
     conn = get_db()
     cursor = conn.cursor()
@@ -26,4 +44,4 @@ def set_setting(key: str, value) -> None:
     )
     conn.commit()
     conn.close()
-
+    _SETTINGS_CACHE.pop(key, None)
@@ -1,75 +1,101 @@
+import codecs
 import csv
-import io
 from datetime import datetime
-from typing import List, Optional, Tuple
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from .database import get_all_articles, get_read_counts
+from .database import get_articles_by_ids, get_read_counts_bulk, iter_all_article_history
 
+CSV_HEADER = ['文章标题', '网站', 'URL', '阅读数', '记录时间']
+# 每次批量查询的文章数（低于 SQLite 绑定参数上限，同时限制单批内存）
+HISTORY_QUERY_CHUNK_SIZE = 500
 
-def export_selected_articles_csv(
-    article_ids: List[int],
+
+# 每个输出块包含的行数（合并小块，减少 WSGI 层逐行写出的开销）
+CSV_ROWS_PER_CHUNK = 256
+
+
+class _Echo:
+    """csv.writer 的伪文件对象：writerow 直接返回格式化后的行，便于逐行 yield。"""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+class _LineBuffer(list):
+    """csv.writer 的伪文件对象：writerows 写出的每行追加到列表，按块取出后清空。"""
+
+    write = list.append
+
+
+def _encode_header() -> bytes:
+    return codecs.BOM_UTF8 + csv.writer(_Echo()).writerow(CSV_HEADER).encode('utf-8')
+
+
+# BOM + 表头只编码一次，所有导出共用
+_CSV_PREAMBLE = _encode_header()
+
+
+def _stream_csv(rows: Iterable[Iterable]) -> Iterator[bytes]:
+    """分块生成 UTF-8（带 BOM）编码的 CSV，内存占用与总行数无关。
+
+    每块用 writerows 一次写入 CSV_ROWS_PER_CHUNK 行（逐行循环在 C 中完成）。
+    """
+    yield _CSV_PREAMBLE
+    buf = _LineBuffer()
+    writer = csv.writer(buf)
+    rows = iter(rows)
+    while True:
+        writer.writerows(islice(rows, CSV_ROWS_PER_CHUNK))
+        if not buf:
+            return
+        yield ''.join(buf).encode('utf-8')
+        buf.clear()
+
+
+def _article_history_rows(
+    articles: List[Dict],
     start_date: Optional[str],
     end_date: Optional[str],
-) -> Tuple[bytes, str]:
-    """生成選定文章的 CSV 資料 bytes 與檔名。"""
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    output.write('\ufeff')
-    writer.writerow(['文章标题', '网站', 'URL', '阅读数', '记录时间'])
-
-    all_articles = get_all_articles()
-    articles_dict = {a['id']: a for a in all_articles}
-
-    for article_id in article_ids:
-        article = articles_dict.get(article_id)
-        if not article:
-            continue
-
-        history = get_read_counts(article_id, start_date=start_date, end_date=end_date)
-        for record in history:
-            writer.writerow(
-                [
+) -> Iterator[List]:
+    for i in range(0, len(articles), HISTORY_QUERY_CHUNK_SIZE):
+        chunk = articles[i : i + HISTORY_QUERY_CHUNK_SIZE]
+        histories = get_read_counts_bulk(
+            [article['id'] for article in chunk], start_date=start_date, end_date=end_date
+        )
+        for article in chunk:
+            for record in histories.get(article['id'], ()):
+                yield [
                     article.get('title', 'N/A'),
                     article.get('site', 'N/A'),
                     article.get('url', 'N/A'),
                     record['count'],
                     record['timestamp'],
                 ]
-            )
-
-    output.seek(0)
-    filename = f"article_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    return output.getvalue().encode('utf-8-sig'), filename
 
 
-def export_all_articles_csv(
+def export_selected_articles_csv(
+    article_ids: List[int],
     start_date: Optional[str],
     end_date: Optional[str],
-) -> Tuple[bytes, str]:
-    """生成所有文章的 CSV 資料 bytes 與檔名。"""
-    output = io.StringIO()
-    writer = csv.writer(output)
+) -> Tuple[Iterator[bytes], str]:
+    """生成選定文章的 CSV 資料（逐行 bytes 迭代器）與檔名。"""
+    # 只取選定的文章（單次 IN 查詢），不載入整張 articles 表
+    articles_dict = get_articles_by_ids(article_ids)
+    articles = [articles_dict[aid] for aid in article_ids if aid in articles_dict]
 
-    output.write('\ufeff')
-    writer.writerow(['文章标题', '网站', 'URL', '阅读数', '记录时间'])
+    filename = f"article_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    return _stream_csv(_article_history_rows(articles, start_date, end_date)), filename
 
-    articles = get_all_articles()
-    for article in articles:
-        history = get_read_counts(article['id'], start_date=start_date, end_date=end_date)
 
-        for record in history:
-            writer.writerow(
-                [
-                    article.get('title', 'N/A'),
-                    article.get('site', 'N/A'),
-                    article.get('url', 'N/A'),
-                    record['count'],
-                    record['timestamp'],
-                ]
-            )
+def export_all_articles_csv(
+    start_date: Optional[str],
+    end_date: Optional[str],
+) -> Tuple[Iterator[bytes], str]:
+    """生成所有文章的 CSV 資料（逐行 bytes 迭代器）與檔名。"""
+    # 單次 JOIN 查詢，邊讀游標邊輸出；查詢在開始迭代時才執行。
+    # 查詢列順序即 CSV 列順序，sqlite3.Row 直接交給 writerows，不再逐行轉 list
+    rows = iter_all_article_history(start_date, end_date)
 
-    output.seek(0)
     filename = f"all_articles_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    return output.getvalue().encode('utf-8-sig'), filename
-
+    return _stream_csv(rows), filename
@@ -12,15 +12,17 @@ import time
 from typing import Optional, Dict, Any
 from urllib.parse import urlparse
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
-from functools import lru_cache
 from .config import (
     PLATFORM_EXTRACTORS,
+    get_compiled_patterns,
     ANTI_SCRAPING_ENABLED,
     ANTI_SCRAPING_ROTATE_UA,
     ANTI_SCRAPING_RANDOM_DELAY,
     ANTI_SCRAPING_STEALTH_MODE,
     ANTI_SCRAPING_MIN_DELAY,
     ANTI_SCRAPING_MAX_DELAY,
+    ANTI_SCRAPING_MAX_CONCURRENCY,
+    ANTI_SCRAPING_HOMOGENEOUS,
     TOR_ENABLED,
     TOR_SOCKS5_URL,
     TOR_ON_BLOCKED_ONLY,
@@ -28,6 +30,7 @@ from .config import (
 )
 from .anti_scraping import get_anti_scraping_manager, AntiScrapingManager
 from .logging_context import bind_context_fields
+from .url_utils import detect_site
 
 logger = logging.getLogger(__name__)
 
@@ -81,6 +84,8 @@ def _get_anti_scraping_manager() -> AntiScrapingManager:
             stealth_mode=ANTI_SCRAPING_STEALTH_MODE,
             min_delay=ANTI_SCRAPING_MIN_DELAY,
             max_delay=ANTI_SCRAPING_MAX_DELAY,
+            max_concurrency=ANTI_SCRAPING_MAX_CONCURRENCY,
+            homogeneous=ANTI_SCRAPING_HOMOGENEOUS,
         )
     return _anti_scraping_manager
 
@@ -175,6 +180,7 @@ async def create_shared_crawler():
 
     优化：优先从浏览器池获取，如果池已满则创建独立实例
     """
+    # browser_pool 在模块级导入本模块（get_browser_config），故此处延迟导入以避免循环导入
     from .browser_pool import get_browser_pool
 
     browser_pool = get_browser_pool()
@@ -292,12 +298,6 @@ async def _crawl_with_shared(
         return None
 
 
-@lru_cache(maxsize=None)  # 无界缓存，因为模式数量有限且固定
-def _compile_pattern(pattern: str) -> re.Pattern:
-    """编译正则表达式（缓存编译结果，提升性能）"""
-    return re.compile(pattern, re.IGNORECASE | re.DOTALL)
-
-
 def _parse_number(text: str, method: str = "number") -> Optional[int]:
     """根据指定方法解析数字
 
@@ -343,37 +343,57 @@ _TITLE_PATTERNS = {
         re.IGNORECASE,
     ),
 }
-_TITLE_SUFFIX_PATTERNS = [
+# 站点名后缀先去掉，再去掉「博客/技术」类后缀；后两者合并为一个交替分支，
+# 与依次执行两次替换结果一致（最左的「博客」分隔位置必然先于其后的任何分隔位置）
+_TITLE_SUFFIX_PATTERNS = (
     re.compile(
         r"\s*[-|_–—]\s*(掘金|CSDN|博客园|51CTO|SegmentFault|简书|电子发烧友|与非网).*$",
         re.IGNORECASE,
     ),
-    re.compile(r"\s*[-|_–—]\s*.*博客.*$", re.IGNORECASE),
-    re.compile(r"\s*[-|_–—]\s*.*技术.*$", re.IGNORECASE),
-]
+    re.compile(r"\s*[-|_–—]\s*.*(?:博客|技术).*$", re.IGNORECASE),
+)
+_TITLE_SEPARATOR_CHARS = frozenset("-|_–—")
 _HTML_TAG_PATTERN = re.compile(r"<[^>]+>")
+# 超过该长度的 HTML 在线程池中提取标题（小页面切换线程的开销大于正则本身）
+_TITLE_OFFLOAD_HTML_CHARS = 256 * 1024
+
+
+def _clean_title(title: str) -> str:
+    """清理标题中常见的网站后缀（无分隔符的标题直接跳过）"""
+    title = title.strip()
+    if not _TITLE_SEPARATOR_CHARS.isdisjoint(title):
+        for suffix_pattern in _TITLE_SUFFIX_PATTERNS:
+            title = suffix_pattern.sub("", title)
+    return title.strip()
 
 
-def _extract_title_from_html(html: str) -> Optional[str]:
+def _extract_title_from_html(
+    html: str, metadata: Optional[Dict] = None
+) -> Optional[str]:
     """从 HTML 中提取文章标题（优化：使用预编译正则表达式）
 
     优先级：
-    1. <title> 标签
-    2. <h1> 标签
-    3. og:title meta 标签
+    1. crawl4ai 已解析的 metadata["title"]（lxml 解析 <head>，免去整页正则扫描）
+    2. <title> 标签
+    3. <h1> 标签
+    4. og:title meta 标签
     """
+    if isinstance(metadata, dict):
+        meta_title = metadata.get("title")
+        if isinstance(meta_title, str):
+            title = _clean_title(meta_title)
+            if title:
+                return title
+
     if not html:
         return None
 
     # 1. 尝试从 <title> 标签提取
     title_match = _TITLE_PATTERNS["title"].search(html)
     if title_match:
-        title = title_match.group(1).strip()
-        # 清理常见的网站后缀（使用预编译正则）
-        for suffix_pattern in _TITLE_SUFFIX_PATTERNS:
-            title = suffix_pattern.sub("", title)
+        title = _clean_title(title_match.group(1))
         if title:
-            return title.strip()
+            return title
 
     # 2. 尝试从 <h1> 标签提取
     h1_match = _TITLE_PATTERNS["h1"].search(html)
@@ -435,11 +455,8 @@ async def extract_with_config_full(
         return (None, None)
 
     config = PLATFORM_EXTRACTORS[platform]
-    patterns = config.get("patterns", [])
-    # 预编译正则表达式（提升性能）
-    # HTML 使用 DOTALL 模式（支持跨行匹配），markdown 不使用
-    compiled_patterns_html = [_compile_pattern(p) for p in patterns]
-    compiled_patterns_markdown = [re.compile(p, re.IGNORECASE) for p in patterns]
+    # 平台规则在导入时已预编译（HTML 使用 DOTALL，markdown 不使用）
+    compiled_patterns_html, compiled_patterns_markdown = get_compiled_patterns(platform)
     wait_for = config.get("wait_for")
     timeout = config.get("timeout", 20000)
     parse_method = config.get("parse_method", "number")
@@ -516,7 +533,7 @@ async def extract_with_config_full(
         if crawler:
             return await _run_with_crawler(crawler, run_cfg)
 
-        from .browser_pool import get_browser_pool
+        from .browser_pool import get_browser_pool  # 延迟导入：避免与 browser_pool 循环导入
 
         browser_pool = get_browser_pool()
         pool_crawler = await browser_pool.acquire()
@@ -582,8 +599,12 @@ async def extract_with_config_full(
         logger.warning("检测到验证码/挑战页")
         return (None, None)
 
-    # 提前提取文章标题
-    article_title = _extract_title_from_html(html)
+    # 提前提取文章标题（大页面的正则回退放到线程池，避免阻塞事件循环上的其他抓取）
+    metadata = getattr(result, "metadata", None)
+    if html and len(html) >= _TITLE_OFFLOAD_HTML_CHARS:
+        article_title = await asyncio.to_thread(_extract_title_from_html, html, metadata)
+    else:
+        article_title = _extract_title_from_html(html, metadata)
 
     # 如果配置了 JavaScript 提取，优先从标记中提取（支持 sohu、juejin 等）
     if js_extract:
@@ -728,16 +749,8 @@ async def extract_article_info(
     Returns:
         包含 'read_count' 和 'title' 的字典
     """
-    from .config import SUPPORTED_SITES
-
-    hostname = (urlparse(url).hostname or "").lower()
-
     # 根据域名匹配平台（使用配置文件中的映射）
-    platform = None
-    for site_domain, site_name in SUPPORTED_SITES.items():
-        if hostname == site_domain or hostname.endswith(f".{site_domain}"):
-            platform = site_name
-            break
+    platform = detect_site(urlparse(url).hostname)
 
     result = {"read_count": None, "title": None}
 
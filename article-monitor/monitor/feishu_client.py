@@ -11,8 +11,9 @@ API 文档参考：
 - 批量更新: https://open.feishu.cn/document/server-docs/docs/bitable-v1/app-table-record/batch_update
 - SDK: https://open.feishu.cn/document/uAjLw4CM/ukTMukTMukTM/server-side-sdk/python--sdk/preparations-before-development
 """
+import json
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import lark_oapi as lark  # type: ignore[import-untyped]
 from lark_oapi.api.bitable.v1 import (  # type: ignore[import-untyped]
@@ -79,11 +80,13 @@ def list_bitable_records(
     *,
     page_size: int = 500,
     page_token: Optional[str] = None,
+    field_names: Optional[List[str]] = None,
     app_id: Optional[str] = None,
     app_secret: Optional[str] = None,
 ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
     """
     拉取 Bitable 表记录（单页）。
+    field_names 非空时只返回这些字段（服务端投影），宽表可大幅缩小响应体。
 
     Returns:
         (items, next_page_token)
@@ -99,6 +102,8 @@ def list_bitable_records(
     )
     if page_token:
         builder = builder.page_token(page_token)
+    if field_names:
+        builder = builder.field_names(json.dumps(field_names, ensure_ascii=False))
     req = builder.build()
     resp = client.bitable.v1.app_table_record.list(req)
     if not resp.success():
@@ -115,16 +120,16 @@ def list_bitable_records(
     return items, next_token
 
 
-def list_all_bitable_records(
+def iter_bitable_record_pages(
     app_token: str,
     table_id: str,
     *,
     page_size: int = 500,
+    field_names: Optional[List[str]] = None,
     app_id: Optional[str] = None,
     app_secret: Optional[str] = None,
-) -> List[Dict[str, Any]]:
-    """拉取 Bitable 表全部记录（自动分页）。"""
-    all_items: List[Dict[str, Any]] = []
+) -> Iterator[List[Dict[str, Any]]]:
+    """逐页拉取 Bitable 表记录（自动分页），每拉到一页即 yield，调用方可边拉边处理；field_names 同 list_bitable_records。"""
     page_token: Optional[str] = None
     while True:
         items, page_token = list_bitable_records(
@@ -132,12 +137,35 @@ def list_all_bitable_records(
             table_id,
             page_size=page_size,
             page_token=page_token,
+            field_names=field_names,
             app_id=app_id,
             app_secret=app_secret,
         )
-        all_items.extend(items)
+        yield items
         if not page_token:
             break
+
+
+def list_all_bitable_records(
+    app_token: str,
+    table_id: str,
+    *,
+    page_size: int = 500,
+    field_names: Optional[List[str]] = None,
+    app_id: Optional[str] = None,
+    app_secret: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """拉取 Bitable 表全部记录（自动分页）。"""
+    all_items: List[Dict[str, Any]] = []
+    for items in iter_bitable_record_pages(
+        app_token,
+        table_id,
+        page_size=page_size,
+        field_names=field_names,
+        app_id=app_id,
+        app_secret=app_secret,
+    ):
+        all_items.extend(items)
     return all_items
 
 
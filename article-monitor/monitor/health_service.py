@@ -1,19 +1,30 @@
 import time
 import socket
+import threading
 import concurrent.futures
 from datetime import datetime, timedelta
 from typing import Dict, Any, List
 
 import psutil
 
-from .config import HEALTH_CHECK_TIMEOUT, MAX_HEALTH_CHECK_WORKERS, CRAWL_INTERVAL_HOURS, SUPPORTED_SITES
-from .database import get_platform_health, get_platform_failures, get_setting
+from .config import (
+    HEALTH_CHECK_TIMEOUT,
+    HEALTH_NETWORK_CACHE_SECONDS,
+    MAX_HEALTH_CHECK_WORKERS,
+    CRAWL_INTERVAL_HOURS,
+    SUPPORTED_SITES,
+)
+from .database import get_platform_health, get_platform_failures, get_cached_setting
 import logging
 from .logging_config import get_logging_stats
 
 
 logger = logging.getLogger(__name__)
 
+# 網路檢查結果快取：{'data': 上次結果, 'ts': monotonic 時間}；refreshing 保證同時只有一個背景刷新
+_network_cache: Dict[str, Any] = {'data': None, 'ts': 0.0, 'refreshing': False}
+_network_cache_lock = threading.Lock()
+
 
 def _build_system_status() -> Dict[str, Any]:
     cpu_percent = psutil.cpu_percent(interval=None)
@@ -38,6 +49,16 @@ def _build_system_status() -> Dict[str, Any]:
     }
 
 
+def _parse_db_timestamp(value: str) -> datetime:
+    """解析 SQLite datetime() 產生的 'YYYY-MM-DD HH:MM:SS'。
+
+    fromisoformat 為 C 實作，比逐筆 strptime 快一個數量級；先檢查長度與分隔符，保持與原格式同樣嚴格。
+    """
+    if len(value) != 19 or value[10] != ' ':
+        raise ValueError(f"非預期的時間格式: {value!r}")
+    return datetime.fromisoformat(value)
+
+
 def _build_platform_status() -> List[Dict[str, Any]]:
     platforms = get_platform_health()
     failures = get_platform_failures()
@@ -58,7 +79,7 @@ def _build_platform_status() -> List[Dict[str, Any]]:
                 }
             )
 
-    crawl_interval = int(get_setting('crawl_interval_hours', str(CRAWL_INTERVAL_HOURS)))
+    crawl_interval = int(get_cached_setting('crawl_interval_hours', str(CRAWL_INTERVAL_HOURS)))
     platform_status: List[Dict[str, Any]] = []
     now = datetime.now()
 
@@ -79,7 +100,7 @@ def _build_platform_status() -> List[Dict[str, Any]]:
                 msg = '无文章'
         else:
             try:
-                last_dt = datetime.strptime(last_update, '%Y-%m-%d %H:%M:%S')
+                last_dt = _parse_db_timestamp(last_update)
                 diff_hours = (now - last_dt).total_seconds() / 3600
                 if diff_hours > crawl_interval * 4:
                     status = 'error'
@@ -119,53 +140,110 @@ def _build_platform_status() -> List[Dict[str, Any]]:
 def _check_conn(host: str, port: int = 443) -> Dict[str, Any]:
     try:
         start = time.time()
-        socket.create_connection((host, port), timeout=HEALTH_CHECK_TIMEOUT)
-        return {'ok': True, 'latency': int((time.time() - start) * 1000)}
+        with socket.create_connection((host, port), timeout=HEALTH_CHECK_TIMEOUT):
+            return {'ok': True, 'latency': int((time.time() - start) * 1000)}
     except (socket.error, OSError, TimeoutError) as e:
         logger.debug(f"网络连接检查失败 {host}:{port}: {e}")
         return {'ok': False, 'latency': 0}
 
 
+_INTERNET_PROBE = ('互联网连通性', 'www.baidu.com')
+
+
 def _build_network_status() -> List[Dict[str, Any]]:
-    targets = [('互联网连通性', 'www.baidu.com')]
-    for domain, name in SUPPORTED_SITES.items():
-        targets.append((name, domain))
+    internet_name, internet_host = _INTERNET_PROBE
+    targets = [(name, domain) for domain, name in SUPPORTED_SITES.items()]
 
     network_results: Dict[str, Dict[str, Any]] = {}
 
     with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_HEALTH_CHECK_WORKERS) as executor:
-        future_to_target = {
-            executor.submit(_check_conn, domain, 443): (name, domain) for name, domain in targets
+        # 先探測外網；外網不通時各站點必然不通，直接標記跳過，省去逐站超時等待
+        try:
+            internet_status = executor.submit(_check_conn, internet_host, 443).result()
+        except Exception as e:
+            logger.debug(f"網絡檢查異常 {internet_host}: {e}")
+            internet_status = {'ok': False, 'latency': 0}
+        network_results[internet_host] = {
+            'name': internet_name,
+            'host': internet_host,
+            'status': internet_status,
         }
 
-        for future in concurrent.futures.as_completed(future_to_target):
-            name, domain = future_to_target[future]
-            try:
-                result = future.result()
-                network_results[domain] = {'name': name, 'host': domain, 'status': result}
-            except Exception as e:
-                logger.debug(f"網絡檢查異常 {domain}: {e}")
+        if not internet_status['ok']:
+            for name, domain in targets:
                 network_results[domain] = {
                     'name': name,
                     'host': domain,
-                    'status': {'ok': False, 'latency': 0},
+                    'status': {'ok': False, 'latency': 0, 'skipped': True},
                 }
+        else:
+            future_to_target = {
+                executor.submit(_check_conn, domain, 443): (name, domain) for name, domain in targets
+            }
 
-    sorted_network: List[Dict[str, Any]] = []
-    if 'www.baidu.com' in network_results:
-        sorted_network.append(network_results.pop('www.baidu.com'))
-
+            for future in concurrent.futures.as_completed(future_to_target):
+                name, domain = future_to_target[future]
+                try:
+                    result = future.result()
+                    network_results[domain] = {'name': name, 'host': domain, 'status': result}
+                except Exception as e:
+                    logger.debug(f"網絡檢查異常 {domain}: {e}")
+                    network_results[domain] = {
+                        'name': name,
+                        'host': domain,
+                        'status': {'ok': False, 'latency': 0},
+                    }
+
+    sorted_network: List[Dict[str, Any]] = [network_results.pop(internet_host)]
     for domain in sorted(network_results.keys()):
         sorted_network.append(network_results[domain])
 
     return sorted_network
 
 
+def _refresh_network_cache() -> List[Dict[str, Any]]:
+    try:
+        data = _build_network_status()
+        with _network_cache_lock:
+            _network_cache['data'] = data
+            _network_cache['ts'] = time.monotonic()
+        return data
+    finally:
+        with _network_cache_lock:
+            _network_cache['refreshing'] = False
+
+
+def _get_network_status() -> List[Dict[str, Any]]:
+    """返回網路檢查結果；快取過期時在背景線程刷新，請求不必等待逐站 TCP 探測。"""
+    if HEALTH_NETWORK_CACHE_SECONDS <= 0:
+        return _build_network_status()
+
+    with _network_cache_lock:
+        data = _network_cache['data']
+        fresh = time.monotonic() - _network_cache['ts'] < HEALTH_NETWORK_CACHE_SECONDS
+        if data is not None and (fresh or _network_cache['refreshing']):
+            return data
+        _network_cache['refreshing'] = True
+
+    if data is None:
+        # 首次請求尚無結果可用，只能同步探測
+        return _refresh_network_cache()
+
+    threading.Thread(target=_refresh_network_cache, name="health-network-refresh", daemon=True).start()
+    return data
+
+
+def reset_network_status_cache() -> None:
+    """清空網路檢查快取（測試或配置變更後使用）。"""
+    with _network_cache_lock:
+        _network_cache.update(data=None, ts=0.0, refreshing=False)
+
+
 def get_system_health_payload() -> Dict[str, Any]:
     """組合系統健康狀態 payload，供 API 回傳使用。"""
     system_status = _build_system_status()
     platform_status = _build_platform_status()
-    network_status = _build_network_status()
+    network_status = _get_network_status()
 
     return {
         'system': system_status,
@@ -1,6 +1,6 @@
 """Shared structured logging context for request/crawl traces."""
 from contextvars import ContextVar, Token, copy_context
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 _crawl_context_var: ContextVar[Dict[str, Any]] = ContextVar("crawl_context", default={})
 
@@ -44,6 +44,16 @@ def run_with_current_log_context(func: Callable[..., Any], *args: Any, **kwargs:
     return ctx.run(func, *args, **kwargs)
 
 
+async def with_log_context(coro: Awaitable[Any], fields: Optional[Dict[str, Any]]) -> Any:
+    """Await coroutine with the given context fields set (for hopping onto another thread's loop)."""
+    token = set_log_context(**fields) if fields else None
+    try:
+        return await coro
+    finally:
+        if token is not None:
+            reset_log_context(token)
+
+
 def current_log_context_or_none() -> Optional[Dict[str, Any]]:
     """Return current context dict, or None when context is empty."""
     current = get_log_context()
@@ -2,6 +2,14 @@
 Platform-specific extraction rules for article read counts.
 Kept separate from core config to keep configuration focused.
 """
+import re
+from typing import Dict, Iterable, Tuple
+
+# HTML 使用 DOTALL（支持跨行匹配），markdown 不使用
+_HTML_PATTERN_FLAGS = re.IGNORECASE | re.DOTALL
+_MARKDOWN_PATTERN_FLAGS = re.IGNORECASE
+
+CompiledPatterns = Tuple[Tuple[re.Pattern, ...], Tuple[re.Pattern, ...]]
 
 PLATFORM_EXTRACTORS = {
     'juejin': {
@@ -120,3 +128,26 @@ PLATFORM_EXTRACTORS = {
     },
 }
 
+
+def compile_patterns(patterns: Iterable[str]) -> CompiledPatterns:
+    """将规则中的正则字符串编译为 (HTML 版本, markdown 版本) 两组 Pattern。"""
+    patterns = tuple(patterns)
+    return (
+        tuple(re.compile(p, _HTML_PATTERN_FLAGS) for p in patterns),
+        tuple(re.compile(p, _MARKDOWN_PATTERN_FLAGS) for p in patterns),
+    )
+
+
+# 导入时一次性编译全部平台规则，提取热路径只做 pattern.search
+PLATFORM_EXTRACTORS_COMPILED: Dict[str, CompiledPatterns] = {
+    site: compile_patterns(rules.get('patterns', []))
+    for site, rules in PLATFORM_EXTRACTORS.items()
+}
+
+
+def get_compiled_patterns(site: str) -> CompiledPatterns:
+    """返回平台预编译的 (HTML, markdown) 正则；运行时新增的平台规则按需编译。"""
+    compiled = PLATFORM_EXTRACTORS_COMPILED.get(site)
+    if compiled is not None:
+        return compiled
+    return compile_patterns(PLATFORM_EXTRACTORS.get(site, {}).get('patterns', []))
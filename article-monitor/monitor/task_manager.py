@@ -11,6 +11,7 @@ from enum import Enum
 import logging
 
 logger = logging.getLogger(__name__)
+from .config import MAX_CONCURRENT_TASKS, TASK_QUEUE_TIMEOUT
 from .logging_context import current_log_context_or_none, set_log_context, reset_log_context, run_with_current_log_context
 
 class TaskStatus(Enum):
@@ -40,7 +41,6 @@ class TaskManager:
         self._initialized = True
         self._tasks: Dict[str, Dict] = {}
         self._task_lock = threading.Lock()
-        from .config import MAX_CONCURRENT_TASKS
         self._max_concurrent_tasks = MAX_CONCURRENT_TASKS
         self._current_running = 0
         self._task_queue = asyncio.Queue()
@@ -78,7 +78,6 @@ class TaskManager:
         while True:
             try:
                 # 等待任务或超时（增加超时时间减少轮询频率）
-                from .config import TASK_QUEUE_TIMEOUT
                 task_id = await asyncio.wait_for(self._task_queue.get(), timeout=TASK_QUEUE_TIMEOUT)
                 
                 # 检查并发限制（线程安全）
@@ -117,6 +116,7 @@ class TaskManager:
                         task['error'] = str(e)
                         task['end_time'] = datetime.now().isoformat()
                 finally:
+                    task['done'].set()
                     self._current_running -= 1
                     self._task_queue.task_done()
                     
@@ -147,7 +147,8 @@ class TaskManager:
             'start_time': datetime.now().isoformat(),
             'end_time': None,
             'progress': {},
-            'error': None
+            'error': None,
+            'done': threading.Event(),
         }
         
         with self._task_lock:
@@ -180,11 +181,11 @@ class TaskManager:
         return task_id
     
     def get_task(self, task_id: str) -> Optional[Dict]:
-        """获取任务状态"""
+        """获取任务状态（任务结束且写入过结果时附带 results，供轮询方展示逐条结果）"""
         with self._task_lock:
             task = self._tasks.get(task_id)
             if task:
-                return {
+                info = {
                     'id': task['id'],
                     'status': task['status'].value,
                     'start_time': task['start_time'],
@@ -192,6 +193,12 @@ class TaskManager:
                     'progress': task.get('progress', {}),
                     'error': task.get('error')
                 }
+                if (
+                    task['status'] not in (TaskStatus.PENDING, TaskStatus.RUNNING)
+                    and task.get('results') is not None
+                ):
+                    info['results'] = task['results']
+                return info
             return None
     
     def update_task_progress(self, task_id: str, progress: Dict):
@@ -201,6 +208,27 @@ class TaskManager:
             if task:
                 task['progress'].update(progress)
 
+    def set_task_result(self, task_id: str, results: List):
+        """保存任务结果（在锁内写入任务本身；get_task 返回的是副本，写副本不会生效）"""
+        with self._task_lock:
+            task = self._tasks.get(task_id)
+            if task:
+                task['results'] = results
+
+    def get_task_results(self, task_id: str) -> Optional[List]:
+        """获取任务结果（未写入结果或任务不存在时返回 None）"""
+        with self._task_lock:
+            task = self._tasks.get(task_id)
+            return task.get('results') if task else None
+
+    def wait_for_task(self, task_id: str, timeout: Optional[float] = None) -> bool:
+        """阻塞等待任务结束（完成/失败/取消），超时或任务不存在返回 False"""
+        with self._task_lock:
+            task = self._tasks.get(task_id)
+        if not task:
+            return False
+        return task['done'].wait(timeout)
+
     def get_active_tasks(self) -> List[Dict]:
         """获取系统中正在执行/等待的任务列表。"""
         with self._task_lock:
@@ -224,6 +252,7 @@ class TaskManager:
             if task and task['status'] in [TaskStatus.PENDING, TaskStatus.RUNNING]:
                 task['status'] = TaskStatus.CANCELLED
                 task['end_time'] = datetime.now().isoformat()
+                task['done'].set()
                 return True
             return False
     
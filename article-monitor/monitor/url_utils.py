@@ -1,6 +1,8 @@
 from urllib.parse import urlparse
 from typing import Optional
+from functools import lru_cache
 import ipaddress
+import re
 
 from .config import SUPPORTED_SITES
 import logging
@@ -8,12 +10,39 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-def normalize_url(url: str) -> str:
-    """規範化 URL，修正已知平台的非標準格式"""
+# 各平台的 URL 改寫規則：名稱 -> (pattern, 替換模板)；pattern 只含一個與規則名同名的命名組。
+# 所有規則合併成一個交替正則，新增規則不增加對 URL 的掃描次數
+_NORMALIZE_RULES = {
     # 掘金: spost -> post
-    if 'juejin.cn' in url:
-        url = url.replace('/spost/', '/post/')
-    return url
+    'juejin': (r'(?P<juejin>juejin\.cn/(?:[^?#]*/)?)spost/', r'\g<juejin>post/'),
+}
+_NORMALIZE_RE = re.compile('|'.join(pattern for pattern, _ in _NORMALIZE_RULES.values()))
+
+
+def _normalize_repl(match: re.Match) -> str:
+    return match.expand(_NORMALIZE_RULES[match.lastgroup][1])
+
+
+@lru_cache(maxsize=8192)
+def normalize_url(url: str) -> str:
+    """規範化 URL，修正已知平台的非標準格式（單次正則掃描；重複 URL 直接命中快取）"""
+    return _NORMALIZE_RE.sub(_normalize_repl, url)
+
+
+@lru_cache(maxsize=1024)
+def detect_site(hostname: str) -> Optional[str]:
+    """根據 hostname 檢測平台名稱（hostname == domain 或為其子域名）
+
+    逐級取 hostname 的後綴在 SUPPORTED_SITES 中查表，成本與域名層級數相關，
+    與支援的平台數量無關；批量提交中重複出現的 hostname 直接命中快取。
+    """
+    hostname = (hostname or "").lower()
+    while hostname:
+        site = SUPPORTED_SITES.get(hostname)
+        if site is not None:
+            return site
+        _, _, hostname = hostname.partition('.')
+    return None
 
 
 def validate_url(url: str) -> bool:
@@ -60,8 +89,12 @@ def validate_url(url: str) -> bool:
         return False
 
 
+@lru_cache(maxsize=4096)
 def validate_and_normalize_url(url: str) -> tuple[bool, str, Optional[str]]:
     """驗證並規範化 URL，檢測平台
+
+    只依賴輸入與不可變的平台配置，結果可快取：Bitable 定期同步反覆送入同一批 URL 時
+    直接命中快取，不再重複解析。
     
     Args:
         url: 原始 URL
@@ -82,14 +115,8 @@ def validate_and_normalize_url(url: str) -> tuple[bool, str, Optional[str]]:
     
     try:
         parsed = urlparse(url)
-        hostname = (parsed.hostname or "").lower()
-        site = None
-        for site_domain, site_name in SUPPORTED_SITES.items():
-            # 嚴格匹配：hostname == domain 或為其子域名
-            if hostname == site_domain or hostname.endswith(f".{site_domain}"):
-                site = site_name
-                break
-        return True, url, site
+        # 嚴格匹配：hostname == domain 或為其子域名
+        return True, url, detect_site(parsed.hostname)
     except (ValueError, AttributeError) as e:
         logger.debug(f"URL解析失败 {url}: {e}")
         return False, url, None
@@ -12,7 +12,8 @@ if __name__ == '__main__':
     # Start the scheduler
     start_scheduler()
     
-    # Start Flask app
+    # Start Flask app: one thread per request, single process (scheduler, task table
+    # and browser pool are process-local state)
     logger.info("Starting Flask on %s:%s (Debug: %s)", FLASK_HOST, FLASK_PORT, FLASK_DEBUG)
-    app.run(host=FLASK_HOST, port=FLASK_PORT, debug=FLASK_DEBUG)
+    app.run(host=FLASK_HOST, port=FLASK_PORT, debug=FLASK_DEBUG, threaded=True)
 
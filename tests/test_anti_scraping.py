@@ -1,4 +1,6 @@
 """Unit tests for monitor.anti_scraping (manager, profile, headers)."""
+from collections import deque
+
 import pytest
 
 from monitor.anti_scraping import (
@@ -6,6 +8,8 @@ from monitor.anti_scraping import (
     reset_anti_scraping_manager,
     AntiScrapingManager,
     BrowserProfile,
+    VIEWPORT_SIZES,
+    _PREFETCH_SIZE,
 )
 
 
@@ -48,3 +52,258 @@ def test_get_http_headers_returns_dict_with_user_agent():
     assert "User-Agent" in headers
     assert headers["User-Agent"]
     assert "Accept" in headers or "Accept-Language" in headers
+
+
+def test_get_stealth_js_uses_current_profile_without_rotation_tick():
+    """get_stealth_js fills profile fields and does not bump the request counter."""
+    manager = AntiScrapingManager()
+    profile = manager.get_browser_profile()
+    count = manager._request_count
+    js = manager.get_stealth_js()
+    assert f"'{profile.platform}'" in js
+    assert "document.$cdc_asdjflasutopfhvcZLmcfl_" in js
+    assert manager._request_count == count
+
+
+def test_generate_profile_draws_from_prefetched_pools():
+    """Profile generation refills prefetch buffers in batches and returns known values."""
+    from monitor.anti_scraping import ALL_USER_AGENTS, VIEWPORT_SIZES
+
+    manager = AntiScrapingManager()
+    profiles = [manager._generate_profile() for _ in range(300)]
+    assert all(p.user_agent in ALL_USER_AGENTS for p in profiles)
+    assert all((p.viewport_width, p.viewport_height) in VIEWPORT_SIZES for p in profiles)
+    assert manager._prefetched["viewport"]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_generate_human_path_endpoints(monkeypatch, use_numpy):
+    """generate_human_path returns int points near start/end with or without numpy."""
+    import monitor.anti_scraping as anti_scraping_module
+    from monitor.anti_scraping import MouseSimulator
+
+    if not use_numpy:
+        monkeypatch.setattr(anti_scraping_module, "_np", lambda: None)
+    path = MouseSimulator.generate_human_path((0, 0), (100, 200), steps=20)
+    assert len(path) == 20
+    assert all(isinstance(x, int) and isinstance(y, int) for x, y in path)
+    assert abs(path[0][0]) <= 2 and abs(path[0][1]) <= 2
+    assert abs(path[-1][0] - 100) <= 2 and abs(path[-1][1] - 200) <= 2
+
+
+def test_get_http_headers_cached_per_profile():
+    """Headers are rebuilt only after the profile rotates; callers get independent copies."""
+    manager = AntiScrapingManager()
+    first = manager.get_http_headers()
+    first["X-Test"] = "1"
+    second = manager.get_http_headers()
+    assert "X-Test" not in second
+    assert second["User-Agent"] == manager._current_profile.user_agent
+
+    manager.get_browser_profile(force_new=True)
+    third = manager.get_http_headers()
+    assert third["User-Agent"] == manager._current_profile.user_agent
+
+
+def test_ua_records_precompute_platform_and_vendor():
+    """Precomputed UA records carry the platform/vendor derived from each UA."""
+    from monitor.anti_scraping import UA_RECORDS_BY_TYPE
+
+    ua, platform, vendor = UA_RECORDS_BY_TYPE["chrome_windows"][0]
+    assert "Windows" in ua and platform == "Win32" and vendor == "Google Inc."
+    ua, platform, vendor = UA_RECORDS_BY_TYPE["safari_mac"][0]
+    assert platform == "MacIntel" and vendor == "Apple Computer, Inc."
+
+
+def test_random_delay_stays_in_range_and_follows_bounds():
+    """Buffered delays stay within bounds and are regenerated when bounds change."""
+    from monitor.anti_scraping import get_human_delay
+
+    manager = AntiScrapingManager(min_delay=1.0, max_delay=2.0)
+    assert all(1.0 <= manager.get_random_delay() <= 2.0 for _ in range(300))
+    manager.min_delay, manager.max_delay = 5.0, 6.0
+    assert 5.0 <= manager.get_random_delay() <= 6.0
+    assert all(0.5 <= get_human_delay(0.5, 0.7) <= 0.7 for _ in range(50))
+
+
+class _DrainedByOtherThread(deque):
+    """判空时看起来非空、取值时已被其他线程取空的缓冲。"""
+
+    def __bool__(self):
+        return True
+
+
+def test_get_random_user_agent_refills_when_buffer_drained_concurrently(monkeypatch):
+    import monitor.anti_scraping as anti_scraping
+
+    buf = _DrainedByOtherThread()
+    monkeypatch.setattr(anti_scraping, "_user_agent_prefetch", buf)
+    assert anti_scraping.get_random_user_agent() in anti_scraping.ALL_USER_AGENTS
+    assert len(buf) == anti_scraping._PREFETCH_SIZE - 1
+
+
+def test_get_human_delay_refills_when_buffer_drained_concurrently(monkeypatch):
+    import monitor.anti_scraping as anti_scraping
+
+    buf = _DrainedByOtherThread()
+    monkeypatch.setattr(anti_scraping, "_human_delay_buffers", {(0.5, 0.7): buf})
+    assert 0.5 <= anti_scraping.get_human_delay(0.5, 0.7) <= 0.7
+    assert len(buf) == anti_scraping._PREFETCH_SIZE - 1
+
+
+def test_manager_draw_refills_when_buffer_drained_concurrently():
+    manager = AntiScrapingManager()
+    buf = _DrainedByOtherThread()
+    manager._prefetched["viewport"] = buf
+    assert manager._draw("viewport", VIEWPORT_SIZES) in VIEWPORT_SIZES
+    assert len(buf) == _PREFETCH_SIZE - 1
+    assert manager._prefetched["viewport"] is buf
+
+
+def test_manager_random_delay_refills_when_buffer_drained_concurrently():
+    manager = AntiScrapingManager(min_delay=1.0, max_delay=2.0)
+    buf = _DrainedByOtherThread()
+    manager._delay_buffer = ((1.0, 2.0), buf)
+    assert 1.0 <= manager.get_random_delay() <= 2.0
+    assert len(buf) == _PREFETCH_SIZE - 1
+
+    # 范围变化后换用新缓冲区，旧缓冲区中的值不会再被取出
+    manager.min_delay, manager.max_delay = 5.0, 6.0
+    assert 5.0 <= manager.get_random_delay() <= 6.0
+    assert manager._delay_buffer[0] == (5.0, 6.0)
+    assert len(buf) == _PREFETCH_SIZE - 1
+
+
+def test_reset_anti_scraping_manager_builds_new_instance():
+    """reset_anti_scraping_manager drops the cached manager."""
+    a = get_anti_scraping_manager()
+    reset_anti_scraping_manager()
+    b = get_anti_scraping_manager()
+    assert a is not b
+
+
+def test_browser_and_crawler_config_cached_until_rotation():
+    """Configs are served from cache as copies and rebuilt after a profile rotation."""
+    manager = AntiScrapingManager(rotate_user_agent=False)
+    browser_cfg = manager.get_browser_config()
+    browser_cfg["extra_args"].append("--mutated")
+    assert "--mutated" not in manager.get_browser_config()["extra_args"]
+
+    crawler_cfg = manager.get_crawler_config(timeout=1000)
+    crawler_cfg.pop("js_code")
+    assert "js_code" in manager.get_crawler_config(timeout=1000)
+
+    manager.get_browser_profile(force_new=True)
+    assert manager._cached_browser_cfg is None
+    assert manager._cached_crawler_cfgs == {}
+    assert manager.get_browser_config()["user_agent"] == manager._current_profile.user_agent
+
+
+def test_human_delay_limits_concurrent_sleepers(monkeypatch):
+    """human_delay lets at most max_concurrency tasks sleep at the same time."""
+    import asyncio
+
+    manager = AntiScrapingManager(random_delay=False, min_delay=0.01, max_concurrency=2)
+    active = 0
+    peak = 0
+    real_sleep = asyncio.sleep
+
+    async def tracking_sleep(delay):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await real_sleep(delay)
+        active -= 1
+
+    monkeypatch.setattr("monitor.anti_scraping.asyncio.sleep", tracking_sleep)
+
+    async def run():
+        await asyncio.gather(*(manager.human_delay() for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_generate_scroll_pattern_sums_to_total(monkeypatch, use_numpy):
+    """generate_scroll_pattern splits the distance into step_count ints summing to the total."""
+    import monitor.anti_scraping as anti_scraping_module
+    from monitor.anti_scraping import MouseSimulator
+
+    if not use_numpy:
+        monkeypatch.setattr(anti_scraping_module, "_np", lambda: None)
+    distances = MouseSimulator.generate_scroll_pattern(1000, step_count=5)
+    assert len(distances) == 5
+    assert sum(distances) == 1000
+    assert all(isinstance(d, int) for d in distances)
+    assert MouseSimulator.generate_scroll_pattern(300, step_count=0) == [300]
+
+
+def test_generate_scroll_pattern_numpy_keeps_minimum_step():
+    """The numpy path keeps every step at or above 50 px, like the pure-Python path."""
+    pytest.importorskip("numpy")
+    from monitor.anti_scraping import MouseSimulator
+
+    for _ in range(200):
+        distances = MouseSimulator.generate_scroll_pattern(260, step_count=5)
+        assert sum(distances) == 260
+        assert min(distances) >= 50
+
+
+def test_numpy_paths_draw_from_the_given_rng_not_numpy_global_state():
+    """Vectorised sampling derives from the caller's rng and leaves np.random untouched."""
+    import random
+
+    np = pytest.importorskip("numpy")
+    from monitor.anti_scraping import MouseSimulator, _sample_delays
+
+    np.random.seed(0)
+    global_state = np.random.get_state()[1].copy()
+
+    assert _sample_delays(1.0, 2.0, 8, random.Random(7)) == _sample_delays(1.0, 2.0, 8, random.Random(7))
+    assert MouseSimulator.generate_human_path((0, 0), (100, 200), steps=20, rng=random.Random(7)) == \
+        MouseSimulator.generate_human_path((0, 0), (100, 200), steps=20, rng=random.Random(7))
+    assert MouseSimulator.generate_scroll_pattern(1000, step_count=5, rng=random.Random(7)) == \
+        MouseSimulator.generate_scroll_pattern(1000, step_count=5, rng=random.Random(7))
+
+    manager = AntiScrapingManager(min_delay=1.0, max_delay=2.0)
+    manager._rng.seed(7)
+    first = manager.get_random_delay()
+    manager._rng.seed(7)
+    manager._delay_buffer = (None, deque())
+    assert manager.get_random_delay() == first
+
+    assert (np.random.get_state()[1] == global_state).all()
+
+
+def test_browser_profile_uses_slots_and_caches_dict():
+    """BrowserProfile has no per-instance __dict__; to_dict hands out copies of its cached mapping."""
+    profile = AntiScrapingManager().get_browser_profile()
+    assert not hasattr(profile, "__dict__")
+    data = profile.to_dict()
+    assert data["user_agent"] == profile.user_agent
+    data["user_agent"] = "mutated"
+    again = profile.to_dict()
+    assert again is not data
+    assert again["user_agent"] == profile.user_agent
+
+
+def test_homogeneous_mode_pins_standard_profile():
+    """Homogeneous managers always return the same canonical Windows/Chrome profile."""
+    manager = AntiScrapingManager(homogeneous=True)
+    profile = manager.get_browser_profile()
+    assert profile.platform == "Win32"
+    assert "Chrome/120" in profile.user_agent
+    for _ in range(50):
+        assert manager.get_browser_profile() is profile
+    assert manager.get_browser_profile(force_new=True) is profile
+    assert manager._request_count == 0
+
+
+def test_get_browser_profile_without_rotation_keeps_profile():
+    """With rotate_user_agent=False the profile only changes when forced."""
+    manager = AntiScrapingManager(rotate_user_agent=False)
+    profile = manager.get_browser_profile()
+    for _ in range(100):
+        assert manager.get_browser_profile() is profile
+    assert manager.get_browser_profile(force_new=True) is not profile
@@ -1,6 +1,9 @@
 import json
 import time
 import importlib
+
+import pytest
+
 import monitor.scheduler as scheduler_module
 import monitor.database as database_module
 import monitor.bitable_sync as bitable_sync_module
@@ -9,6 +12,13 @@ app_module = importlib.import_module("monitor.app")
 app = app_module.app
 
 
+@pytest.fixture(autouse=True)
+def _no_recent_results(monkeypatch):
+    """默认不命中库内最近结果，使 create_article 走爬取路径；每个测试从空的文章列表快取开始。"""
+    monkeypatch.setattr(app_module, "lookup_recent_results", lambda urls: {})
+    monkeypatch.setattr(app_module, "_articles_list_cache", {"data": None, "ts": 0.0, "generation": 0})
+
+
 def test_index_returns_200():
     """GET / returns 200."""
     client = app.test_client()
@@ -39,6 +49,112 @@ def test_get_articles_uses_envelope(monkeypatch):
     assert data["data"][0]["id"] == 1
 
 
+def test_get_articles_caches_list_and_honours_etag(monkeypatch):
+    calls = []
+
+    def fake_get_all_articles_with_latest_count():
+        calls.append(1)
+        return [{"id": len(calls), "title": "T", "site": "juejin", "url": "https://a1"}]
+
+    monkeypatch.setattr(app_module, "get_all_articles_with_latest_count", fake_get_all_articles_with_latest_count)
+    monkeypatch.setattr(app_module, "ARTICLES_LIST_CACHE_SECONDS", 60)
+    client = app.test_client()
+
+    first = client.get("/api/articles")
+    etag = first.headers["ETag"]
+    second = client.get("/api/articles", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.get_data() == b""
+    assert len(calls) == 1
+
+    # 后台任务写入（不经过请求）后快取失效，列表变化则 ETag 随之变化
+    database_module.mark_data_changed()
+    third = client.get("/api/articles", headers={"If-None-Match": etag})
+    assert third.status_code == 200
+    assert third.get_json()["data"][0]["id"] == 2
+    assert len(calls) == 2
+
+
+def test_get_articles_does_not_keep_result_that_raced_a_write(monkeypatch):
+    calls = []
+
+    def fake_get_all_articles_with_latest_count():
+        calls.append(1)
+        if len(calls) == 1:
+            # 查询进行中有写入提交：这次的结果不应被当作最新
+            database_module.mark_data_changed()
+        return [{"id": len(calls), "title": "T", "site": "juejin", "url": "https://a1"}]
+
+    monkeypatch.setattr(app_module, "get_all_articles_with_latest_count", fake_get_all_articles_with_latest_count)
+    monkeypatch.setattr(app_module, "ARTICLES_LIST_CACHE_SECONDS", 60)
+    client = app.test_client()
+
+    assert client.get("/api/articles").get_json()["data"][0]["id"] == 1
+    assert client.get("/api/articles").get_json()["data"][0]["id"] == 2
+    assert client.get("/api/articles").get_json()["data"][0]["id"] == 2
+    assert len(calls) == 2
+
+
+def test_json_responses_keep_utf8_and_key_order(monkeypatch):
+    monkeypatch.setattr(
+        app_module,
+        "get_all_articles_with_latest_count",
+        lambda: [{"url": "https://a1", "id": 1, "title": "标题"}],
+    )
+    resp = app.test_client().get("/api/articles")
+    body = resp.get_data()
+    assert "标题".encode("utf-8") in body
+    assert body.index(b'"url"') < body.index(b'"id"')
+
+
+def test_cors_headers_only_on_api_routes(monkeypatch):
+    monkeypatch.setattr(app_module, "get_all_articles_with_latest_count", lambda: [])
+    client = app.test_client()
+    headers = {"Origin": "http://example.com"}
+
+    api_resp = client.get("/api/articles", headers=headers)
+    assert api_resp.headers.get("Access-Control-Allow-Origin") == "http://example.com"
+
+    page_resp = client.get("/", headers=headers)
+    assert "Access-Control-Allow-Origin" not in page_resp.headers
+
+
+def test_large_json_responses_are_gzipped_when_accepted(monkeypatch):
+    import gzip
+
+    articles = [{"id": i, "url": f"https://juejin.cn/post/{i}", "title": "标题"} for i in range(100)]
+    monkeypatch.setattr(app_module, "get_all_articles_with_latest_count", lambda: articles)
+    client = app.test_client()
+
+    resp = client.get("/api/articles", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers.get("Content-Encoding") == "gzip"
+    assert "Accept-Encoding" in resp.headers.get("Vary", "")
+    assert json.loads(gzip.decompress(resp.get_data()))["data"][99]["id"] == 99
+
+    plain = client.get("/api/articles")
+    assert "Content-Encoding" not in plain.headers
+    assert plain.get_json()["data"][0]["id"] == 0
+
+
+def test_small_json_responses_are_not_gzipped(monkeypatch):
+    monkeypatch.setattr(app_module, "get_all_articles_with_latest_count", lambda: [])
+    resp = app.test_client().get("/api/articles", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in resp.headers
+
+
+def test_streamed_csv_export_is_gzipped(monkeypatch):
+    import gzip
+
+    monkeypatch.setattr(
+        app_module,
+        "export_all_articles_csv",
+        lambda start, end: (iter([b"title,url\n", b"A,https://a\n"]), "all.csv"),
+    )
+    resp = app.test_client().get("/api/export/all-csv", headers={"Accept-Encoding": "gzip, br"})
+    assert resp.headers.get("Content-Encoding") == "gzip"
+    assert gzip.decompress(resp.get_data()) == b"title,url\nA,https://a\n"
+
+
 def test_create_article_rejects_invalid_url():
     client = app.test_client()
     resp = client.post(
@@ -63,6 +179,49 @@ def test_create_article_rejects_empty_url():
     assert resp.get_json()["error"] == "URL不能为空"
 
 
+def test_run_async_reuses_one_loop_and_keeps_log_context():
+    import asyncio
+    from monitor.logging_context import get_log_context, set_log_context, reset_log_context
+
+    async def probe():
+        return asyncio.get_running_loop(), get_log_context().get("request_id")
+
+    token = set_log_context(request_id="req-12345678")
+    try:
+        loop1, rid = app_module._run_async(probe())
+    finally:
+        reset_log_context(token)
+    loop2, _ = app_module._run_async(probe())
+
+    assert loop1 is loop2
+    assert loop1.is_running()
+    assert rid == "req-12345678"
+
+
+def test_create_article_returns_recent_result_without_crawling(monkeypatch):
+    async def fail_crawl(url):
+        raise AssertionError("should not crawl")
+
+    cached = {
+        "url": "https://juejin.cn/post/1",
+        "success": True,
+        "cached": True,
+        "data": {"id": 3, "title": "T", "site": "juejin", "read_count": 50, "initial_count": 50},
+    }
+    monkeypatch.setattr(app_module, "lookup_recent_results", lambda urls: {urls[0]: cached})
+    monkeypatch.setattr(app_module, "crawl_single_url_for_result", fail_crawl)
+    client = app.test_client()
+    resp = client.post(
+        "/api/articles",
+        data=json.dumps({"url": "https://juejin.cn/post/1"}),
+        content_type="application/json",
+    )
+    assert resp.status_code == 200
+    data = resp.get_json()["data"]
+    assert data["id"] == 3
+    assert data["initial_count"] == 50
+
+
 def test_create_article_rejects_platform_not_allowed(monkeypatch):
     async def fake_crawl_single(url):
         return {
@@ -165,27 +324,59 @@ def test_create_article_success(monkeypatch):
     assert data["data"]["initial_count"] == 42
 
 
-def test_batch_value_error_returns_400(monkeypatch):
-    async def raise_value_error(urls):
-        raise ValueError("bad")
-    monkeypatch.setattr(app_module, "_process_urls_sync", raise_value_error)
+class _FakeBatchTM:
+    """Minimal TaskManager stand-in for /api/articles/batch."""
+
+    def __init__(self, finished=True, status="completed", results=None):
+        self.finished = finished
+        self.status = status
+        self.results = results
+        self.submitted = []
+        self.wait_timeouts = []
+
+    def submit_task(self, func, urls):
+        self.submitted.append(urls)
+        return "fake-task-id-123"
+
+    def wait_for_task(self, task_id, timeout=None):
+        self.wait_timeouts.append(timeout)
+        return self.finished
+
+    def get_task(self, task_id):
+        return {"id": task_id, "status": self.status, "error": "boom" if self.status == "failed" else None}
+
+    def get_task_results(self, task_id):
+        return self.results
+
+
+def _use_batch_tm(monkeypatch, tm):
+    import monitor.task_manager as task_manager_module
+    monkeypatch.setattr(task_manager_module, "get_task_manager", lambda: tm)
+    return tm
+
+
+def test_batch_wait_returns_task_results(monkeypatch):
+    """?wait=1 waits on the submitted task and returns its results."""
+    tm = _use_batch_tm(monkeypatch, _FakeBatchTM(results=[{"success": True, "data": {"id": 1}}]))
     client = app.test_client()
     resp = client.post(
-        "/api/articles/batch",
+        "/api/articles/batch?wait=1",
         data=json.dumps({"urls": ["https://juejin.cn/post/1"]}),
         content_type="application/json",
     )
-    assert resp.status_code == 400
-    assert "參數錯誤" in resp.get_json()["error"]
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data["success"] is True
+    assert data["task_id"] == "fake-task-id-123"
+    assert len(data["results"]) == 1
+    assert tm.wait_timeouts == [app_module.BATCH_WAIT_TIMEOUT_SECONDS]
 
 
-def test_batch_exception_returns_500(monkeypatch):
-    async def raise_runtime(urls):
-        raise RuntimeError("fail")
-    monkeypatch.setattr(app_module, "_process_urls_sync", raise_runtime)
+def test_batch_wait_failed_task_returns_500(monkeypatch):
+    _use_batch_tm(monkeypatch, _FakeBatchTM(status="failed"))
     client = app.test_client()
     resp = client.post(
-        "/api/articles/batch",
+        "/api/articles/batch?wait=1",
         data=json.dumps({"urls": ["https://juejin.cn/post/1"]}),
         content_type="application/json",
     )
@@ -194,9 +385,21 @@ def test_batch_exception_returns_500(monkeypatch):
     assert resp.get_json()["error"] == "服务器内部错误，请稍后重试"
 
 
+def test_batch_wait_timeout_falls_back_to_202(monkeypatch):
+    _use_batch_tm(monkeypatch, _FakeBatchTM(finished=False))
+    client = app.test_client()
+    resp = client.post(
+        "/api/articles/batch?wait=1",
+        data=json.dumps({"urls": ["https://juejin.cn/post/1"]}),
+        content_type="application/json",
+    )
+    assert resp.status_code == 202
+    assert resp.get_json()["status_url"] == "/api/tasks/fake-task-id-123"
+
+
 def test_settings_get_and_update(monkeypatch):
     # GET: 讀取設定
-    monkeypatch.setattr(app_module, "get_setting", lambda key, default=None: "6")
+    monkeypatch.setattr(app_module, "get_cached_setting", lambda key, default=None: "6")
 
     client = app.test_client()
     resp = client.get("/api/settings")
@@ -244,41 +447,50 @@ def test_batch_empty_urls_returns_400():
     assert data["success"] is False
 
 
-def test_batch_small_sync_success(monkeypatch):
-    """POST /api/articles/batch with <=5 URLs uses sync path and returns results."""
-    results = [{"success": True, "data": {"id": 1, "initial_count": 10}}]
-
-    async def fake_sync(urls):
-        return results
-
-    monkeypatch.setattr(app_module, "_process_urls_sync", fake_sync)
+def test_batch_small_returns_202_task_id(monkeypatch):
+    """POST /api/articles/batch with <=5 URLs also goes through the task queue."""
+    tm = _use_batch_tm(monkeypatch, _FakeBatchTM())
     client = app.test_client()
     resp = client.post(
         "/api/articles/batch",
         data=json.dumps({"urls": ["https://juejin.cn/post/1"]}),
         content_type="application/json",
     )
-    assert resp.status_code == 200
+    assert resp.status_code == 202
     data = resp.get_json()
     assert data["success"] is True
-    assert "results" in data
-    assert len(data["results"]) == 1
+    assert data["task_id"] == "fake-task-id-123"
+    assert "results" not in data
+    assert tm.wait_timeouts == []
+
+
+def test_batch_dedupes_urls_preserving_order(monkeypatch):
+    tm = _use_batch_tm(monkeypatch, _FakeBatchTM())
+    client = app.test_client()
+    client.post(
+        "/api/articles/batch",
+        data=json.dumps({"urls": [
+            "https://juejin.cn/post/2",
+            " https://juejin.cn/spost/1 ",
+            "",
+            "https://juejin.cn/post/2",
+            "https://juejin.cn/post/1",
+        ]}),
+        content_type="application/json",
+    )
+    assert tm.submitted == [["https://juejin.cn/post/2", "https://juejin.cn/post/1"]]
 
 
 def test_batch_large_returns_task_id(monkeypatch):
     """POST /api/articles/batch with >5 URLs returns task_id."""
-    class FakeTM:
-        def submit_task(self, func, urls):
-            return "fake-task-id-123"
-    import monitor.task_manager as task_manager_module
-    monkeypatch.setattr(task_manager_module, "get_task_manager", lambda: FakeTM())
+    _use_batch_tm(monkeypatch, _FakeBatchTM())
     client = app.test_client()
     resp = client.post(
         "/api/articles/batch",
         data=json.dumps({"urls": ["https://a.com/1", "https://a.com/2", "https://a.com/3", "https://a.com/4", "https://a.com/5", "https://a.com/6"]}),
         content_type="application/json",
     )
-    assert resp.status_code == 200
+    assert resp.status_code == 202
     data = resp.get_json()
     assert data["success"] is True
     assert data.get("task_id") == "fake-task-id-123"
@@ -374,6 +586,28 @@ def test_get_statistics_with_group_by_hour(monkeypatch):
     data = resp.get_json()
     assert data["success"] is True
     assert len(data["data"]["dates"]) == 24
+    assert data["data"]["dates"][0] == "2024-01-01 00:00:00"
+    assert data["data"]["dates"][-1] == "2024-01-01 23:00:00"
+
+
+def test_get_statistics_with_date_range():
+    """Custom start/end range yields one entry per day, inclusive."""
+    client = app.test_client()
+    resp = client.get("/api/statistics?start_date=2024-02-27&end_date=2024-03-02")
+    assert resp.status_code == 200
+    data = resp.get_json()["data"]
+    assert data["dates"] == ["2024-02-27", "2024-02-28", "2024-02-29", "2024-03-01", "2024-03-02"]
+    assert data["date_range"] == {"start": "2024-02-27", "end": "2024-03-02"}
+
+
+def test_get_statistics_days_ends_today():
+    from datetime import datetime
+
+    client = app.test_client()
+    resp = client.get("/api/statistics?days=3")
+    dates = resp.get_json()["data"]["dates"]
+    assert len(dates) == 3
+    assert dates[-1] == datetime.now().strftime("%Y-%m-%d")
 
 
 def test_get_crawl_progress_returns_200(monkeypatch):
@@ -482,6 +716,36 @@ def test_get_failures_returns_200(monkeypatch):
     assert "stats" in data["data"]
 
 
+def test_manual_crawl_coalesces_while_running(monkeypatch):
+    """POST /api/crawl while a crawl is running does not start another one."""
+    import threading
+    import monitor.crawler as crawler_module
+
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fake_crawl_all_sync():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+
+    monkeypatch.setattr(crawler_module, "crawl_all_sync", fake_crawl_all_sync)
+    client = app.test_client()
+    try:
+        assert client.post("/api/crawl").get_json()["message"] == "爬取任务已启动"
+        assert started.wait(5)
+        resp = client.post("/api/crawl")
+        assert resp.status_code == 200
+        assert resp.get_json()["message"] == "爬取任务已在运行"
+        monkeypatch.setattr(database_module, "get_article_by_id", lambda id: {"id": id})
+        assert client.post("/api/failures/retry/1").get_json()["success"] is True
+    finally:
+        release.set()
+        app_module._crawl_future.result(5)
+    assert calls == [1]
+
+
 def test_retry_failure_404(monkeypatch):
     """POST /api/failures/retry/<id> returns 404 when article not found."""
     monkeypatch.setattr(database_module, "get_article_by_id", lambda id: None)
@@ -514,7 +778,7 @@ def test_export_csv_400_when_no_articles(monkeypatch):
 
 def test_export_csv_200(monkeypatch):
     """POST /api/export/csv returns CSV response."""
-    monkeypatch.setattr(app_module, "export_selected_articles_csv", lambda ids, start, end: (b"title,url\nA,https://a", "export.csv"))
+    monkeypatch.setattr(app_module, "export_selected_articles_csv", lambda ids, start, end: (iter([b"title,url\n", b"A,https://a"]), "export.csv"))
     client = app.test_client()
     resp = client.post(
         "/api/export/csv",
@@ -523,21 +787,22 @@ def test_export_csv_200(monkeypatch):
     )
     assert resp.status_code == 200
     assert "text/csv" in resp.content_type or "csv" in resp.content_type.lower()
+    assert resp.get_data() == b"title,url\nA,https://a"
 
 
 def test_export_all_csv_200(monkeypatch):
     """GET /api/export/all-csv returns CSV."""
-    monkeypatch.setattr(app_module, "export_all_articles_csv", lambda start, end: (b"title,url\n", "all.csv"))
+    monkeypatch.setattr(app_module, "export_all_articles_csv", lambda start, end: (iter([b"title,url\n"]), "all.csv"))
     client = app.test_client()
     resp = client.get("/api/export/all-csv")
     assert resp.status_code == 200
 
 
 def test_get_settings_exception_returns_500(monkeypatch):
-    """GET /api/settings returns 500 when get_setting raises."""
+    """GET /api/settings returns 500 when get_cached_setting raises."""
     def raise_err(key, default=None):
         raise RuntimeError("db error")
-    monkeypatch.setattr(app_module, "get_setting", raise_err)
+    monkeypatch.setattr(app_module, "get_cached_setting", raise_err)
     client = app.test_client()
     resp = client.get("/api/settings")
     assert resp.status_code == 500
@@ -38,6 +38,16 @@ def test_get_all_articles(temp_db):
     assert all("url" in a and "title" in a for a in all_)
 
 
+def test_get_articles_by_ids(temp_db):
+    """get_articles_by_ids returns only the requested existing articles keyed by id."""
+    a1 = article_repo.add_article("https://b.com/1", "B1", "juejin")
+    article_repo.add_article("https://b.com/2", "B2", "csdn")
+    found = article_repo.get_articles_by_ids([a1, 99999])
+    assert list(found) == [a1]
+    assert found[a1]["title"] == "B1"
+    assert article_repo.get_articles_by_ids([]) == {}
+
+
 def test_update_article_status(temp_db):
     """update_article_status sets last_status and last_error."""
     aid = article_repo.add_article("https://e.com/1", "E1", "juejin")
@@ -96,6 +106,39 @@ def test_add_articles_batch_duplicate_url_returns_existing_id(temp_db):
     assert ids[0] == ids[1] or article_repo.get_article_by_id(ids[0])["url"] == "https://dup2.com/1"
 
 
+def test_add_articles_batch_chunks_keep_input_order(temp_db, monkeypatch):
+    """add_articles_batch splits multi-row inserts into chunks; ids stay aligned with input, repeats reuse ids."""
+    monkeypatch.setattr(article_repo, "ARTICLE_INSERT_CHUNK_SIZE", 2)
+    existing = article_repo.add_article("https://chunk.com/0", "Old", "juejin")
+    batch = [
+        ("https://chunk.com/1", "C1", "juejin"),
+        ("https://chunk.com/0", "Again", "juejin"),
+        ("https://chunk.com/2", "C2", "csdn"),
+        ("https://chunk.com/1", "C1 again", "juejin"),
+        ("https://chunk.com/3", "C3", "csdn"),
+    ]
+    ids = article_repo.add_articles_batch(batch)
+    assert ids[1] == existing
+    assert ids[3] == ids[0]
+    assert [article_repo.get_article_by_id(aid)["url"] for aid in ids] == [url for url, _, _ in batch]
+    assert article_repo.get_article_by_id(existing)["title"] == "Old"
+
+
+def test_add_articles_with_read_counts(temp_db):
+    """add_articles_with_read_counts writes articles and initial counts together; duplicates reuse ids."""
+    from monitor.db import read_count_repo
+
+    existing = article_repo.add_article("https://combo.com/1", "First", "juejin")
+    ids = article_repo.add_articles_with_read_counts([
+        ("https://combo.com/1", "Again", "juejin", 5),
+        ("https://combo.com/2", "New", "csdn", 7),
+    ])
+    assert ids[0] == existing
+    assert article_repo.get_article_by_id(ids[1])["title"] == "New"
+    assert read_count_repo.get_latest_read_count(ids[0])["count"] == 5
+    assert read_count_repo.get_latest_read_count(ids[1])["count"] == 7
+    assert article_repo.add_articles_with_read_counts([]) == []
+
 def test_add_article_duplicate_url_returns_existing_id(temp_db):
     """Adding same url again returns existing article id (no duplicate)."""
     url = "https://dup.com/1"
@@ -143,3 +186,52 @@ def test_get_all_articles_with_latest_count(temp_db):
     assert len(rows) == 1
     assert rows[0].get("latest_count") == 100
     assert rows[0].get("latest_timestamp") is not None
+
+
+def test_get_recent_articles_by_urls(temp_db):
+    """Only articles with a fresh, non-placeholder latest read count are returned."""
+    from monitor.db import read_count_repo
+
+    ok_id = article_repo.add_article("https://recent.com/ok", title="OK", site="juejin")
+    read_count_repo.add_read_count(ok_id, 5)
+    read_count_repo.add_read_count(ok_id, 8)
+    placeholder_id = article_repo.add_article("https://recent.com/failed", site="juejin")
+    read_count_repo.add_read_count(placeholder_id, 0)
+    article_repo.add_article("https://recent.com/none", title="N", site="juejin")
+    urls = ["https://recent.com/ok", "https://recent.com/failed", "https://recent.com/none"]
+
+    result = article_repo.get_recent_articles_by_urls(urls, 3600)
+    assert set(result) == {"https://recent.com/ok"}
+    assert result["https://recent.com/ok"]["id"] == ok_id
+    assert result["https://recent.com/ok"]["latest_count"] == 8
+
+    article_repo.update_article_status(ok_id, "ERROR", "boom")
+    assert article_repo.get_recent_articles_by_urls(urls, 3600) == {}
+    assert article_repo.get_recent_articles_by_urls(urls, 0) == {}
+
+
+def test_get_existing_articles_by_urls(temp_db):
+    """Existing titled articles are returned with their latest count; failed or placeholder rows stay retryable."""
+    from monitor.db import read_count_repo
+
+    ok_id = article_repo.add_article("https://exists.com/ok", title="OK", site="juejin")
+    read_count_repo.add_read_counts_batch([(ok_id, 3), (ok_id, 8)])
+    uncounted_id = article_repo.add_article("https://exists.com/uncounted", title="U", site="juejin")
+    article_repo.add_article("https://exists.com/placeholder", site="juejin")
+    failed_id = article_repo.add_article("https://exists.com/failed", title="F", site="juejin")
+    article_repo.update_article_status(failed_id, "ERROR", "boom")
+    urls = [
+        "https://exists.com/ok",
+        "https://exists.com/placeholder",
+        "https://exists.com/failed",
+        "https://exists.com/missing",
+        "https://exists.com/uncounted",
+    ]
+
+    result = article_repo.get_existing_articles_by_urls(urls)
+    assert set(result) == {"https://exists.com/ok", "https://exists.com/uncounted"}
+    assert result["https://exists.com/ok"]["id"] == ok_id
+    assert result["https://exists.com/ok"]["latest_count"] == 8
+    assert result["https://exists.com/uncounted"]["id"] == uncounted_id
+    assert result["https://exists.com/uncounted"]["latest_count"] is None
+    assert article_repo.get_existing_articles_by_urls([]) == {}
@@ -1,10 +1,30 @@
 import asyncio
+import sqlite3
 import time
 from typing import List
 
+import pytest
+
 import monitor.article_service as article_service
 
 
+@pytest.fixture(autouse=True)
+def _no_recent_results(monkeypatch):
+    """默认不命中库内最近结果，避免单元测试访问真实数据库。"""
+    monkeypatch.setattr(article_service, "get_recent_articles_by_urls", lambda urls, max_age_seconds: {})
+    monkeypatch.setattr(article_service, "get_existing_articles_by_urls", lambda urls: {})
+
+    # 合并写入默认拆回 add_articles_batch + add_read_counts_batch 两步，沿用各测试对两步的替身
+    def split_add_articles_with_read_counts(rows):
+        article_ids = article_service.add_articles_batch([row[:3] for row in rows])
+        article_service.add_read_counts_batch(
+            [(article_id, row[3]) for article_id, row in zip(article_ids, rows)]
+        )
+        return article_ids
+
+    monkeypatch.setattr(article_service, "add_articles_with_read_counts", split_add_articles_with_read_counts)
+
+
 class DummyCrawler:
     async def __aexit__(self, exc_type, exc, tb):
         return False
@@ -85,6 +105,9 @@ def test_process_urls_async_updates_task_results(monkeypatch):
         def get_task(self, task_id):
             return self.tasks.get(task_id)
 
+        def set_task_result(self, task_id, results):
+            self.tasks[task_id]["results"] = results
+
     dummy_task_manager = DummyTaskManager()
     task_id = "task-1"
     dummy_task_manager.tasks[task_id] = {
@@ -96,7 +119,7 @@ def test_process_urls_async_updates_task_results(monkeypatch):
 
     # 重用前一個測試的行為，但簡化為總是成功
     monkeypatch.setattr(article_service, "get_task_manager", lambda: dummy_task_manager)
-    async def fake_process_batch(urls, browser_pool):
+    async def fake_process_batch(urls, browser_pool, domain_controller=None):
         return [{"url": u, "success": True, "data": {"id": i + 1}} for i, u in enumerate(urls)]
 
     monkeypatch.setattr(article_service, "_process_batch", fake_process_batch)
@@ -113,6 +136,30 @@ def test_process_urls_async_updates_task_results(monkeypatch):
     assert len(task["results"]) == len(urls)
 
 
+def test_process_urls_async_progress_counts_accumulate(monkeypatch):
+    updates = []
+
+    class DummyTaskManager:
+        def update_task_progress(self, task_id, progress):
+            updates.append(progress)
+
+        def set_task_result(self, task_id, results):
+            pass
+
+    async def fake_process_batch(urls, browser_pool, domain_controller=None):
+        return [{"url": u, "success": not u.endswith("bad")} for u in urls]
+
+    monkeypatch.setattr(article_service, "get_task_manager", lambda: DummyTaskManager())
+    monkeypatch.setattr(article_service, "_process_batch", fake_process_batch)
+    monkeypatch.setattr(article_service, "get_browser_pool", lambda: DummyBrowserPool())
+    monkeypatch.setattr(article_service, "BATCH_PROCESS_SIZE", 2)
+
+    urls = ["https://a/1", "https://a/bad", "https://a/2", "https://b/bad", "https://a/3"]
+    run(article_service._process_urls_async("task-2", urls))
+
+    assert [(u["processed"], u["success"], u["failed"]) for u in updates] == [(2, 1, 1), (4, 2, 2), (5, 3, 2)]
+
+
 def test_crawl_urls_for_results_return_structure(monkeypatch):
     """crawl_urls_for_results 返回结构含 url/success/data.read_count 或 error，不写库。"""
     dummy_pool = DummyBrowserPool()
@@ -178,10 +225,171 @@ def test_crawl_single_url_for_result_parse_failed_when_read_count_none(monkeypat
     assert result["error_code"] == "parse_failed"
 
 
+def test_process_urls_sync_limits_per_domain_concurrency(monkeypatch):
+    active = {"now": 0, "peak": 0}
+
+    async def fake_extract_article_info(url, crawler):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        return {"title": "t", "read_count": 1}
+
+    monkeypatch.setattr(article_service, "get_browser_pool", lambda: DummyBrowserPool())
+    monkeypatch.setattr(article_service, "extract_article_info", fake_extract_article_info)
+    monkeypatch.setattr(article_service, "validate_and_normalize_url", lambda url: (True, url, "juejin"))
+    monkeypatch.setattr(article_service, "is_platform_allowed", lambda site: True)
+    monkeypatch.setattr(article_service, "add_articles_batch", lambda articles: list(range(1, len(articles) + 1)))
+    monkeypatch.setattr(article_service, "add_read_counts_batch", lambda records: None)
+    monkeypatch.setattr(article_service, "CRAWL_CONCURRENCY_PER_DOMAIN", 1)
+
+    urls = [f"https://juejin.cn/post/{i}" for i in range(4)]
+    results = run(article_service._process_urls_sync(urls))
+
+    assert all(r["success"] for r in results)
+    assert active["peak"] == 1
+
+
+def test_process_urls_sync_reuses_recent_results(monkeypatch):
+    crawled = []
+    inserted = []
+
+    async def fake_extract_article_info(url, crawler):
+        crawled.append(url)
+        return {"title": "fresh", "read_count": 5}
+
+    def fake_recent(urls, max_age_seconds):
+        return {
+            "https://juejin.cn/post/old": {
+                "id": 7, "url": "https://juejin.cn/post/old", "title": "old", "site": "juejin",
+                "latest_count": 99, "latest_timestamp": "2024-01-01 00:00:00",
+            }
+        }
+
+    def fake_add_articles_batch(articles):
+        inserted.extend(articles)
+        return [100 + i for i in range(len(articles))]
+
+    monkeypatch.setattr(article_service, "get_browser_pool", lambda: DummyBrowserPool())
+    monkeypatch.setattr(article_service, "extract_article_info", fake_extract_article_info)
+    monkeypatch.setattr(article_service, "get_recent_articles_by_urls", fake_recent)
+    monkeypatch.setattr(article_service, "add_articles_batch", fake_add_articles_batch)
+    monkeypatch.setattr(article_service, "add_read_counts_batch", lambda records: None)
+    monkeypatch.setattr(article_service, "ARTICLE_ADD_CACHE_SECONDS", 3600)
+
+    urls = ["https://juejin.cn/post/new", "https://juejin.cn/post/old"]
+    results = run(article_service._process_urls_sync(urls))
+
+    assert crawled == ["https://juejin.cn/post/new"]
+    assert [a[0] for a in inserted] == ["https://juejin.cn/post/new"]
+    assert results[0]["data"]["id"] == 100
+    assert results[1]["cached"] is True
+    assert results[1]["existing"] is True
+    assert results[1]["data"]["id"] == 7
+    assert results[1]["data"]["initial_count"] == 99
+
+
+def test_process_batch_skips_crawl_for_existing_articles(monkeypatch):
+    crawled = []
+    inserted = []
+
+    async def fake_extract_article_info(url, crawler):
+        crawled.append(url)
+        return {"title": "fresh", "read_count": 5}
+
+    def fake_add_articles_batch(articles):
+        inserted.extend(articles)
+        return [100 + i for i in range(len(articles))]
+
+    def fake_existing(urls):
+        return {
+            "https://juejin.cn/post/dup": {
+                "id": 7, "url": "https://juejin.cn/post/dup", "title": "old", "site": "juejin",
+                "latest_count": 99, "latest_timestamp": "2020-01-01 00:00:00",
+            }
+        }
+
+    monkeypatch.setattr(article_service, "get_browser_pool", lambda: DummyBrowserPool())
+    monkeypatch.setattr(article_service, "extract_article_info", fake_extract_article_info)
+    monkeypatch.setattr(article_service, "get_existing_articles_by_urls", fake_existing)
+    monkeypatch.setattr(article_service, "add_articles_batch", fake_add_articles_batch)
+    monkeypatch.setattr(article_service, "add_read_counts_batch", lambda records: None)
+
+    urls = ["https://juejin.cn/post/dup", "https://juejin.cn/post/new"]
+    results = run(article_service._process_urls_sync(urls))
+
+    assert crawled == ["https://juejin.cn/post/new"]
+    assert [a[0] for a in inserted] == ["https://juejin.cn/post/new"]
+    # 早已跟踪（超出 ARTICLE_ADD_CACHE_SECONDS）的文章与最近爬取过的同一约定：成功并返回库内数据
+    assert results[0]["success"] is True
+    assert results[0]["existing"] is True
+    assert "cached" not in results[0]
+    assert results[0]["data"] == {
+        "id": 7, "title": "old", "site": "juejin", "read_count": 99, "initial_count": 99,
+    }
+    assert results[1]["data"]["id"] == 100
+
+
+def test_process_batch_falls_back_to_separate_writes(monkeypatch):
+    written_counts = []
+
+    async def fake_extract_article_info(url, crawler):
+        return {"title": "t", "read_count": 5}
+
+    def failing_combined(rows):
+        raise RuntimeError("db locked")
+
+    monkeypatch.setattr(article_service, "get_browser_pool", lambda: DummyBrowserPool())
+    monkeypatch.setattr(article_service, "extract_article_info", fake_extract_article_info)
+    monkeypatch.setattr(article_service, "add_articles_with_read_counts", failing_combined)
+    monkeypatch.setattr(article_service, "add_articles_batch", lambda articles: [100 + i for i in range(len(articles))])
+    monkeypatch.setattr(article_service, "add_read_counts_batch", written_counts.extend)
+
+    urls = ["https://juejin.cn/post/a", "https://juejin.cn/post/b"]
+    results = run(article_service._process_urls_sync(urls))
+
+    assert [r["data"]["id"] for r in results] == [100, 101]
+    assert written_counts == [(100, 5), (101, 5)]
+
+
+def test_add_read_counts_bisect_skips_only_bad_records(monkeypatch):
+    written = []
+    calls = []
+
+    def fake_add_read_counts_batch(records):
+        calls.append(list(records))
+        if any(article_id == 3 for article_id, _ in records):
+            raise sqlite3.IntegrityError("FOREIGN KEY constraint failed")
+        written.extend(records)
+
+    monkeypatch.setattr(article_service, "add_read_counts_batch", fake_add_read_counts_batch)
+
+    records = [(1, 10), (2, 20), (3, 30), (4, 40)]
+    assert article_service._add_read_counts_bisect(records) == 3
+    assert sorted(written) == [(1, 10), (2, 20), (4, 40)]
+    # 整批 1 次 + 两个半批 + 坏半批再拆成两条
+    assert len(calls) == 5
+
+
+def test_add_read_counts_bisect_reraises_database_wide_errors(monkeypatch):
+    calls = []
+
+    def locked_add_read_counts_batch(records):
+        calls.append(list(records))
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(article_service, "add_read_counts_batch", locked_add_read_counts_batch)
+
+    with pytest.raises(sqlite3.OperationalError):
+        article_service._add_read_counts_bisect([(1, 10), (2, 20), (3, 30), (4, 40)])
+    # 不拆分重试
+    assert len(calls) == 1
+
+
 def test_crawl_urls_for_results_retries_retryable_failures_once(monkeypatch):
     calls = {}
 
-    async def fake_crawl_single(url, browser_pool=None, domain_controller=None):
+    async def fake_crawl_single(url, browser_pool=None, domain_controller=None, crawler_lease=None, prechecked=None):
         calls[url] = calls.get(url, 0) + 1
         if "post/retry" in url and calls[url] == 1:
             return {"url": url, "success": False, "error": "无法提取阅读数", "error_code": "parse_failed"}
@@ -202,7 +410,7 @@ def test_crawl_urls_for_results_retries_retryable_failures_once(monkeypatch):
 def test_crawl_urls_for_results_does_not_retry_when_extra_passes_zero(monkeypatch):
     calls = {}
 
-    async def fake_crawl_single(url, browser_pool=None, domain_controller=None):
+    async def fake_crawl_single(url, browser_pool=None, domain_controller=None, crawler_lease=None, prechecked=None):
         calls[url] = calls.get(url, 0) + 1
         if "post/retry" in url:
             return {"url": url, "success": False, "error": "无法提取阅读数", "error_code": "parse_failed"}
@@ -282,6 +490,199 @@ def test_crawl_urls_for_results_respects_domain_min_delay_with_concurrency(monke
     assert (ordered[-1] - ordered[0]) >= 0.04
 
 
+def test_overlapping_batches_share_concurrency_limit(monkeypatch):
+    active = 0
+    peak = 0
+
+    async def fake_crawl_single(url, browser_pool=None, domain_controller=None, crawler_lease=None, prechecked=None):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return {"url": url, "success": True, "data": {"title": "t", "site": "juejin", "read_count": 1}}
+
+    monkeypatch.setattr(article_service, "crawl_single_url_for_result", fake_crawl_single)
+    monkeypatch.setattr(article_service, "BATCH_PROCESS_CONCURRENCY", 2)
+
+    async def two_batches():
+        batch_a = [f"https://juejin.cn/post/a{i}" for i in range(4)]
+        batch_b = [f"https://juejin.cn/post/b{i}" for i in range(4)]
+        await asyncio.gather(
+            article_service._crawl_batch_for_results(batch_a, DummyBrowserPool()),
+            article_service._crawl_batch_for_results(batch_b, DummyBrowserPool()),
+        )
+
+    run(two_batches())
+    assert peak == 2
+
+
+def test_crawl_batch_for_results_prechecks_before_queueing(monkeypatch):
+    crawled = []
+
+    async def fake_crawl_single(url, browser_pool=None, domain_controller=None, crawler_lease=None, prechecked=None):
+        crawled.append((url, prechecked))
+        return {"url": url, "success": True, "data": {"title": "t", "site": "juejin", "read_count": 1}}
+
+    monkeypatch.setattr(article_service, "crawl_single_url_for_result", fake_crawl_single)
+
+    urls = ["ftp://bad", "https://juejin.cn/post/1", "https://unknown.example/x"]
+    results = run(article_service._crawl_batch_for_results(urls, DummyBrowserPool()))
+
+    assert [r["error_code"] for r in (results[0], results[2])] == ["invalid_url", "platform_not_allowed"]
+    assert results[1]["success"] is True
+    assert crawled == [("https://juejin.cn/post/1", ("https://juejin.cn/post/1", "juejin"))]
+
+
+def test_crawl_batch_for_results_reuses_crawler_per_worker(monkeypatch):
+    dummy_pool = DummyBrowserPool()
+    released = []
+
+    async def fake_release(crawler):
+        released.append(crawler)
+
+    async def fake_extract(url, crawler):
+        if url.endswith("/bad"):
+            raise RuntimeError("page crashed")
+        return {"title": "t", "read_count": 1}
+
+    dummy_pool.release = fake_release
+    monkeypatch.setattr(article_service, "extract_article_info", fake_extract)
+    monkeypatch.setattr(article_service, "validate_and_normalize_url", lambda u: (True, u, "juejin"))
+    monkeypatch.setattr(article_service, "is_platform_allowed", lambda s: True)
+    monkeypatch.setattr(article_service, "BATCH_PROCESS_CONCURRENCY", 2)
+
+    urls = [f"https://juejin.cn/post/{i}" for i in range(6)]
+    results = run(article_service._crawl_batch_for_results(urls, dummy_pool))
+    assert all(r["success"] for r in results)
+    # 两个 worker 各获取一次浏览器，处理完队列后各归还一次
+    assert len(dummy_pool.acquired) == 2
+    assert sorted(map(id, released)) == sorted(map(id, dummy_pool.acquired))
+
+    # 爬取出错后归还该实例，后续 URL 重新获取
+    monkeypatch.setattr(article_service, "BATCH_PROCESS_CONCURRENCY", 1)
+    dummy_pool.acquired.clear()
+    results = run(article_service._crawl_batch_for_results(
+        ["https://juejin.cn/post/bad", "https://juejin.cn/post/ok"], dummy_pool
+    ))
+    assert [r["success"] for r in results] == [False, True]
+    assert len(dummy_pool.acquired) == 2
+
+
+def test_crawl_batch_for_results_shares_one_fallback_crawler(monkeypatch):
+    created = []
+    closed = []
+
+    class FallbackCrawler:
+        async def __aexit__(self, exc_type, exc, tb):
+            closed.append(self)
+            return False
+
+    class FullPool(DummyBrowserPool):
+        async def acquire(self):
+            return None
+
+    async def fake_create_shared_crawler():
+        crawler = FallbackCrawler()
+        created.append(crawler)
+        return crawler
+
+    async def fake_extract(url, crawler):
+        await asyncio.sleep(0.01)
+        return {"title": "t", "read_count": 1}
+
+    monkeypatch.setattr(article_service, "create_shared_crawler", fake_create_shared_crawler)
+    monkeypatch.setattr(article_service, "extract_article_info", fake_extract)
+    monkeypatch.setattr(article_service, "BATCH_PROCESS_CONCURRENCY", 3)
+
+    urls = [f"https://juejin.cn/post/{i}" for i in range(6)]
+    results = run(article_service._crawl_batch_for_results(urls, FullPool()))
+
+    assert all(r["success"] for r in results)
+    assert len(created) == 1
+    assert closed == created
+
+
+def test_crawl_batch_for_results_replaces_failed_fallback_crawler(monkeypatch):
+    created = []
+    closed = []
+
+    class FallbackCrawler:
+        async def __aexit__(self, exc_type, exc, tb):
+            closed.append(self)
+            return False
+
+    class FullPool(DummyBrowserPool):
+        async def acquire(self):
+            return None
+
+    async def fake_create_shared_crawler():
+        crawler = FallbackCrawler()
+        created.append(crawler)
+        return crawler
+
+    used = []
+
+    async def fake_extract(url, crawler):
+        used.append(crawler)
+        if url.endswith("/bad"):
+            raise RuntimeError("browser crashed")
+        return {"title": "t", "read_count": 1}
+
+    monkeypatch.setattr(article_service, "create_shared_crawler", fake_create_shared_crawler)
+    monkeypatch.setattr(article_service, "extract_article_info", fake_extract)
+    monkeypatch.setattr(article_service, "BATCH_PROCESS_CONCURRENCY", 1)
+
+    urls = ["https://juejin.cn/post/bad", "https://juejin.cn/post/ok"]
+    results = run(article_service._crawl_batch_for_results(urls, FullPool()))
+
+    assert [r["success"] for r in results] == [False, True]
+    # 出错的后备实例被关闭，第二个 URL 拿到新建的实例
+    assert len(created) == 2
+    assert used == created
+    assert closed == created
+
+
+def test_failed_fallback_crawler_stays_open_for_workers_still_using_it(monkeypatch):
+    created = []
+    closed = []
+
+    class FallbackCrawler:
+        async def __aexit__(self, exc_type, exc, tb):
+            closed.append(self)
+            return False
+
+    class FullPool(DummyBrowserPool):
+        async def acquire(self):
+            return None
+
+    async def fake_create_shared_crawler():
+        crawler = FallbackCrawler()
+        created.append(crawler)
+        return crawler
+
+    async def fake_extract(url, crawler):
+        if url.endswith("/bad"):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("browser crashed")
+        # 另一个 worker 出错退役该实例时，本 worker 仍在其上爬取，不能被关闭
+        await asyncio.sleep(0.05)
+        assert crawler not in closed
+        return {"title": "t", "read_count": 1}
+
+    monkeypatch.setattr(article_service, "create_shared_crawler", fake_create_shared_crawler)
+    monkeypatch.setattr(article_service, "extract_article_info", fake_extract)
+    monkeypatch.setattr(article_service, "BATCH_PROCESS_CONCURRENCY", 2)
+
+    urls = ["https://juejin.cn/post/bad", "https://juejin.cn/post/slow"]
+    results = run(article_service._crawl_batch_for_results(urls, FullPool()))
+
+    assert [r["success"] for r in results] == [False, True]
+    assert len(created) == 1
+    # 退役的实例在最后一个租约归还后关闭，且只关闭一次
+    assert closed == created
+
+
 def test_crawl_single_url_for_result_timeout_returns_failure(monkeypatch):
     dummy_pool = DummyBrowserPool()
 
@@ -334,3 +735,41 @@ def test_crawl_single_url_timeout_includes_domain_semaphore_wait(monkeypatch):
     assert result["success"] is False
     assert result["error_code"] == "crawl_timeout"
 
+
+
+def test_interleave_order_by_host_round_robins_domains():
+    urls = [
+        "https://juejin.cn/post/1",
+        "https://juejin.cn/post/2",
+        "https://juejin.cn/post/3",
+        "https://blog.csdn.net/a/1",
+        "https://www.cnblogs.com/x/1",
+        "https://blog.csdn.net/a/2",
+    ]
+    assert article_service._interleave_order_by_host(urls) == [0, 3, 4, 1, 5, 2]
+    assert article_service._interleave_order_by_host([]) == []
+
+
+def test_crawl_urls_for_results_interleaves_hosts_but_keeps_result_order(monkeypatch):
+    dummy_pool = DummyBrowserPool()
+    crawled = []
+
+    async def fake_extract(url, crawler):
+        crawled.append(url)
+        return {"title": "t", "read_count": len(url)}
+
+    monkeypatch.setattr(article_service, "get_browser_pool", lambda: dummy_pool)
+    monkeypatch.setattr(article_service, "extract_article_info", fake_extract)
+    monkeypatch.setattr(article_service, "create_shared_crawler", lambda: DummyCrawler())
+    monkeypatch.setattr(article_service, "validate_and_normalize_url", lambda u: (True, u, "juejin"))
+    monkeypatch.setattr(article_service, "is_platform_allowed", lambda s: True)
+    monkeypatch.setattr(article_service, "CRAWL_INTERLEAVE_BY_SITE", True)
+    monkeypatch.setattr(article_service, "BATCH_PROCESS_SIZE", 2)
+
+    urls = ["https://a.cn/1", "https://a.cn/22", "https://b.cn/333", "https://b.cn/4444"]
+    results = run(article_service.crawl_urls_for_results(urls))
+
+    # 每批两条：第一批即覆盖两个域名
+    assert set(crawled[:2]) == {"https://a.cn/1", "https://b.cn/333"}
+    assert [r["url"] for r in results] == urls
+    assert [r["data"]["read_count"] for r in results] == [len(u) for u in urls]
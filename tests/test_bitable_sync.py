@@ -12,6 +12,11 @@ def test_extract_url_from_field():
     assert bitable_sync._extract_url_from_field(None) is None
     assert bitable_sync._extract_url_from_field({"link": "https://c.com"}) == "https://c.com"
     assert bitable_sync._extract_url_from_field([{"link": "https://d.com"}]) == "https://d.com"
+    assert bitable_sync._extract_url_from_field([" https://e.com "]) == "https://e.com"
+    assert bitable_sync._extract_url_from_field(["ftp://f.com"]) is None
+    assert bitable_sync._extract_url_from_field([]) is None
+    assert bitable_sync._extract_url_from_field([["https://g.com"]]) is None
+    assert bitable_sync._extract_url_from_field(123) is None
 
 
 def test_build_column_config():
@@ -40,8 +45,8 @@ def test_sync_from_bitable_no_records(monkeypatch):
     monkeypatch.setattr(bitable_sync, "FEISHU_APP_SECRET", "sec")
     monkeypatch.setattr(
         bitable_sync,
-        "list_all_bitable_records",
-        lambda *a, **k: [],
+        "iter_bitable_record_pages",
+        lambda *a, **k: [[]],
     )
     out = bitable_sync.sync_from_bitable(app_token="tok", table_id="tbl")
     assert out["success"] is True
@@ -64,12 +69,15 @@ def test_sync_from_bitable_crawl_and_write_back(monkeypatch):
     records = [
         {"record_id": "rec1", "fields": {"发布链接": "https://juejin.cn/post/1"}},
         {"record_id": "rec2", "fields": {"发布链接": "https://juejin.cn/post/2"}},
+        {"record_id": "rec3"},
     ]
-    monkeypatch.setattr(
-        bitable_sync,
-        "list_all_bitable_records",
-        lambda *a, **k: records,
-    )
+    page_kwargs = []
+
+    def fake_record_pages(*args, **kwargs):
+        page_kwargs.append(kwargs)
+        return [records]
+
+    monkeypatch.setattr(bitable_sync, "iter_bitable_record_pages", fake_record_pages)
 
     updates = []
 
@@ -93,6 +101,8 @@ def test_sync_from_bitable_crawl_and_write_back(monkeypatch):
     assert updates[0]["fields"].get("总阅读量") == 100
     assert updates[0]["fields"].get("失败原因") == ""
     assert updates[1]["fields"].get("总阅读量") == 101
+    # 只请求链接列的字段投影
+    assert page_kwargs == [{"field_names": ["发布链接"]}]
 
 
 async def _fake_crawl_mixed(urls):
@@ -109,7 +119,7 @@ def test_sync_from_bitable_crawl_failure_writes_error(monkeypatch):
         {"record_id": "r1", "fields": {"发布链接": "https://juejin.cn/p/1"}},
         {"record_id": "r2", "fields": {"发布链接": "https://other.com/p/2"}},
     ]
-    monkeypatch.setattr(bitable_sync, "list_all_bitable_records", lambda *a, **k: records)
+    monkeypatch.setattr(bitable_sync, "iter_bitable_record_pages", lambda *a, **k: [records])
     updates = []
 
     def capture_batch_update(app_token, table_id, records, **kwargs):
@@ -139,7 +149,7 @@ def test_sync_from_bitable_retries_parse_failed_and_succeeds(monkeypatch):
     monkeypatch.setattr(bitable_sync, "FEISHU_APP_SECRET", "sec")
 
     records = [{"record_id": "r1", "fields": {"发布链接": "https://juejin.cn/post/retry"}}]
-    monkeypatch.setattr(bitable_sync, "list_all_bitable_records", lambda *a, **k: records)
+    monkeypatch.setattr(bitable_sync, "iter_bitable_record_pages", lambda *a, **k: [records])
 
     updates = []
 
@@ -194,8 +204,8 @@ def test_sync_from_bitable_writeback_failure_raises_runtime_error(monkeypatch):
     monkeypatch.setattr(bitable_sync, "FEISHU_APP_SECRET", "sec")
     monkeypatch.setattr(
         bitable_sync,
-        "list_all_bitable_records",
-        lambda *a, **k: [{"record_id": "r1", "fields": {"发布链接": "https://juejin.cn/post/1"}}],
+        "iter_bitable_record_pages",
+        lambda *a, **k: [[{"record_id": "r1", "fields": {"发布链接": "https://juejin.cn/post/1"}}]],
     )
     monkeypatch.setattr(
         bitable_sync,
@@ -216,8 +226,8 @@ def test_sync_from_multiple_bitable_sources_keeps_table_isolation(monkeypatch):
     monkeypatch.setattr(bitable_sync, "FEISHU_APP_ID", "id")
     monkeypatch.setattr(bitable_sync, "FEISHU_APP_SECRET", "sec")
 
-    def fake_list_records(app_token, table_id):
-        return [{"record_id": f"{table_id}-r1", "fields": {"发布链接": "https://juejin.cn/post/1"}}]
+    def fake_record_pages(app_token, table_id, **kwargs):
+        yield [{"record_id": f"{table_id}-r1", "fields": {"发布链接": "https://juejin.cn/post/1"}}]
 
     crawled_urls = []
 
@@ -230,7 +240,7 @@ def test_sync_from_multiple_bitable_sources_keeps_table_isolation(monkeypatch):
     def fake_batch_update(app_token, table_id, records, **kwargs):
         updates[table_id] = records
 
-    monkeypatch.setattr(bitable_sync, "list_all_bitable_records", fake_list_records)
+    monkeypatch.setattr(bitable_sync, "iter_bitable_record_pages", fake_record_pages)
     monkeypatch.setattr(bitable_sync, "crawl_urls_for_results", fake_crawl)
     monkeypatch.setattr(bitable_sync, "batch_update_bitable_records", fake_batch_update)
 
@@ -247,6 +257,241 @@ def test_sync_from_multiple_bitable_sources_keeps_table_isolation(monkeypatch):
     assert len(out["tables"]) == 2
 
 
+def test_sync_from_multiple_bitable_sources_overlaps_fetch_with_crawl(monkeypatch):
+    import threading
+
+    monkeypatch.setattr(bitable_sync, "FEISHU_APP_ID", "id")
+    monkeypatch.setattr(bitable_sync, "FEISHU_APP_SECRET", "sec")
+    second_fetch_started = threading.Event()
+
+    def fake_record_pages(app_token, table_id, **kwargs):
+        if table_id == "table_2":
+            second_fetch_started.set()
+        yield [{"record_id": f"{table_id}-r1", "fields": {"发布链接": f"https://juejin.cn/post/{table_id}"}}]
+
+    overlapped = []
+
+    async def fake_crawl(urls, on_result=None, domain_controller=None):
+        if urls == ["https://juejin.cn/post/table_1"]:
+            # 第一张表的爬取进行中时，第二张表的拉取应已开始
+            for _ in range(200):
+                if second_fetch_started.is_set():
+                    break
+                await asyncio.sleep(0.01)
+            overlapped.append(second_fetch_started.is_set())
+        return [{"url": u, "success": True, "data": {"read_count": 7}} for u in urls]
+
+    updates = {}
+
+    def fake_batch_update(app_token, table_id, records, **kwargs):
+        updates[table_id] = records
+
+    monkeypatch.setattr(bitable_sync, "iter_bitable_record_pages", fake_record_pages)
+    monkeypatch.setattr(bitable_sync, "crawl_urls_for_results", fake_crawl)
+    monkeypatch.setattr(bitable_sync, "batch_update_bitable_records", fake_batch_update)
+
+    out = bitable_sync.sync_from_multiple_bitable_sources([
+        {"app_token": "tok", "table_id": "table_1"},
+        {"app_token": "tok"},
+        {"app_token": "tok", "table_id": "table_2"},
+    ], max_concurrency=1)
+
+    assert overlapped == [True]
+    assert out["updated"] == 2
+    assert [t["table_id"] for t in out["tables"]] == ["", "table_1", "table_2"]
+    assert updates["table_1"][0][1]["总阅读量"] == 7
+    assert updates["table_2"][0][1]["总阅读量"] == 7
+
+
+def test_sync_streams_pages_into_crawl(monkeypatch):
+    import threading
+
+    monkeypatch.setattr(bitable_sync, "FEISHU_APP_ID", "id")
+    monkeypatch.setattr(bitable_sync, "FEISHU_APP_SECRET", "sec")
+    first_page_crawled = threading.Event()
+    crawl_started_before_second_page = []
+
+    def fake_record_pages(app_token, table_id, **kwargs):
+        yield [
+            {"record_id": "r1", "fields": {"发布链接": "https://juejin.cn/post/1"}},
+            {"record_id": "r2", "fields": {"发布链接": "https://juejin.cn/post/1"}},
+        ]
+        # 第一页的爬取应在拉取第二页之前已开始
+        crawl_started_before_second_page.append(first_page_crawled.wait(timeout=2))
+        yield [
+            {"record_id": "r3", "fields": {"发布链接": "https://juejin.cn/post/1"}},
+            {"record_id": "r4", "fields": {"发布链接": "https://juejin.cn/post/2"}},
+        ]
+
+    crawl_calls = []
+
+    async def fake_crawl(urls, on_result=None, domain_controller=None):
+        crawl_calls.append(list(urls))
+        first_page_crawled.set()
+        return [{"url": u, "success": True, "data": {"read_count": len(crawl_calls)}} for u in urls]
+
+    updates = []
+    monkeypatch.setattr(bitable_sync, "iter_bitable_record_pages", fake_record_pages)
+    monkeypatch.setattr(bitable_sync, "crawl_urls_for_results", fake_crawl)
+    monkeypatch.setattr(
+        bitable_sync,
+        "batch_update_bitable_records",
+        lambda app_token, table_id, records, **kwargs: updates.extend(records),
+    )
+
+    out = bitable_sync.sync_from_bitable(app_token="tok", table_id="tbl")
+
+    assert crawl_started_before_second_page == [True]
+    assert crawl_calls == [["https://juejin.cn/post/1"], ["https://juejin.cn/post/2"]]
+    assert out["processed"] == 4
+    assert out["updated"] == 4
+    assert [(rid, f["总阅读量"]) for rid, f in updates] == [("r1", 1), ("r2", 1), ("r3", 1), ("r4", 2)]
+
+
+def test_sync_page_fetch_failure_marks_table_failed(monkeypatch):
+    monkeypatch.setattr(bitable_sync, "FEISHU_APP_ID", "id")
+    monkeypatch.setattr(bitable_sync, "FEISHU_APP_SECRET", "sec")
+
+    def fake_record_pages(app_token, table_id, **kwargs):
+        yield [{"record_id": "r1", "fields": {"发布链接": "https://juejin.cn/post/1"}}]
+        raise RuntimeError("Bitable 拉取记录失败: page 2")
+
+    monkeypatch.setattr(bitable_sync, "iter_bitable_record_pages", fake_record_pages)
+    monkeypatch.setattr(
+        bitable_sync,
+        "crawl_urls_for_results",
+        lambda urls: asyncio.sleep(0, result=[{"url": u, "success": True, "data": {}} for u in urls]),
+    )
+    monkeypatch.setattr(bitable_sync, "batch_update_bitable_records", lambda *a, **k: pytest.fail("no write-back"))
+
+    out = bitable_sync.sync_from_bitable(app_token="tok", table_id="tbl")
+
+    assert out["success"] is False
+    assert "page 2" in out["message"]
+
+
+def test_sync_page_fetch_failure_drops_results_already_crawled(monkeypatch):
+    """第二页拉取失败时，第一页已爬完（足以凑满一批）的结果也不写回这张失败的表。"""
+    import time as time_module
+
+    monkeypatch.setattr(bitable_sync, "FEISHU_APP_ID", "id")
+    monkeypatch.setattr(bitable_sync, "FEISHU_APP_SECRET", "sec")
+    monkeypatch.setattr(bitable_sync, "BITABLE_WRITE_BATCH_SIZE", 1)
+    crawled = []
+
+    async def fake_crawl(urls, on_result=None, domain_controller=None):
+        crawled.extend(urls)
+        return [{"url": u, "success": True, "data": {"read_count": 1}} for u in urls]
+
+    def fake_record_pages(app_token, table_id, **kwargs):
+        yield [{"record_id": f"r{i}", "fields": {"发布链接": f"https://juejin.cn/post/{i}"}} for i in (1, 2)]
+        # 留出时间让第一页的爬取在拉取失败前完成
+        time_module.sleep(0.2)
+        raise RuntimeError("Bitable 拉取记录失败: page 2")
+
+    monkeypatch.setattr(bitable_sync, "iter_bitable_record_pages", fake_record_pages)
+    monkeypatch.setattr(bitable_sync, "crawl_urls_for_results", fake_crawl)
+    writes = []
+    monkeypatch.setattr(bitable_sync, "batch_update_bitable_records", lambda *a, **k: writes.append(a))
+
+    out = bitable_sync.sync_from_bitable(app_token="tok", table_id="tbl")
+
+    assert crawled == ["https://juejin.cn/post/1", "https://juejin.cn/post/2"]
+    assert writes == []
+    assert out["success"] is False
+    assert "page 2" in out["message"]
+
+
+def test_sync_writes_back_in_batches_while_crawling(monkeypatch):
+    import threading
+
+    monkeypatch.setattr(bitable_sync, "FEISHU_APP_ID", "id")
+    monkeypatch.setattr(bitable_sync, "FEISHU_APP_SECRET", "sec")
+    monkeypatch.setattr(bitable_sync, "BITABLE_WRITE_BATCH_SIZE", 2)
+    first_write_done = threading.Event()
+
+    def fake_record_pages(app_token, table_id, **kwargs):
+        yield [{"record_id": f"r{i}", "fields": {"发布链接": f"https://juejin.cn/post/{i}"}} for i in (1, 2)]
+        yield [{"record_id": f"r{i}", "fields": {"发布链接": f"https://juejin.cn/post/{i}"}} for i in (3, 4, 5)]
+
+    write_seen_by_second_crawl = []
+
+    async def fake_crawl(urls, on_result=None, domain_controller=None):
+        if "https://juejin.cn/post/3" in urls:
+            # 第一批写回应在第二页爬取结束前就已发出
+            for _ in range(200):
+                if first_write_done.is_set():
+                    break
+                await asyncio.sleep(0.01)
+            write_seen_by_second_crawl.append(first_write_done.is_set())
+        return [
+            {"url": u, "success": not u.endswith("/4"), "data": {"read_count": 1}, "error": "boom"}
+            for u in urls
+        ]
+
+    chunks = []
+
+    def fake_batch_update(app_token, table_id, records, **kwargs):
+        chunks.append([rid for rid, _ in records])
+        first_write_done.set()
+
+    monkeypatch.setattr(bitable_sync, "iter_bitable_record_pages", fake_record_pages)
+    monkeypatch.setattr(bitable_sync, "crawl_urls_for_results", fake_crawl)
+    monkeypatch.setattr(bitable_sync, "batch_update_bitable_records", fake_batch_update)
+
+    out = bitable_sync.sync_from_bitable(app_token="tok", table_id="tbl")
+
+    assert write_seen_by_second_crawl == [True]
+    assert chunks == [["r1", "r2"], ["r3", "r4"], ["r5"]]
+    assert out["processed"] == 5
+    assert out["updated"] == 4
+    assert out["failed"] == 1
+    assert [e["record_id"] for e in out["errors"]] == ["r4"]
+
+
+def test_sync_write_backs_run_one_at_a_time_per_table(monkeypatch):
+    import threading
+    import time
+
+    monkeypatch.setattr(bitable_sync, "FEISHU_APP_ID", "id")
+    monkeypatch.setattr(bitable_sync, "FEISHU_APP_SECRET", "sec")
+    monkeypatch.setattr(bitable_sync, "BITABLE_WRITE_BATCH_SIZE", 1)
+
+    def fake_record_pages(app_token, table_id, **kwargs):
+        yield [{"record_id": f"r{i}", "fields": {"发布链接": f"https://juejin.cn/post/{i}"}} for i in range(6)]
+
+    async def fake_crawl(urls, on_result=None, domain_controller=None):
+        return [{"url": u, "success": True, "data": {"read_count": 1}} for u in urls]
+
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+    chunks = []
+
+    def fake_batch_update(app_token, table_id, records, **kwargs):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+            chunks.append([rid for rid, _ in records])
+        if records[0][0] == "r2":
+            raise RuntimeError("write failed")
+
+    monkeypatch.setattr(bitable_sync, "iter_bitable_record_pages", fake_record_pages)
+    monkeypatch.setattr(bitable_sync, "crawl_urls_for_results", fake_crawl)
+    monkeypatch.setattr(bitable_sync, "batch_update_bitable_records", fake_batch_update)
+
+    # 某批失败不阻塞后续批次，表结果整体判为失败
+    with pytest.raises(RuntimeError, match="write failed"):
+        bitable_sync.sync_from_bitable(app_token="tok", table_id="tbl")
+
+    assert peak == 1
+    assert chunks == [[f"r{i}"] for i in range(6)]
+
+
 def test_sync_from_multiple_bitable_sources_handles_invalid_item():
     out = bitable_sync.sync_from_multiple_bitable_sources(
         [{"app_token": "tok"}],  # missing table_id
@@ -286,8 +531,8 @@ def test_sync_from_multiple_bitable_sources_partial_failure(monkeypatch):
     monkeypatch.setattr(bitable_sync, "FEISHU_APP_SECRET", "sec")
     monkeypatch.setattr(
         bitable_sync,
-        "list_all_bitable_records",
-        lambda *a, **k: [{"record_id": "r1", "fields": {"发布链接": "https://juejin.cn/post/1"}}],
+        "iter_bitable_record_pages",
+        lambda *a, **k: [[{"record_id": "r1", "fields": {"发布链接": "https://juejin.cn/post/1"}}]],
     )
     monkeypatch.setattr(
         bitable_sync,
@@ -420,7 +665,7 @@ def test_sync_from_bitable_via_shared_pool_matches_by_key_not_index(monkeypatch)
 def test_sync_from_bitable_via_shared_pool_emits_progress_events(monkeypatch):
     events = []
 
-    async def fake_crawl(urls, on_result=None):
+    async def fake_crawl(urls, on_result=None, domain_controller=None):
         results = []
         for u in urls:
             payload = {"url": u, "success": True, "data": {"read_count": 1}}
@@ -433,8 +678,8 @@ def test_sync_from_bitable_via_shared_pool_emits_progress_events(monkeypatch):
     monkeypatch.setattr(bitable_sync, "FEISHU_APP_SECRET", "sec")
     monkeypatch.setattr(
         bitable_sync,
-        "list_all_bitable_records",
-        lambda *a, **k: [{"record_id": "r1", "fields": {"发布链接": "https://juejin.cn/post/1"}}],
+        "iter_bitable_record_pages",
+        lambda *a, **k: [[{"record_id": "r1", "fields": {"发布链接": "https://juejin.cn/post/1"}}]],
     )
     monkeypatch.setattr(bitable_sync, "crawl_urls_for_results", fake_crawl)
     monkeypatch.setattr(bitable_sync, "batch_update_bitable_records", lambda *a, **k: None)
@@ -447,3 +692,59 @@ def test_sync_from_bitable_via_shared_pool_emits_progress_events(monkeypatch):
     assert out["success"] is True
     assert any(e.get("stage") == "crawling" for e in events)
     assert any(e.get("batch_url_progress", {}).get("processed") == 1 for e in events)
+
+
+def test_sync_reuses_persistent_loop_and_keeps_log_context(monkeypatch):
+    from monitor.logging_context import get_log_context, reset_log_context, set_log_context
+
+    monkeypatch.setattr(bitable_sync, "FEISHU_APP_ID", "id")
+    monkeypatch.setattr(bitable_sync, "FEISHU_APP_SECRET", "sec")
+    monkeypatch.setattr(
+        bitable_sync,
+        "iter_bitable_record_pages",
+        lambda *a, **k: [[{"record_id": "r1", "fields": {"发布链接": "https://juejin.cn/post/1"}}]],
+    )
+    seen = []
+
+    async def fake_crawl(urls, on_result=None, domain_controller=None):
+        seen.append((asyncio.get_running_loop(), get_log_context().get("crawl_id")))
+        return [{"url": u, "success": True, "data": {"read_count": 1}} for u in urls]
+
+    monkeypatch.setattr(bitable_sync, "crawl_urls_for_results", fake_crawl)
+    monkeypatch.setattr(bitable_sync, "batch_update_bitable_records", lambda *a, **k: None)
+
+    token = set_log_context(crawl_id="sync-1")
+    try:
+        bitable_sync.sync_from_bitable(app_token="tok", table_id="tbl")
+        bitable_sync.sync_from_bitable(app_token="tok", table_id="tbl")
+    finally:
+        reset_log_context(token)
+
+    assert len(seen) == 2
+    assert seen[0][0] is seen[1][0] is bitable_sync._get_sync_loop()
+    assert [crawl_id for _, crawl_id in seen] == ["sync-1", "sync-1"]
+
+
+def test_sync_pages_share_one_domain_controller(monkeypatch):
+    monkeypatch.setattr(bitable_sync, "FEISHU_APP_ID", "id")
+    monkeypatch.setattr(bitable_sync, "FEISHU_APP_SECRET", "sec")
+
+    def fake_record_pages(app_token, table_id, **kwargs):
+        yield [{"record_id": "r1", "fields": {"发布链接": "https://juejin.cn/post/1"}}]
+        yield [{"record_id": "r2", "fields": {"发布链接": "https://juejin.cn/post/2"}}]
+
+    controllers = []
+
+    async def fake_crawl(urls, on_result=None, domain_controller=None):
+        controllers.append(domain_controller)
+        return [{"url": u, "success": True, "data": {"read_count": 1}} for u in urls]
+
+    monkeypatch.setattr(bitable_sync, "iter_bitable_record_pages", fake_record_pages)
+    monkeypatch.setattr(bitable_sync, "crawl_urls_for_results", fake_crawl)
+    monkeypatch.setattr(bitable_sync, "batch_update_bitable_records", lambda *a, **k: None)
+
+    out = bitable_sync.sync_from_bitable(app_token="tok", table_id="tbl")
+
+    assert out["updated"] == 2
+    assert len(controllers) == 2
+    assert controllers[0] is not None and controllers[0] is controllers[1]
@@ -58,3 +58,188 @@ def test_release_returns_crawler_to_pool(mock_create_crawler):
     _run(pool.release(c1))
     c2 = _run(pool.acquire())
     assert c2 is not None
+
+
+def test_acquire_reuses_crawler_within_same_loop(mock_create_crawler):
+    """Released crawler is handed out again on the loop that created it."""
+    pool = get_browser_pool()
+
+    async def scenario():
+        c1 = await pool.acquire()
+        await pool.release(c1)
+        c2 = await pool.acquire()
+        await pool.release(c2)
+        return c1, c2
+
+    c1, c2 = _run(scenario())
+    assert c1 is c2
+
+
+def test_acquire_drops_crawler_from_closed_loop(mock_create_crawler):
+    """Crawlers bound to a closed event loop are discarded instead of reused."""
+    pool = get_browser_pool()
+
+    async def acquire_and_release():
+        crawler = await pool.acquire()
+        await pool.release(crawler)
+        return crawler
+
+    stale = _run(acquire_and_release())
+    fresh = _run(acquire_and_release())
+    assert fresh is not stale
+    assert stale not in [c for _, c in pool._pool]
+
+
+def test_concurrent_acquires_create_in_parallel_up_to_max_size(monkeypatch):
+    """Cold starts run outside the pool lock, and reservations keep the total within max size."""
+    from collections import deque
+
+    pool = get_browser_pool()
+    monkeypatch.setattr(pool, "_pool", deque())
+    monkeypatch.setattr(pool, "_in_use", set())
+    monkeypatch.setattr(pool, "_crawler_loops", {})
+    monkeypatch.setattr(pool, "_max_size", 3)
+    creating = {"now": 0, "peak": 0}
+
+    async def slow_create_crawler(self):
+        creating["now"] += 1
+        creating["peak"] = max(creating["peak"], creating["now"])
+        await asyncio.sleep(0.05)
+        creating["now"] -= 1
+        return FakeCrawler()
+
+    monkeypatch.setattr(BrowserPool, "_create_crawler", slow_create_crawler)
+
+    async def scenario():
+        crawlers = await asyncio.gather(*(pool.acquire() for _ in range(5)))
+        for crawler in crawlers:
+            if crawler is not None:
+                await pool.release(crawler)
+        return crawlers
+
+    crawlers = _run(scenario())
+    assert creating["peak"] == 3
+    assert sum(c is not None for c in crawlers) == 3
+    assert pool._reserved == 0
+
+
+def test_cleanup_idle_evicts_only_crawlers_idle_past_max_idle_time(monkeypatch):
+    """Idle eviction is driven by per-crawler release time, keeping at least min size."""
+    import time
+    from collections import deque
+
+    class ClosingCrawler(FakeCrawler):
+        closed = False
+
+        async def __aexit__(self, *args):
+            self.closed = True
+
+    pool = get_browser_pool()
+    now = time.monotonic()
+    oldest, old, warm = ClosingCrawler(), ClosingCrawler(), ClosingCrawler()
+    monkeypatch.setattr(pool, "_pool", deque([(now - 900, oldest), (now - 600, old), (now - 5, warm)]))
+    monkeypatch.setattr(pool, "_crawler_loops", {})
+    monkeypatch.setattr(pool, "_min_size", 1)
+    monkeypatch.setattr(pool, "_max_idle_time", 300)
+    monkeypatch.setattr(pool, "_last_cleanup", now - 3600)
+
+    _run(pool._cleanup_idle())
+
+    assert [c for _, c in pool._pool] == [warm]
+    assert oldest.closed and old.closed and not warm.closed
+
+    # 池中全是热实例时不会为了缩到最小值而淘汰
+    monkeypatch.setattr(pool, "_pool", deque([(now, oldest), (now, old), (now, warm)]))
+    monkeypatch.setattr(pool, "_last_cleanup", now - 3600)
+    _run(pool._cleanup_idle())
+    assert len(pool._pool) == 3
+
+
+def test_cleanup_idle_skips_crawlers_owned_by_other_loops(monkeypatch):
+    """Expired instances bound to another event loop are left for that loop to close."""
+    import time
+    from collections import deque
+
+    closed = []
+
+    class ClosingCrawler(FakeCrawler):
+        async def __aexit__(self, *args):
+            closed.append(self)
+
+    pool = get_browser_pool()
+    now = time.monotonic()
+    foreign, own = ClosingCrawler(), ClosingCrawler()
+    other_loop = asyncio.new_event_loop()
+    monkeypatch.setattr(pool, "_pool", deque([(now - 900, foreign), (now - 600, own)]))
+    monkeypatch.setattr(pool, "_crawler_loops", {foreign: other_loop})
+    monkeypatch.setattr(pool, "_min_size", 0)
+    monkeypatch.setattr(pool, "_max_idle_time", 300)
+    monkeypatch.setattr(pool, "_last_cleanup", now - 3600)
+
+    try:
+        _run(pool._cleanup_idle())
+        assert closed == [own]
+        assert [c for _, c in pool._pool] == [foreign]
+        assert pool._crawler_loops == {foreign: other_loop}
+    finally:
+        other_loop.close()
+
+
+def test_cleanup_idle_never_evicts_crawlers_in_use(monkeypatch):
+    """Only idle pool entries are eviction candidates; borrowed crawlers are left alone."""
+    import time
+    from collections import deque
+
+    pool = get_browser_pool()
+    now = time.monotonic()
+    borrowed, idle = FakeCrawler(), FakeCrawler()
+    monkeypatch.setattr(pool, "_pool", deque([(now - 900, idle)]))
+    monkeypatch.setattr(pool, "_in_use", {borrowed})
+    monkeypatch.setattr(pool, "_crawler_loops", {})
+    monkeypatch.setattr(pool, "_min_size", 0)
+    monkeypatch.setattr(pool, "_max_idle_time", 300)
+    monkeypatch.setattr(pool, "_last_cleanup", now - 3600)
+
+    _run(pool._cleanup_idle())
+
+    assert not pool._pool
+    assert pool._in_use == {borrowed}
+
+
+def test_close_loop_crawlers_closes_only_current_loop_instances(mock_create_crawler, monkeypatch):
+    """Instances created on a short-lived loop are closed before it ends; other loops' instances stay pooled."""
+    from collections import deque
+
+    closed = []
+
+    class TrackedCrawler(FakeCrawler):
+        async def __aexit__(self, *args):
+            closed.append(self)
+
+    other_loop = asyncio.new_event_loop()
+    foreign = TrackedCrawler()
+    pool = get_browser_pool()
+    monkeypatch.setattr(pool, "_pool", deque([(0.0, foreign)]))
+    monkeypatch.setattr(pool, "_in_use", set())
+    monkeypatch.setattr(pool, "_crawler_loops", {foreign: other_loop})
+
+    async def fake_create_crawler(self):
+        return TrackedCrawler()
+
+    monkeypatch.setattr(BrowserPool, "_create_crawler", fake_create_crawler)
+
+    async def one_run():
+        idle = await pool.acquire()
+        busy = await pool.acquire()
+        await pool.release(idle)
+        await pool.close_loop_crawlers()
+        return idle, busy
+
+    try:
+        idle, busy = _run(one_run())
+        assert sorted(map(id, closed)) == sorted(map(id, (idle, busy)))
+        assert [c for _, c in pool._pool] == [foreign]
+        assert pool._in_use == set()
+        assert pool._crawler_loops == {foreign: other_loop}
+    finally:
+        other_loop.close()
@@ -229,6 +229,28 @@ def test_crawl_article_with_retry_success(monkeypatch):
     assert any(c[1] == "New Title" for c in update_title_calls)
 
 
+def test_crawl_article_with_retry_uses_preloaded_empty_latest_count(monkeypatch):
+    """A preloaded _latest_count of None means "no history" and must not hit the DB again."""
+    article = {"id": 1, "url": "https://juejin.cn/post/1", "site": "juejin", "title": "T", "_latest_count": None}
+    add_read_count_calls = []
+
+    async def fake_extract(url, c):
+        return {"read_count": 100, "title": "T"}
+
+    def fail_get_latest_read_count(aid):
+        raise AssertionError("preloaded article should not query latest read count")
+
+    monkeypatch.setattr(crawler_module, "is_platform_allowed", lambda s: True)
+    monkeypatch.setattr(crawler_module, "extract_article_info", fake_extract)
+    monkeypatch.setattr(crawler_module, "add_read_count", lambda aid, count: add_read_count_calls.append((aid, count)))
+    monkeypatch.setattr(crawler_module, "update_article_status", lambda aid, status, error=None: None)
+    monkeypatch.setattr(crawler_module, "get_latest_read_count", fail_get_latest_read_count)
+
+    assert run_async(crawl_article_with_retry(article, skip_retry=True)) is True
+    assert add_read_count_calls == [(1, 100)]
+    assert article["_latest_count"] == 100
+
+
 def test_crawl_article_with_retry_extract_fails_marks_error(monkeypatch):
     """Extractor returns None (parse failure), skip_retry=False -> mark ERROR."""
     article = {"id": 1, "url": "https://juejin.cn/post/1", "site": "juejin", "title": "T", "_latest_count": None}
@@ -332,6 +354,27 @@ def test_crawl_article_with_retry_permanent_error_no_retry(monkeypatch):
     assert any(c[1] == "ERROR" for c in update_status_calls)
 
 
+def test_crawl_all_sync_closes_loop_browsers_before_loop_ends(monkeypatch):
+    """crawl_all_sync 在 asyncio.run 的 loop 结束前关闭该 loop 的池内实例。"""
+    loops = {}
+
+    async def fake_crawl_all_articles():
+        loops["crawl"] = asyncio.get_running_loop()
+        raise RuntimeError("boom")
+
+    class FakePool:
+        async def close_loop_crawlers(self):
+            loops["close"] = asyncio.get_running_loop()
+
+    monkeypatch.setattr(crawler_module, "crawl_all_articles", fake_crawl_all_articles)
+    monkeypatch.setattr(crawler_module, "get_browser_pool", lambda: FakePool())
+    reset_crawl_progress()
+
+    crawler_module.crawl_all_sync()
+
+    assert loops["close"] is loops["crawl"]
+
+
 # ----- Integration-style: crawl_all_articles -----
 
 
@@ -40,3 +40,14 @@ def test_init_db_idempotent(temp_db):
     cursor = conn.cursor()
     cursor.execute("SELECT COUNT(*) FROM articles")
     conn.close()
+
+
+def test_get_db_applies_mmap_size(temp_db, monkeypatch):
+    """get_db() sets mmap_size from SQLITE_MMAP_SIZE_MB on every connection."""
+    import monitor.db.connection as connection_module
+
+    monkeypatch.setattr(connection_module, "SQLITE_MMAP_SIZE_MB", 8)
+    conn = get_db()
+    size = conn.execute("PRAGMA mmap_size").fetchone()[0]
+    conn.close()
+    assert size == 8 * 1024 * 1024
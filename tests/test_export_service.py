@@ -4,8 +4,8 @@ from io import StringIO
 from monitor import export_service
 
 
-def _decode_csv(content: bytes):
-    text = content.decode("utf-8-sig")
+def _decode_csv(content):
+    text = b"".join(content).decode("utf-8-sig")
     rows = list(csv.reader(StringIO(text)))
     if rows and rows[0]:
         rows[0][0] = rows[0][0].lstrip("\ufeff")
@@ -13,20 +13,24 @@ def _decode_csv(content: bytes):
 
 
 def test_export_selected_articles_csv(monkeypatch):
-    def fake_get_all_articles():
-        return [
-            {"id": 1, "title": "A1", "site": "juejin", "url": "https://a1"},
-            {"id": 2, "title": "A2", "site": "csdn", "url": "https://a2"},
-        ]
-
-    def fake_get_read_counts(article_id, start_date=None, end_date=None):
-        return [
-            {"count": 10, "timestamp": "2024-01-01 00:00:00"},
-            {"count": 20, "timestamp": "2024-01-02 00:00:00"},
-        ]
-
-    monkeypatch.setattr(export_service, "get_all_articles", fake_get_all_articles)
-    monkeypatch.setattr(export_service, "get_read_counts", fake_get_read_counts)
+    def fake_get_articles_by_ids(article_ids):
+        articles = {
+            1: {"id": 1, "title": "A1", "site": "juejin", "url": "https://a1"},
+            2: {"id": 2, "title": "A2", "site": "csdn", "url": "https://a2"},
+        }
+        return {aid: articles[aid] for aid in article_ids if aid in articles}
+
+    def fake_get_read_counts_bulk(article_ids, start_date=None, end_date=None):
+        return {
+            aid: [
+                {"count": 10, "timestamp": "2024-01-01 00:00:00"},
+                {"count": 20, "timestamp": "2024-01-02 00:00:00"},
+            ]
+            for aid in article_ids
+        }
+
+    monkeypatch.setattr(export_service, "get_articles_by_ids", fake_get_articles_by_ids)
+    monkeypatch.setattr(export_service, "get_read_counts_bulk", fake_get_read_counts_bulk)
 
     content, filename = export_service.export_selected_articles_csv([1], "2024-01-01", "2024-01-31")
 
@@ -38,19 +42,12 @@ def test_export_selected_articles_csv(monkeypatch):
 
 
 def test_export_all_articles_csv(monkeypatch):
-    def fake_get_all_articles():
-        return [
-            {"id": 1, "title": "A1", "site": "juejin", "url": "https://a1"},
-            {"id": 2, "title": "A2", "site": "csdn", "url": "https://a2"},
-        ]
+    def fake_iter_all_article_history(start_date=None, end_date=None):
+        # 與 SQL 查詢列順序一致：title, site, url, count, timestamp
+        yield ("A1", "juejin", "https://a1", 10, "2024-01-01 00:00:00")
+        yield ("A2", "csdn", "https://a2", 20, "2024-01-01 00:00:00")
 
-    def fake_get_read_counts(article_id, start_date=None, end_date=None):
-        return [
-            {"count": article_id * 10, "timestamp": "2024-01-01 00:00:00"},
-        ]
-
-    monkeypatch.setattr(export_service, "get_all_articles", fake_get_all_articles)
-    monkeypatch.setattr(export_service, "get_read_counts", fake_get_read_counts)
+    monkeypatch.setattr(export_service, "iter_all_article_history", fake_iter_all_article_history)
 
     content, filename = export_service.export_all_articles_csv(None, None)
 
@@ -59,4 +56,35 @@ def test_export_all_articles_csv(monkeypatch):
     # header + 2 條紀錄
     assert rows[0] == ["文章标题", "网站", "URL", "阅读数", "记录时间"]
     assert len(rows) == 3
+    assert rows[2] == ["A2", "csdn", "https://a2", "20", "2024-01-01 00:00:00"]
+
+
+
+def test_export_csv_streams_lazily_with_single_bom(monkeypatch):
+    calls = []
+
+    def fake_iter_all_article_history(start_date=None, end_date=None):
+        calls.append((start_date, end_date))
+        yield ("A1", "juejin", "https://a1", 1, "2024-01-01 00:00:00")
+
+    monkeypatch.setattr(export_service, "iter_all_article_history", fake_iter_all_article_history)
+
+    content, _ = export_service.export_all_articles_csv(None, None)
+    assert calls == []
+
+    chunks = list(content)
+    assert calls == [(None, None)]
+    body = b"".join(chunks)
+    assert body.startswith(b"\xef\xbb\xbf")
+    assert not body[3:].startswith(b"\xef\xbb\xbf")
+
+
+def test_stream_csv_groups_rows_into_chunks(monkeypatch):
+    monkeypatch.setattr(export_service, "CSV_ROWS_PER_CHUNK", 2)
+
+    chunks = list(export_service._stream_csv([["a", 1], ["b", 2], ["c", 3]]))
 
+    # 表头块 + 2 行一块 + 剩余 1 行
+    assert len(chunks) == 3
+    assert chunks[0] == export_service._CSV_PREAMBLE
+    assert _decode_csv(chunks)[1:] == [["a", "1"], ["b", "2"], ["c", "3"]]
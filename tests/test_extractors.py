@@ -218,6 +218,34 @@ async def test_extract_with_config_full_extracts_juejin_from_meta_box_only(monke
     assert count == 49
 
 
+@pytest.mark.asyncio
+async def test_extract_with_config_full_offloads_title_for_large_html(monkeypatch):
+    html = "<title>大页面标题</title>" + '<span class="views-count">7</span>'
+    fake_result = types.SimpleNamespace(success=True, html=html, markdown="")
+    offloaded = []
+
+    async def fake_crawl(url, crawler, crawler_config):
+        return fake_result
+
+    async def fake_to_thread(func, *args):
+        offloaded.append(func)
+        return func(*args)
+
+    monkeypatch.setattr(extractors_module, "_crawl_with_shared", fake_crawl)
+    monkeypatch.setattr(extractors_module, "ANTI_SCRAPING_ENABLED", False)
+    monkeypatch.setattr(extractors_module, "_TITLE_OFFLOAD_HTML_CHARS", 10)
+    monkeypatch.setattr(extractors_module.asyncio, "to_thread", fake_to_thread)
+
+    _, title = await extractors_module.extract_with_config_full(
+        "https://juejin.cn/post/1",
+        "juejin",
+        crawler=object(),
+    )
+
+    assert title == "大页面标题"
+    assert offloaded == [extractors_module._extract_title_from_html]
+
+
 @pytest.mark.asyncio
 async def test_extract_with_config_full_blocked_then_tor_retry_uses_proxy_config(monkeypatch):
     # First attempt returns a captcha/blocked page; second attempt (Tor) succeeds.
@@ -314,3 +342,25 @@ async def test_extract_article_info_routes_eet_china_before_china_domain(monkeyp
     )
 
     assert result["read_count"] == 154
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("标题_用户名的博客-CSDN博客", "标题"),
+        ("标题 - 副标题 - 掘金", "标题 - 副标题"),
+        ("前端技术分享 - 技术社区", "前端技术分享"),
+        ("没有分隔符的标题", "没有分隔符的标题"),
+    ],
+)
+def test_extract_title_from_html_strips_site_suffix(raw, expected):
+    html = f"<html><head><title>{raw}</title></head></html>"
+    assert extractors_module._extract_title_from_html(html) == expected
+
+
+def test_extract_title_prefers_parsed_metadata_title():
+    html = "<html><head><title>正则标题</title></head></html>"
+    metadata = {"title": "解析标题 - 掘金"}
+    assert extractors_module._extract_title_from_html(html, metadata) == "解析标题"
+    # metadata 无标题时回退到正则提取
+    assert extractors_module._extract_title_from_html(html, {"title": None}) == "正则标题"
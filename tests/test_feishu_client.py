@@ -74,6 +74,40 @@ def test_list_bitable_records_pagination(monkeypatch):
     assert all_items[0]["record_id"] == "rec1"
     assert all_items[1]["record_id"] == "rec2"
 
+    # 逐页迭代：拿到第一页时只发出一次请求
+    call_count[0] = 0
+    pages = feishu_client.iter_bitable_record_pages(
+        "app_tok", "tbl_id", app_id="id", app_secret="sec", page_size=1
+    )
+    first_page = next(pages)
+    assert call_count[0] == 1
+    assert [i["record_id"] for i in first_page] == ["rec1"]
+    assert [[i["record_id"] for i in page] for page in pages] == [["rec2"]]
+
+
+def test_list_bitable_records_field_names_projection(monkeypatch):
+    """传入 field_names 时以 JSON 数组字符串请求字段投影；不传则不带该参数。"""
+    fake_data = MagicMock()
+    fake_data.items = []
+    fake_data.has_more = False
+    fake_resp = MagicMock()
+    fake_resp.success.return_value = True
+    fake_resp.data = fake_data
+    fake_client = MagicMock()
+    fake_client.bitable.v1.app_table_record.list.return_value = fake_resp
+    monkeypatch.setattr(feishu_client, "_client", None)
+    monkeypatch.setattr(feishu_client, "_get_client", lambda *a, **k: fake_client)
+
+    list(feishu_client.iter_bitable_record_pages(
+        "app_tok", "tbl_id", field_names=["发布链接"], app_id="id", app_secret="sec"
+    ))
+    req = fake_client.bitable.v1.app_table_record.list.call_args[0][0]
+    assert req.field_names == '["发布链接"]'
+
+    feishu_client.list_bitable_records("app_tok", "tbl_id", app_id="id", app_secret="sec")
+    req = fake_client.bitable.v1.app_table_record.list.call_args[0][0]
+    assert req.field_names is None
+
 
 def test_list_bitable_records_no_credentials():
     feishu_client._client = None
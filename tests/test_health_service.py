@@ -1,8 +1,19 @@
+import time
+from datetime import datetime
 from typing import Any
 
+import pytest
+
 from monitor import health_service
 
 
+@pytest.fixture(autouse=True)
+def _reset_network_cache():
+    health_service.reset_network_status_cache()
+    yield
+    health_service.reset_network_status_cache()
+
+
 class DummyMem:
     def __init__(self):
         self.total = 100
@@ -44,7 +55,7 @@ def test_get_system_health_payload_structure(monkeypatch):
             }
         ],
     )
-    monkeypatch.setattr(health_service, "get_setting", lambda key, default=None: "6")
+    monkeypatch.setattr(health_service, "get_cached_setting", lambda key, default=None: "6")
 
     # 網路狀態用固定回傳，避免真實連線
     monkeypatch.setattr(
@@ -88,7 +99,7 @@ def test_health_platform_no_last_update(monkeypatch):
         lambda: [{"site": "x", "last_update": None, "article_count": 0}],
     )
     monkeypatch.setattr(health_service, "get_platform_failures", lambda: [])
-    monkeypatch.setattr(health_service, "get_setting", lambda key, default=None: "6")
+    monkeypatch.setattr(health_service, "get_cached_setting", lambda key, default=None: "6")
     monkeypatch.setattr(health_service, "_check_conn", lambda host, port=443: {"ok": True, "latency": 0})
     payload = health_service.get_system_health_payload()
     assert len(payload["platforms"]) == 1
@@ -108,7 +119,7 @@ def test_health_platform_bad_date_format(monkeypatch):
         lambda: [{"site": "y", "last_update": "not-a-date", "article_count": 1}],
     )
     monkeypatch.setattr(health_service, "get_platform_failures", lambda: [])
-    monkeypatch.setattr(health_service, "get_setting", lambda key, default=None: "6")
+    monkeypatch.setattr(health_service, "get_cached_setting", lambda key, default=None: "6")
     monkeypatch.setattr(health_service, "_check_conn", lambda host, port=443: {"ok": True, "latency": 0})
     payload = health_service.get_system_health_payload()
     assert len(payload["platforms"]) == 1
@@ -129,7 +140,7 @@ def test_health_platform_delayed_update(monkeypatch):
         lambda: [{"site": "z", "last_update": old_date, "article_count": 1}],
     )
     monkeypatch.setattr(health_service, "get_platform_failures", lambda: [])
-    monkeypatch.setattr(health_service, "get_setting", lambda key, default=None: "6")
+    monkeypatch.setattr(health_service, "get_cached_setting", lambda key, default=None: "6")
     monkeypatch.setattr(health_service, "_check_conn", lambda host, port=443: {"ok": True, "latency": 0})
     payload = health_service.get_system_health_payload()
     assert len(payload["platforms"]) == 1
@@ -153,9 +164,70 @@ def test_health_platform_with_failures(monkeypatch):
         "get_platform_failures",
         lambda: [{"id": 1, "site": "juejin", "title": "T", "url": "u", "last_error": "e", "last_crawl_time": "2024-01-01"}],
     )
-    monkeypatch.setattr(health_service, "get_setting", lambda key, default=None: "6")
+    monkeypatch.setattr(health_service, "get_cached_setting", lambda key, default=None: "6")
     monkeypatch.setattr(health_service, "_check_conn", lambda host, port=443: {"ok": True, "latency": 0})
     payload = health_service.get_system_health_payload()
     assert len(payload["platforms"]) == 1
     assert "失败" in payload["platforms"][0]["message"]
 
+
+
+def test_network_status_cached_and_refreshed_in_background(monkeypatch):
+    calls = []
+
+    def fake_build_network_status():
+        calls.append(1)
+        return [{"name": "n", "host": "h", "status": {"ok": True, "latency": len(calls)}}]
+
+    monkeypatch.setattr(health_service, "_build_network_status", fake_build_network_status)
+    monkeypatch.setattr(health_service, "HEALTH_NETWORK_CACHE_SECONDS", 10.0)
+
+    first = health_service._get_network_status()
+    second = health_service._get_network_status()
+    assert second is first
+    assert len(calls) == 1
+
+    # 過期後立即返回舊結果，背景刷新完成後再取得新結果
+    health_service._network_cache["ts"] -= 60
+    stale = health_service._get_network_status()
+    assert stale is first
+    for _ in range(100):
+        if len(calls) == 2 and not health_service._network_cache["refreshing"]:
+            break
+        time.sleep(0.01)
+    assert len(calls) == 2
+    assert health_service._get_network_status()[0]["status"]["latency"] == 2
+
+
+def test_network_status_cache_disabled(monkeypatch):
+    calls = []
+    monkeypatch.setattr(health_service, "_build_network_status", lambda: calls.append(1) or [])
+    monkeypatch.setattr(health_service, "HEALTH_NETWORK_CACHE_SECONDS", 0)
+
+    health_service._get_network_status()
+    health_service._get_network_status()
+    assert len(calls) == 2
+
+
+def test_network_status_skips_sites_when_internet_down(monkeypatch):
+    probed = []
+
+    def fake_check_conn(host, port=443):
+        probed.append(host)
+        return {"ok": False, "latency": 0}
+
+    monkeypatch.setattr(health_service, "_check_conn", fake_check_conn)
+
+    network = health_service._build_network_status()
+
+    assert probed == ["www.baidu.com"]
+    assert network[0]["name"] == "互联网连通性"
+    assert len(network) == 1 + len(health_service.SUPPORTED_SITES)
+    assert all(item["status"].get("skipped") for item in network[1:])
+
+
+def test_parse_db_timestamp_is_strict():
+    assert health_service._parse_db_timestamp("2024-01-02 03:04:05") == datetime(2024, 1, 2, 3, 4, 5)
+    for bad in ("2024-01-02", "2024-01-02T03:04:05", "not-a-date"):
+        with pytest.raises(ValueError):
+            health_service._parse_db_timestamp(bad)
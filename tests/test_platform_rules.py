@@ -1,4 +1,6 @@
 """Smoke tests for monitor.platform_rules (PLATFORM_EXTRACTORS structure)."""
+import re
+
 from monitor.platform_rules import PLATFORM_EXTRACTORS
 
 
@@ -21,3 +23,23 @@ def test_platform_extractors_each_has_required_keys():
         assert rules["parse_method"] in ("number", "number_with_suffix"), (
             f"{name}.parse_method should be 'number' or 'number_with_suffix'"
         )
+
+
+def test_platform_patterns_are_precompiled_per_site():
+    """Every rule set is compiled once at import (HTML with DOTALL, markdown without)."""
+    from monitor.platform_rules import PLATFORM_EXTRACTORS_COMPILED, get_compiled_patterns
+
+    assert set(PLATFORM_EXTRACTORS_COMPILED) == set(PLATFORM_EXTRACTORS)
+    for name, rules in PLATFORM_EXTRACTORS.items():
+        html_patterns, md_patterns = get_compiled_patterns(name)
+        assert html_patterns is PLATFORM_EXTRACTORS_COMPILED[name][0]
+        assert [p.pattern for p in html_patterns] == rules["patterns"]
+        assert [p.pattern for p in md_patterns] == rules["patterns"]
+        assert all(p.flags & re.DOTALL for p in html_patterns)
+        assert not any(p.flags & re.DOTALL for p in md_patterns)
+
+
+def test_get_compiled_patterns_unknown_site_is_empty():
+    from monitor.platform_rules import get_compiled_patterns
+
+    assert get_compiled_patterns("no-such-site") == ((), ())
@@ -23,6 +23,35 @@ def test_get_read_counts_with_dates(temp_db):
     assert len(rows_empty) == 0
 
 
+def test_get_read_counts_bulk(temp_db):
+    """get_read_counts_bulk buckets histories per article in get_read_counts order."""
+    a1 = article_repo.add_article("https://bulk.com/1", "B1", "juejin")
+    a2 = article_repo.add_article("https://bulk.com/2", "B2", "juejin")
+    read_count_repo.add_read_counts_batch([(a1, 1), (a1, 2), (a1, 3), (a2, 7)])
+
+    result = read_count_repo.get_read_counts_bulk([a1, a2, 999])
+    assert set(result) == {a1, a2}
+    assert result[a1] == read_count_repo.get_read_counts(a1)
+    assert [r["count"] for r in result[a2]] == [7]
+
+    limited = read_count_repo.get_read_counts_bulk([a1], limit_per_article=2)
+    assert [r["count"] for r in limited[a1]] == [3, 2]
+    assert read_count_repo.get_read_counts_bulk([]) == {}
+
+
+def test_iter_all_article_history(temp_db):
+    """iter_all_article_history joins article fields and honours the per-article limit."""
+    a1 = article_repo.add_article("https://all.com/1", "H1", "juejin")
+    article_repo.add_article("https://all.com/empty", "E", "juejin")
+    read_count_repo.add_read_counts_batch([(a1, 1), (a1, 2), (a1, 3)])
+
+    rows = [dict(r) for r in read_count_repo.iter_all_article_history(limit_per_article=2)]
+    assert [r["count"] for r in rows] == [3, 2]
+    assert rows[0]["title"] == "H1"
+    assert rows[0]["url"] == "https://all.com/1"
+    assert list(read_count_repo.iter_all_article_history(start_date="2999-01-01")) == []
+
+
 def test_get_latest_read_count(temp_db):
     """get_latest_read_count returns most recent record."""
     aid = article_repo.add_article("https://l.com/1", "L1", "juejin")
@@ -124,3 +153,18 @@ def test_clear_cache(temp_db):
     n2 = read_count_repo.clear_cache(days=9999)
     assert n2 >= 0
     assert read_count_repo.clear_cache() == 0
+
+
+def test_writes_advance_data_generation(temp_db):
+    """Committed article / read-count writes bump the data generation; no-op deletes do not."""
+    from monitor.db.connection import get_data_generation
+
+    before = get_data_generation()
+    aid = article_repo.add_article("https://gen.com/1", "G1", "juejin")
+    read_count_repo.add_read_counts_batch([(aid, 1)])
+    article_repo.update_article_status(aid, "SUCCESS")
+    after_writes = get_data_generation()
+    assert after_writes == before + 3
+
+    assert read_count_repo.delete_read_count_by_timestamp(aid, "1999-01-01 00:00:00") == 0
+    assert get_data_generation() == after_writes
@@ -27,3 +27,23 @@ def test_get_setting_crawl_interval_exists_after_init(temp_db):
     """After init_db, crawl_interval_hours exists (from conftest temp_db)."""
     value = get_setting("crawl_interval_hours")
     assert value is not None
+
+
+def test_get_cached_setting_reuses_value_until_set(temp_db, monkeypatch):
+    """get_cached_setting serves from cache within TTL; set_setting invalidates it."""
+    from monitor.db import settings_repo
+
+    monkeypatch.setattr(settings_repo, "_SETTINGS_CACHE", {})
+    set_setting("cached_key", "1")
+    assert settings_repo.get_cached_setting("cached_key") == "1"
+
+    calls = []
+    real_get = settings_repo.get_setting
+    monkeypatch.setattr(settings_repo, "get_setting", lambda key, default=None: calls.append(key) or real_get(key, default))
+    assert settings_repo.get_cached_setting("cached_key") == "1"
+    assert calls == []
+
+    set_setting("cached_key", "2")
+    assert settings_repo.get_cached_setting("cached_key") == "2"
+    assert calls == ["cached_key"]
+    assert settings_repo.get_cached_setting("missing_key", "d") == "d"
@@ -1,6 +1,7 @@
 """Unit tests for monitor.task_manager (submit_task, get_task, TaskStatus)."""
 import asyncio
 import time
+import threading
 
 from monitor.task_manager import (
     get_task_manager,
@@ -64,3 +65,39 @@ def test_get_task_nonexistent_returns_none():
     """get_task for non-existent task_id returns None."""
     manager = get_task_manager()
     assert manager.get_task("nonexistent-task-id-12345") is None
+
+
+def test_set_task_result_stores_on_task():
+    """set_task_result writes results onto the managed task; get_task exposes them once it ends."""
+    release = threading.Event()
+
+    async def blocked(task_id):
+        await asyncio.to_thread(release.wait, 5)
+
+    manager = get_task_manager()
+    task_id = manager.submit_task(blocked)
+    manager.set_task_result(task_id, [{"url": "https://a", "success": True}])
+    with manager._task_lock:
+        assert manager._tasks[task_id]["results"] == [{"url": "https://a", "success": True}]
+    assert "results" not in manager.get_task(task_id)
+
+    release.set()
+    assert manager.wait_for_task(task_id, timeout=5) is True
+    assert manager.get_task(task_id)["results"] == [{"url": "https://a", "success": True}]
+    manager.set_task_result("nonexistent-task-id-12345", [])
+
+
+def test_wait_for_task_returns_after_completion_with_results():
+    """wait_for_task blocks until the task finishes; results are readable afterwards."""
+
+    async def store_results(task_id):
+        await asyncio.sleep(0.05)
+        get_task_manager().set_task_result(task_id, [{"success": True}])
+
+    manager = get_task_manager()
+    task_id = manager.submit_task(store_results)
+    assert manager.wait_for_task(task_id, timeout=5) is True
+    assert manager.get_task(task_id)["status"] == "completed"
+    assert manager.get_task_results(task_id) == [{"success": True}]
+    assert manager.wait_for_task("nonexistent-task-id-12345", timeout=0.01) is False
+    assert manager.get_task_results("nonexistent-task-id-12345") is None
@@ -2,6 +2,7 @@ import pytest
 
 from monitor.config import SUPPORTED_SITES
 from monitor.url_utils import (
+    detect_site,
     normalize_url,
     validate_url,
     validate_and_normalize_url,
@@ -39,6 +40,11 @@ def test_normalize_url_other_unchanged():
     assert normalize_url(original) == original
 
 
+def test_normalize_url_only_rewrites_juejin_paths():
+    assert normalize_url("https://example.com/spost/1") == "https://example.com/spost/1"
+    assert normalize_url("https://juejin.cn/post/1?from=/spost/") == "https://juejin.cn/post/1?from=/spost/"
+
+
 @pytest.mark.parametrize(
     "url, expected",
     [
@@ -107,3 +113,35 @@ def test_validate_url_value_error_path():
     # urlparse can accept None in some versions but may raise; ensure we don't assume True
     assert validate_url("") is False
 
+
+
+@pytest.mark.parametrize(
+    "hostname, expected",
+    [
+        ("juejin.cn", "juejin"),
+        ("blog.csdn.net", "csdn"),
+        ("WWW.EET-CHINA.COM", "eet_china"),
+        ("www.china.com", "MBB"),
+        ("notjuejin.cn", None),
+        ("example.com", None),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_detect_site(hostname, expected):
+    assert detect_site(hostname) == expected
+
+
+def test_detect_site_caches_repeated_hostnames():
+    detect_site.cache_clear()
+    detect_site("blog.csdn.net")
+    detect_site("blog.csdn.net")
+    assert detect_site.cache_info().hits == 1
+
+
+def test_validate_and_normalize_url_caches_repeated_urls():
+    validate_and_normalize_url.cache_clear()
+    first = validate_and_normalize_url("https://juejin.cn/spost/1")
+    second = validate_and_normalize_url("https://juejin.cn/spost/1")
+    assert first == second == (True, "https://juejin.cn/post/1", "juejin")
+    assert validate_and_normalize_url.cache_info().hits == 1